@@ -0,0 +1,48 @@
+"""
+Measures chained attribute accesses (e.g., config.server.http.port) depending on the depth of the field, compared to
+the chain of get calls that attribute accesses used before (which normalized every attribute name into a path). With
+cached lookups, accessed fields are cached as attributes of their nodes.
+
+Usage: PYTHONPATH=. python benchmarks/attribute_benchmark.py
+"""
+import timeit
+from functools import reduce
+
+from python_json_config import Config
+
+MAX_DEPTH = 6
+NUMBER = 200000
+
+
+def nested_dict(depth: int) -> dict:
+    config_dict = {"leaf": 1}
+    for level in reversed(range(depth - 1)):
+        config_dict = {f"level{level}": config_dict}
+    return config_dict
+
+
+def attribute_chain(depth: int):
+    """
+    Compiles a function that accesses the leaf with a chain of attribute accesses.
+    """
+    path = ".".join([f"level{level}" for level in range(depth - 1)] + ["leaf"])
+    return eval(f"lambda config: config.{path}")
+
+
+def main():
+    print(f"{'depth':>5} {'get chain (ns)':>15} {'attributes (ns)':>16} {'cached (ns)':>12} {'speedup':>8}")
+    for depth in range(1, MAX_DEPTH + 1):
+        keys = [f"level{level}" for level in range(depth - 1)] + ["leaf"]
+        access = attribute_chain(depth)
+        config = Config(nested_dict(depth))
+        cached_config = Config(nested_dict(depth), cache_lookups=True)
+
+        get_chain = timeit.timeit(lambda: reduce(lambda node, key: node.get(key), keys, config), number=NUMBER)
+        attributes = timeit.timeit(lambda: access(config), number=NUMBER)
+        cached = timeit.timeit(lambda: access(cached_config), number=NUMBER)
+        print(f"{depth:>5} {get_chain / NUMBER * 1e9:>15.1f} {attributes / NUMBER * 1e9:>16.1f} "
+              f"{cached / NUMBER * 1e9:>12.1f} {get_chain / cached:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Measures the time to build a config with the ConfigBuilder without a JSON schema, with the compiled and cached schema
+validator and with validating the schema from scratch on every build (as jsonschema.validate does). Builds from an
+unchanged file are compared with and without the build cache.
+
+Usage: PYTHONPATH=. python benchmarks/build_benchmark.py
+"""
+import json
+import os
+import tempfile
+import timeit
+
+import jsonschema
+
+from python_json_config import ConfigBuilder
+
+NUMBER = 200
+BACKENDS = 200
+
+
+def config_and_schema():
+    config = {
+        "server": {"host": "127.0.0.1", "port": 5000, "debug_mode": False},
+        "backends": {f"backend{index}": {"host": "10.0.0.1", "port": 8000 + index} for index in range(BACKENDS)}
+    }
+    backend_schema = {
+        "type": "object",
+        "properties": {"host": {"type": "string"}, "port": {"type": "integer", "minimum": 1024}},
+        "required": ["host", "port"]
+    }
+    schema = {
+        "$schema": "http://json-schema.org/draft-07/schema#",
+        "type": "object",
+        "properties": {
+            "server": {
+                "type": "object",
+                "properties": {
+                    "host": {"type": "string"},
+                    "port": {"type": "integer", "minimum": 1024},
+                    "debug_mode": {"type": "boolean"}
+                }
+            },
+            "backends": {"type": "object", "additionalProperties": backend_schema}
+        },
+        "required": ["server"]
+    }
+    return config, schema
+
+
+def main():
+    config, schema = config_and_schema()
+    builder = ConfigBuilder()
+    no_schema = timeit.timeit(lambda: builder.parse_config(config), number=NUMBER)
+
+    builder = ConfigBuilder()
+    builder.validate_with_schema(schema, use_fastjsonschema=False)
+    cached = timeit.timeit(lambda: builder.parse_config(config), number=NUMBER)
+
+    builder = ConfigBuilder()
+    builder.validate_with_schema(schema)
+    fast = timeit.timeit(lambda: builder.parse_config(config), number=NUMBER)
+
+    builder = ConfigBuilder()
+
+    def build_and_validate_from_scratch():
+        jsonschema.validate(config, schema)
+        builder.parse_config(config)
+    from_scratch = timeit.timeit(build_and_validate_from_scratch, number=NUMBER)
+
+    print(f"without schema:                        {no_schema / NUMBER * 1e3:8.3f} ms")
+    print(f"with jsonschema.validate:              {from_scratch / NUMBER * 1e3:8.3f} ms")
+    print(f"with cached validator:                 {cached / NUMBER * 1e3:8.3f} ms")
+    print(f"with cached validator (fastjsonschema): {fast / NUMBER * 1e3:7.3f} ms")
+
+    with tempfile.TemporaryDirectory() as directory:
+        config_file = os.path.join(directory, "config.json")
+        with open(config_file, "w") as file:
+            json.dump(config, file)
+        builder = ConfigBuilder()
+        builder.validate_with_schema(schema)
+        from_file = timeit.timeit(lambda: builder.parse_config(config_file), number=NUMBER)
+        builder.enable_build_cache()
+        from_cache = timeit.timeit(lambda: builder.parse_config(config_file), number=NUMBER)
+    print(f"from file:                             {from_file / NUMBER * 1e3:8.3f} ms")
+    print(f"from file with build cache:            {from_cache / NUMBER * 1e3:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
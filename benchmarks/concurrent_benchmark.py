@@ -0,0 +1,36 @@
+"""
+Measures the time of a write to a ConcurrentConfig, which copies only the nodes on the path of the modified field,
+compared to copying the whole config for every write, depending on the number of nodes of the config.
+
+Usage: PYTHONPATH=. python benchmarks/concurrent_benchmark.py
+"""
+import timeit
+
+from python_json_config import Config, ConcurrentConfig
+
+NUMBER = 200
+
+
+def config_dict(backends: int) -> dict:
+    return {
+        "server": {"host": "127.0.0.1", "port": 5000},
+        "backends": {f"backend{index}": {"host": "10.0.0.1", "port": 8000 + index} for index in range(backends)}
+    }
+
+
+def main():
+    print(f"{'backends':>8} {'full copy (us)':>15} {'path copy (us)':>15} {'speedup':>8}")
+    for backends in (10, 100, 1000, 10000):
+        concurrent_config = ConcurrentConfig(Config(config_dict(backends)))
+        path_copy = timeit.timeit(lambda: concurrent_config.update("backends.backend0.port", 9000), number=NUMBER)
+
+        def update_full_copy():
+            with concurrent_config.transaction() as config:
+                config.update("backends.backend0.port", 9000)
+        full_copy = timeit.timeit(update_full_copy, number=NUMBER)
+        print(f"{backends:>8} {full_copy / NUMBER * 1e6:>15.1f} {path_copy / NUMBER * 1e6:>15.1f} "
+              f"{full_copy / path_copy:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Measures the time to merge environment variables into a config with many variables and several prefixes, compared to
+updating the config with one variable after the other (as merge_with_env_variables did before).
+
+Usage: PYTHONPATH=. python benchmarks/env_merge_benchmark.py
+"""
+import os
+import timeit
+
+from python_json_config import Config
+from python_json_config.utils import parse_env_variable_name
+
+PREFIXES = ["APP", "APP_FEATURES", "SIDECAR", "METRICS"]
+OTHER_VARIABLES = 500
+NUMBER = 200
+
+
+def set_environment():
+    for index in range(OTHER_VARIABLES):
+        os.environ[f"UNRELATED_VARIABLE_{index}"] = str(index)
+    for index in range(50):
+        os.environ[f"APP_SERVICE{index % 10}_SETTING__{index}"] = str(index)
+        os.environ[f"APP_FEATURES_FLAG{index}"] = "true"
+        os.environ[f"METRICS_EXPORTER_OPTION{index}"] = str(index)
+
+
+def merge_one_by_one(config: Config, prefixes: list):
+    for key in os.environ:
+        for prefix in prefixes:
+            if key.startswith(f"{prefix}_"):
+                config.update(path=parse_env_variable_name(key[len(prefix) + 1:]), value=os.environ[key], upsert=True)
+
+
+def main():
+    set_environment()
+    config_dict = {f"service{index}": {"host": "localhost", "port": 8000 + index} for index in range(10)}
+
+    one_by_one = timeit.timeit(lambda: merge_one_by_one(Config(config_dict), PREFIXES), number=NUMBER)
+    bulk = timeit.timeit(lambda: Config(config_dict).merge_with_env_variables(PREFIXES), number=NUMBER)
+    build = timeit.timeit(lambda: Config(config_dict), number=NUMBER)
+
+    print(f"{len(os.environ)} environment variables, {len(PREFIXES)} prefixes")
+    print(f"one update per variable: {(one_by_one - build) / NUMBER * 1e3:8.3f} ms")
+    print(f"bulk merge:              {(bulk - build) / NUMBER * 1e3:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""
+Measures the cost of looking up a leaf value by its dotted path depending on the depth of the config tree, with and
+without the lookup cache of the Config.
+
+Usage: PYTHONPATH=. python benchmarks/lookup_benchmark.py
+"""
+import timeit
+
+from python_json_config import Config
+
+MAX_DEPTH = 10
+NUMBER = 100000
+
+
+def nested_dict(depth: int) -> dict:
+    config_dict = {"leaf": 1}
+    for level in reversed(range(depth - 1)):
+        config_dict = {f"level{level}": config_dict}
+    return config_dict
+
+
+def main():
+    print(f"{'depth':>5} {'uncached (ns)':>15} {'cached (ns)':>13} {'speedup':>9}")
+    for depth in range(1, MAX_DEPTH + 1):
+        path = ".".join([f"level{level}" for level in range(depth - 1)] + ["leaf"])
+        uncached_config = Config(nested_dict(depth))
+        cached_config = Config(nested_dict(depth), cache_lookups=True)
+
+        uncached = timeit.timeit(lambda: uncached_config.get(path), number=NUMBER) / NUMBER * 1e9
+        cached = timeit.timeit(lambda: cached_config.get(path), number=NUMBER) / NUMBER * 1e9
+        print(f"{depth:>5} {uncached:>15.1f} {cached:>13.1f} {uncached / cached:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""
+Measures the memory that a config tree needs per ConfigNode, i.e. without the memory of the source dictionary.
+
+Usage: PYTHONPATH=. python benchmarks/memory_benchmark.py
+"""
+import tracemalloc
+
+from python_json_config import Config
+
+TENANTS = 10000
+
+
+def routing_table() -> dict:
+    return {
+        "tenants": {
+            f"tenant{index}": {
+                "routes": {"primary": {"host": "10.0.0.1", "port": 8080}, "fallback": {"host": "10.0.0.2"}},
+                "limits": {"rps": 100}
+            } for index in range(TENANTS)
+        }
+    }
+
+
+def main():
+    config_dict = routing_table()
+    node_count = 2 + TENANTS * 5
+
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    config = Config(config_dict)
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert config.tenants.tenant0.routes.primary.port == 8080
+    print(f"{node_count} nodes, {(after - before) / node_count:.1f} bytes per node")
+
+
+if __name__ == "__main__":
+    main()
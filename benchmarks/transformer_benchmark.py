@@ -0,0 +1,40 @@
+"""
+Measures the time to validate and transform many duplicated timedelta strings with the memoized is_timedelta and
+to_timedelta, compared to parsing every value twice (as the validator and transformer did before).
+
+Usage: PYTHONPATH=. python benchmarks/transformer_benchmark.py
+"""
+import timeit
+
+from python_json_config.transformers import parse_timedelta, to_timedelta
+from python_json_config.validators import is_timedelta
+
+VALUES = [f"0:0:0:{index % 20}" for index in range(5000)]
+NUMBER = 20
+
+
+def parse_twice(values: list):
+    for value in values:
+        value.split(":")
+        [int(element) for element in value.split(":")]
+        parse_timedelta(value)
+
+
+def memoized(values: list):
+    for value in values:
+        is_timedelta(value)
+        to_timedelta(value)
+
+
+def main():
+    unmemoized = timeit.timeit(lambda: parse_twice(VALUES), number=NUMBER)
+    cached = timeit.timeit(lambda: memoized(VALUES), number=NUMBER)
+    batch = timeit.timeit(lambda: to_timedelta.transform_many(VALUES), number=NUMBER)
+    print(f"{len(VALUES)} values ({len(set(VALUES))} distinct), {NUMBER} runs")
+    print(f"validate + transform without memoization: {unmemoized / NUMBER * 1000:.2f} ms")
+    print(f"validate + transform with memoization:    {cached / NUMBER * 1000:.2f} ms")
+    print(f"transform_many:                           {batch / NUMBER * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
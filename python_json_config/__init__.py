@@ -1,7 +1,39 @@
+import sys
+from importlib import import_module
+
+from .config_diff import ConfigDiff
 from .config_node import Config
-from .config_builder import ConfigBuilder
+from .frozen_config import FrozenConfig
 
 __all__ = [
+    "ConcurrentConfig",
     "Config",
-    "ConfigBuilder"
+    "ConfigBuilder",
+    "ConfigDiff",
+    "ConfigValidationError",
+    "FrozenConfig",
+    "ReloadingConfig"
 ]
+
+# imported when they are first accessed, so that reading configs (e.g., compiled configs) doesn't import the builder
+# and validation stack
+_LAZY_EXPORTS = {
+    "ConcurrentConfig": ".concurrent_config",
+    "ConfigBuilder": ".config_builder",
+    "ConfigValidationError": ".validation_engine",
+    "ReloadingConfig": ".reloading"
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_EXPORTS:
+        value = getattr(import_module(_LAZY_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# module level __getattr__ functions are only supported since Python 3.7 (PEP 562)
+if sys.version_info < (3, 7):
+    for _name in _LAZY_EXPORTS:
+        __getattr__(_name)
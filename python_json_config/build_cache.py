@@ -0,0 +1,218 @@
+import hashlib
+import os
+import pickle
+import tempfile
+import types
+from collections import OrderedDict
+from threading import Lock
+from typing import Optional, Tuple
+
+from .config_node import Config
+
+# the hex digest of the file, the builder settings and the environment, the hex digest of the file and the settings and
+# the settings
+CacheKey = Tuple[str, str, tuple]
+
+
+class BuildCache(object):
+    def __init__(self,
+                 max_size: int = 32,
+                 cache_dir: str = None,
+                 hash_content: bool = False,
+                 cache_version: str = None):
+        """
+        Caches configs that were built from files, so that building a config from an unchanged file with the same
+        builder settings costs a stat call and the deserialization of the pickled config. Configs are stored pickled,
+        so every build returns an independent config that can be modified.
+        A cached config is used if the path, modification time and size of the file (and optionally the hash of its
+        content), the settings of the builder and the values of the merged environment variables are the same.
+        :param max_size: The maximum number of configs that are cached in memory (least recently used configs are
+                         evicted).
+        :param cache_dir: If not None, the configs are also stored in this directory, so that other processes can use
+                          them. Functions in the builder settings are identified by their module, name, code,
+                          closure and the global variables they reference, which doesn't detect all changes of the
+                          code (e.g., of the functions in other modules that they call), so a cache_version is required.
+        :param hash_content: If True, the content of the file is hashed for every build, so that changes that keep the
+                             modification time and size are detected.
+        :param cache_version: The version of the code that builds the configs (e.g., the version of the application),
+                              which is part of the keys of the configs in the cache directory. It must change whenever
+                              the code of the validations and transformations changes.
+        :raises ValueError: Raised when a cache directory is used without a cache_version.
+        """
+        if cache_dir is not None and cache_version is None:
+            raise ValueError("A cache_version is required to store built configs in a cache directory.")
+        self.__max_size = max_size
+        self.__cache_dir = cache_dir
+        self.__hash_content = hash_content
+        self.__cache_version = cache_version
+        # the settings and the pickled config by the first digest of the cache key
+        self.__configs: 'OrderedDict[str, Tuple[tuple, bytes]]' = OrderedDict()
+        self.__lock = Lock()
+        # the last settings and their fingerprint, since the settings rarely change between builds
+        self.__fingerprint: Tuple[tuple, bytes] = None
+
+    def key(self, config_file: str, settings: tuple, environment: dict) -> Optional[CacheKey]:
+        """
+        Returns the cache key of a build or None if the config is not a file.
+        :param config_file: The path of the config file.
+        :param settings: The settings of the builder that affect the built config.
+        :param environment: The values of the environment variables that are merged into the config.
+        """
+        try:
+            stat = os.stat(config_file)
+        except (OSError, ValueError):
+            return None
+        file_hash = hashlib.blake2b(digest_size=16)
+        file_hash.update(repr(self.__cache_version).encode())
+        file_hash.update(os.path.abspath(config_file).encode())
+        file_hash.update(self.__settings_fingerprint(settings))
+        key_hash = file_hash.copy()
+        key_hash.update(repr((stat.st_mtime_ns, stat.st_size)).encode())
+        key_hash.update(repr(sorted(environment.items())).encode())
+        if self.__hash_content:
+            with open(config_file, "rb") as file:
+                key_hash.update(hashlib.blake2b(file.read(), digest_size=16).digest())
+        return key_hash.hexdigest(), file_hash.hexdigest(), settings
+
+    def get(self, key: CacheKey) -> Optional[Config]:
+        """
+        Returns a copy of the cached config or None if no config is cached for the key.
+        """
+        with self.__lock:
+            settings, config_data = self.__configs.get(key[0], (None, None))
+            # the digest can't tell apart all functions (e.g., ones that use different mutable global variables), but
+            # the settings of this process can be compared directly
+            if config_data is not None and settings != key[2]:
+                config_data = None
+            if config_data is not None:
+                self.__configs.move_to_end(key[0])
+        if config_data is None:
+            config_data = self.__read(key)
+            if config_data is None:
+                return None
+            self.__store(key, config_data)
+        return pickle.loads(config_data)
+
+    def put(self, key: CacheKey, config: Config):
+        """
+        Caches a built config. Configs that can't be pickled (e.g., because transformed values are lambdas) are not
+        cached.
+        """
+        try:
+            config_data = pickle.dumps(config, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, AttributeError, TypeError):
+            return
+        self.__store(key, config_data)
+        self.__write(key, config_data)
+
+    def clear(self):
+        with self.__lock:
+            self.__configs.clear()
+
+    def __settings_fingerprint(self, settings: tuple) -> bytes:
+        last_fingerprint = self.__fingerprint
+        if last_fingerprint is not None and last_fingerprint[0] == settings:
+            return last_fingerprint[1]
+        fingerprint = _fingerprint(settings)
+        self.__fingerprint = (settings, fingerprint)
+        return fingerprint
+
+    def __store(self, key: CacheKey, config_data: bytes):
+        with self.__lock:
+            self.__configs[key[0]] = (key[2], config_data)
+            self.__configs.move_to_end(key[0])
+            while len(self.__configs) > self.__max_size:
+                self.__configs.popitem(last=False)
+
+    def __cache_file(self, key: CacheKey) -> str:
+        # one file per config file and settings, which is replaced when the config file changes
+        return os.path.join(self.__cache_dir, f"{key[1]}.pickle")
+
+    def __read(self, key: CacheKey) -> Optional[bytes]:
+        if self.__cache_dir is None:
+            return None
+        try:
+            with open(self.__cache_file(key), "rb") as file:
+                cached_key, config_data = pickle.load(file)
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+            return None
+        return config_data if cached_key == key[0] else None
+
+    def __write(self, key: CacheKey, config_data: bytes):
+        if self.__cache_dir is None:
+            return
+        os.makedirs(self.__cache_dir, exist_ok=True)
+        # write to a temporary file first, so that other processes never read a partially written file
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=self.__cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(file_descriptor, "wb") as file:
+                pickle.dump((key[0], config_data), file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary_path, self.__cache_file(key))
+        except OSError:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+
+
+def _fingerprint(settings) -> bytes:
+    """
+    Returns a digest of the builder settings that is stable across processes.
+    """
+    return hashlib.blake2b(repr(_stable(settings)).encode(), digest_size=16).digest()
+
+
+def _stable(value, functions: frozenset = frozenset()):
+    """
+    Converts a value into a representation whose repr doesn't depend on the process (e.g., on object ids).
+    :param functions: The ids of the functions whose representation is being created, which are only represented by
+                      their names if they are referenced again (e.g., by recursive functions).
+    """
+    if isinstance(value, dict):
+        return tuple(sorted((repr(_stable(key, functions)), _stable(item, functions)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_stable(item, functions) for item in value)
+    if isinstance(value, type):
+        return f"{value.__module__}.{value.__qualname__}"
+    if hasattr(value, "__wrapped__"):
+        return _stable(value.__wrapped__, functions)
+    if hasattr(value, "__func__"):
+        return _stable(value.__func__, functions), _stable(value.__self__, functions)
+    if hasattr(value, "__code__"):
+        return _stable_function(value, functions)
+    if isinstance(value, types.CodeType):
+        return value.co_code, value.co_names, _stable(value.co_consts, functions)
+    return value if isinstance(value, (str, bytes, int, float, bool, type(None))) else repr(value)
+
+
+def _stable_function(function, functions: frozenset):
+    """
+    Represents a function by its name, code, closure and the global variables it references, so that functions with
+    the same code that call different functions (e.g., lambda value: up(value) and lambda value: low(value)) differ.
+    """
+    name = f"{function.__module__}.{function.__qualname__}"
+    if id(function) in functions:
+        return name
+    functions = functions | {id(function)}
+    closure = tuple(_stable(cell.cell_contents, functions) for cell in function.__closure__ or ())
+    function_globals = getattr(function, "__globals__", {})
+    referenced_globals = tuple((global_name, _stable_global(function_globals[global_name], functions))
+                               for global_name in sorted(_global_names(function.__code__))
+                               if global_name in function_globals)
+    return name, _stable(function.__code__, functions), closure, referenced_globals
+
+
+def _stable_global(value, functions: frozenset):
+    # the content of mutable global variables (e.g., lists that collect results) changes while the process runs
+    if isinstance(value, (list, dict, set, bytearray)):
+        return type(value).__name__
+    return _stable(value, functions)
+
+
+def _global_names(code: types.CodeType) -> set:
+    """
+    Returns the names that the code and its nested functions (e.g., comprehensions) may load from the global variables.
+    """
+    names = set(code.co_names)
+    for constant in code.co_consts:
+        if isinstance(constant, types.CodeType):
+            names |= _global_names(constant)
+    return names
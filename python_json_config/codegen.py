@@ -0,0 +1,261 @@
+import json
+import keyword
+import re
+import sys
+from typing import Dict, List, Optional, Tuple
+
+FieldPath = Tuple[str, ...]
+
+# python annotations and checked types of the JSON schema types
+_ANNOTATIONS = {
+    "string": "str",
+    "integer": "int",
+    "number": "float",
+    "boolean": "bool",
+    "array": "list",
+    "object": "dict",
+    "null": "None"
+}
+_CHECKED_TYPES = {
+    "string": ("str",),
+    "integer": ("int",),
+    "number": ("int", "float"),
+    "boolean": ("bool",),
+    "array": ("list",),
+    "object": ("dict",),
+    "null": ("type(None)",)
+}
+# names of the attributes of the generated classes and of the __init__ parameter self, which can't be used as
+# attribute names of fields
+_RESERVED_NAMES = {"from_dict", "to_dict", "_fields", "self"}
+# names that are defined by the header of the generated module, which can't be used as class names
+_RESERVED_CLASS_NAMES = {"Any", "Dict", "List", "Optional", "Union", "_value", "_convert", "_plain", "_Accessor"}
+
+_HEADER = '''# Generated by python_json_config.codegen from a JSON schema. Do not edit.
+from typing import Any, Dict, List, Optional, Union
+
+
+def _value(values: dict, key: str, field_name: str, types: tuple, check_types: bool, required: bool):
+    if key not in values or (values[key] is None and not required):
+        if required:
+            raise AttributeError(f'Required config field "{field_name}" does not exist')
+        return None
+    value = values[key]
+    # JSON schema integers and numbers are no booleans
+    if check_types and types and (not isinstance(value, types) or (isinstance(value, bool) and bool not in types)):
+        raise TypeError(f'Config field "{field_name}" with value "{value}" is not of type {types}')
+    return value
+
+
+def _convert(value, conversion):
+    return None if value is None else conversion(value)
+
+
+def _plain(value):
+    if hasattr(value, "to_dict"):
+        return value.to_dict()
+    if isinstance(value, dict):
+        return {key: _plain(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_plain(item) for item in value]
+    return value
+
+
+class _Accessor(object):
+    __slots__ = ()
+    # the keys of the fields in the config and the names of their attributes
+    _fields = ()
+
+    def to_dict(self) -> dict:
+        return {key: _plain(getattr(self, name)) for key, name in self._fields if getattr(self, name) is not None}
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        return f"{type(self).__name__}({', '.join(f'{name}={getattr(self, name)!r}' for _, name in self._fields)})"
+'''
+
+
+class _Field(object):
+    def __init__(self, key: str, name: str, annotation: str, types: Tuple[str, ...], conversion: Optional[str],
+                 required: bool):
+        self.key = key
+        self.name = name
+        self.annotation = annotation
+        self.types = types
+        # expression that converts the value (referred to as "value") into the attribute value (e.g., nested classes)
+        self.conversion = conversion
+        self.required = required
+
+
+def generate_accessor_classes(schema: dict, root_class_name: str = "ConfigModel") -> str:
+    """
+    Generates the source code of classes with typed attributes for the objects of a JSON schema. The classes use
+    __slots__, so accessing a field is a plain attribute load, and IDEs and type checkers know the fields and their
+    types. Every class has the class method from_dict(values, check_types=True), which creates the object and its
+    nested objects from a config dictionary (e.g., Config.to_dict()) and checks the types of the fields once, and the
+    method to_dict.
+    Supported are the keywords type, properties, required, additionalProperties (with an object schema) and items (with
+    an object schema). Fields with other schemas are annotated as Any and not checked.
+    :param schema: The JSON schema of the config.
+    :param root_class_name: The name of the class of the whole config.
+    :return: The source code of a python module with the classes.
+    """
+    generator = _ClassGenerator()
+    generator.generate_class(schema, root_class_name, ())
+    return generator.source()
+
+
+class _ClassGenerator(object):
+    def __init__(self):
+        self.__classes: List[str] = []
+        self.__class_names = set(_RESERVED_CLASS_NAMES)
+
+    def source(self) -> str:
+        return "\n\n".join([_HEADER, *self.__classes])
+
+    def generate_class(self, schema: dict, class_name: str, path: FieldPath) -> str:
+        """
+        Generates the class of an object schema after the classes of its nested objects and returns its name.
+        """
+        class_name = self.__unique_class_name(class_name)
+        required = set(schema.get("required", []))
+        names = set(_RESERVED_NAMES)
+        fields = []
+        for key, field_schema in schema.get("properties", {}).items():
+            name = _attribute_name(key, names)
+            names.add(name)
+            fields.append(self.__field(key, name, field_schema, path + (key,), key in required))
+        self.__classes.append(_class_source(class_name, fields, path))
+        return class_name
+
+    def __field(self, key: str, name: str, schema: dict, path: FieldPath, required: bool) -> _Field:
+        if not isinstance(schema, dict):
+            return _Field(key, name, "Any", (), None, required)
+        object_schema = _object_schema(schema)
+        if object_schema is not None:
+            class_name = self.generate_class(object_schema, _class_name(key), path)
+            return _Field(key, name, class_name, ("dict",), f"{class_name}.from_dict(value, check_types)", required)
+
+        item_schema = _object_schema(schema.get("additionalProperties")) if _types(schema) == ["object"] else None
+        if item_schema is not None:
+            class_name = self.generate_class(item_schema, f"{_class_name(key)}Item", path + ("*",))
+            return _Field(key, name, f"Dict[str, {class_name}]", ("dict",),
+                          f"{{key: {class_name}.from_dict(item, check_types) for key, item in value.items()}}",
+                          required)
+
+        item_schema = _object_schema(schema.get("items")) if _types(schema) == ["array"] else None
+        if item_schema is not None:
+            class_name = self.generate_class(item_schema, f"{_class_name(key)}Item", path + ("*",))
+            return _Field(key, name, f"List[{class_name}]", ("list",),
+                          f"[{class_name}.from_dict(item, check_types) for item in value]", required)
+
+        schema_types = [schema_type for schema_type in _types(schema) if schema_type in _ANNOTATIONS]
+        if not schema_types:
+            return _Field(key, name, "Any", (), None, required)
+        types = tuple(python_type for schema_type in schema_types for python_type in _CHECKED_TYPES[schema_type])
+        annotations = [_ANNOTATIONS[schema_type] for schema_type in schema_types if schema_type != "null"]
+        annotation = annotations[0] if len(annotations) == 1 else f"Union[{', '.join(annotations)}]"
+        if "null" in schema_types:
+            annotation = f"Optional[{annotation}]" if annotations else "None"
+        return _Field(key, name, annotation, types, None, required)
+
+    def __unique_class_name(self, class_name: str) -> str:
+        unique_name = class_name
+        index = 1
+        while unique_name in self.__class_names:
+            index += 1
+            unique_name = f"{class_name}{index}"
+        self.__class_names.add(unique_name)
+        return unique_name
+
+
+def _class_source(class_name: str, fields: List[_Field], path: FieldPath) -> str:
+    # required fields first, since they have no default values
+    fields = sorted(fields, key=lambda field: not field.required)
+    lines = [f"class {class_name}(_Accessor):",
+             "    __slots__ = (",
+             *(f"        {field.name!r}," for field in fields),
+             "    )",
+             "    _fields = (",
+             *(f"        ({field.key!r}, {field.name!r})," for field in fields),
+             "    )",
+             "",
+             "    def __init__(self" + "".join(f",\n                 {_parameter(field)}" for field in fields) + "):"]
+    lines += [f"        self.{field.name} = {field.name}" for field in fields] or ["        pass"]
+    lines += ["",
+              "    @classmethod",
+              f"    def from_dict(cls, values: dict, check_types: bool = True) -> '{class_name}':",
+              "        return cls(" + ",".join(_argument(field, path) for field in fields) + ")"]
+    return "\n".join(lines) + "\n"
+
+
+def _argument(field: _Field, path: FieldPath) -> str:
+    return f"\n            {field.name}={_value_expression(field, path)}"
+
+
+def _value_expression(field: _Field, path: FieldPath) -> str:
+    field_name = ".".join(path + (field.key,))
+    types = f"({''.join(f'{python_type}, ' for python_type in field.types)})"
+    value = f"_value(values, {field.key!r}, {field_name!r}, {types}, check_types, {field.required})"
+    if field.conversion is None:
+        return value
+    return f"_convert(\n                {value},\n                lambda value: {field.conversion})"
+
+
+def _parameter(field: _Field) -> str:
+    if field.required:
+        return f"{field.name}: {field.annotation}"
+    if field.annotation.startswith("Optional[") or field.annotation in ("Any", "None"):
+        return f"{field.name}: {field.annotation} = None"
+    return f"{field.name}: Optional[{field.annotation}] = None"
+
+
+def _object_schema(schema) -> Optional[dict]:
+    """
+    Returns the schema if it is the schema of an object with properties, for which a class is generated.
+    """
+    if isinstance(schema, dict) and "properties" in schema and _types(schema) in ([], ["object"]):
+        return schema
+    return None
+
+
+def _types(schema: dict) -> List[str]:
+    schema_type = schema.get("type", [])
+    return schema_type if isinstance(schema_type, list) else [schema_type]
+
+
+def _attribute_name(key: str, names: set) -> str:
+    name = re.sub(r"\W", "_", key)
+    if not name or name[0].isdigit():
+        name = f"_{name}"
+    if keyword.iskeyword(name) or name.startswith("__"):
+        name = f"{name.strip('_')}_"
+    while name in names:
+        name = f"{name}_"
+    return name
+
+
+def _class_name(key: str) -> str:
+    name = "".join(part[:1].upper() + part[1:] for part in re.split(r"[\W_]+", key) if part)
+    if not name or name[0].isdigit():
+        name = f"Field{name}"
+    return name
+
+
+def main(arguments: List[str]):
+    """
+    Prints the accessor classes of a JSON schema file.
+    Usage: python -m python_json_config.codegen <schema file> [<root class name>] > config_model.py
+    """
+    if len(arguments) not in (1, 2):
+        print(main.__doc__.strip().split("\n")[-1], file=sys.stderr)
+        sys.exit(2)
+    with open(arguments[0], "r") as schema_file:
+        schema: Dict = json.load(schema_file)
+    print(generate_accessor_classes(schema, *arguments[1:]), end="")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,130 @@
+import re
+from functools import lru_cache
+from typing import Callable, Dict, Optional, Tuple, Union
+
+from .json_backends import get_json_backend
+
+FieldPath = Tuple[str, ...]
+FieldTypes = Union[type, Tuple[type, ...]]
+
+_TRUE_VALUES = {"true", "1", "yes", "on"}
+_FALSE_VALUES = {"false", "0", "no", "off"}
+_NULL_VALUES = {"null", "none", ""}
+
+# types of the JSON schema and the python types they are coerced to
+_SCHEMA_TYPES = {
+    "string": str,
+    "integer": int,
+    "number": (int, float),
+    "boolean": bool,
+    "array": list,
+    "object": dict,
+    "null": type(None)
+}
+_SUPPORTED_TYPES = (str, int, float, bool, list, dict, type(None))
+
+
+def coerce_env_values(config,
+                      values: Dict[FieldPath, str],
+                      field_types: Callable[[FieldPath], Optional[FieldTypes]] = None) -> Dict[FieldPath, object]:
+    """
+    Converts the values of environment variables to the types of their fields, so that they are parsed once when they
+    are merged into the config instead of whenever they are used.
+    The type of a field is the declared type (see field_types) or otherwise the type of the current value of the field.
+    Values of fields without type (e.g., new fields) stay strings.
+    :raises ValueError: Raised when a value can't be converted to the type of its field.
+    :param config: The config the values are merged into.
+    :param values: The values of the environment variables keyed by the paths of their fields.
+    :param field_types: Function that returns the declared type or tuple of types of a field (or None).
+    :return: The converted values keyed by the paths of their fields.
+    """
+    coerced_values = {}
+    for path, value in values.items():
+        types = field_types(path) if field_types is not None else None
+        if types is None:
+            types = _current_type(config, path)
+        coerced_values[path] = value if types is None else coerce_value(value, types, ".".join(path))
+    return coerced_values
+
+
+def coerce_value(value: str, types: FieldTypes, field_name: str = None):
+    """
+    Converts a string to the first of the given types it can be converted to. Booleans can be given as true/false,
+    1/0, yes/no or on/off, lists and dictionaries as JSON. Strings are returned as they are if none of the types is
+    str, int, float, bool, list, dict or None.
+    :raises ValueError: Raised when the string can't be converted to any of the types.
+    """
+    types = tuple(field_type for field_type in (types if isinstance(types, tuple) else (types,))
+                  if field_type in _SUPPORTED_TYPES)
+    if not types:
+        return value
+    for field_type in types:
+        if field_type is str:
+            return value
+        try:
+            if field_type in (list, dict):
+                # parsed every time, since the results are mutable
+                result = get_json_backend().loads(value)
+                if isinstance(result, field_type):
+                    return result
+            else:
+                return _convert(value, field_type)
+        except (ValueError, TypeError):
+            continue
+    raise ValueError(f'Value "{value}" of the environment variable for field "{field_name}" can\'t be converted to '
+                     f'{" or ".join(field_type.__name__ for field_type in types)}')
+
+
+def schema_field_types(schema: dict, path: FieldPath) -> Optional[FieldTypes]:
+    """
+    Returns the python types of a field that are declared in a JSON schema. Only the keywords properties,
+    patternProperties and additionalProperties are followed (references are not resolved).
+    :param schema: The JSON schema of the config.
+    :param path: The path of the field.
+    :return: The tuple of types or None if the schema doesn't declare the type of the field.
+    """
+    for key in path:
+        if not isinstance(schema, dict):
+            return None
+        if key in schema.get("properties", {}):
+            schema = schema["properties"][key]
+        else:
+            pattern_schemas = [pattern_schema for pattern, pattern_schema in schema.get("patternProperties", {}).items()
+                               if re.search(pattern, key)]
+            schema = pattern_schemas[0] if pattern_schemas else schema.get("additionalProperties")
+    if not isinstance(schema, dict) or "type" not in schema:
+        return None
+    schema_types = schema["type"] if isinstance(schema["type"], list) else [schema["type"]]
+    types = []
+    for schema_type in schema_types:
+        python_types = _SCHEMA_TYPES.get(schema_type, ())
+        types += python_types if isinstance(python_types, tuple) else [python_types]
+    return tuple(types) or None
+
+
+@lru_cache(maxsize=4096)
+def _convert(value: str, field_type: type):
+    if field_type is bool:
+        if value.lower() in _TRUE_VALUES:
+            return True
+        if value.lower() in _FALSE_VALUES:
+            return False
+        raise ValueError(value)
+    if field_type is type(None):
+        if value.lower() in _NULL_VALUES:
+            return None
+        raise ValueError(value)
+    if field_type in (int, float):
+        return field_type(value)
+    raise TypeError(field_type)
+
+
+def _current_type(config, path: FieldPath) -> Optional[type]:
+    try:
+        value = config.get(list(path))
+    except AttributeError:
+        return None
+    current_type = type(value)
+    if current_type in (bool, int, float, list, dict):
+        return current_type
+    return None
@@ -0,0 +1,78 @@
+import os
+import pickle
+from importlib.util import module_from_spec, spec_from_file_location
+from typing import TYPE_CHECKING
+
+from .config_node import Config
+
+if TYPE_CHECKING:
+    from .config_builder import ConfigBuilder
+
+# version of the format of compiled configs, which is increased whenever it changes
+FORMAT_VERSION = 1
+
+_MODULE_TEMPLATE = '''# Generated by python_json_config.compiled.compile_config from {source}. Do not edit.
+from python_json_config.compiled import loads_compiled_config
+
+CONFIG = loads_compiled_config({data!r})
+'''
+
+
+def compile_config(builder: 'ConfigBuilder', config_file: str, output_file: str) -> Config:
+    """
+    Build a config ahead of time (e.g., when an application is packaged) and store the validated and transformed
+    config, so that it can be loaded at runtime without parsing, validating and transforming it again and without
+    importing the builder (and the jsonschema package). Environment variables are merged when the config is compiled.
+    :param builder: The builder with the settings of the config.
+    :param config_file: The path of the config json file.
+    :param output_file: The path of the compiled config. If it ends with ".py", a python module is written whose
+                        attribute CONFIG is the config (python caches the module as bytecode when it is first
+                        imported). Otherwise, the config is written as pickle file.
+    :return: The compiled config.
+    """
+    config = builder.parse_config(config_file)
+    data = pickle.dumps((FORMAT_VERSION, config), protocol=pickle.HIGHEST_PROTOCOL)
+    if output_file.endswith(".py"):
+        data = _MODULE_TEMPLATE.format(source=os.path.basename(config_file), data=data).encode("utf-8")
+
+    # imported here, since it is only needed when configs are compiled
+    import tempfile
+    # write to a temporary file first, so that the compiled config is replaced at once
+    output_dir = os.path.dirname(os.path.abspath(output_file))
+    file_descriptor, temporary_path = tempfile.mkstemp(dir=output_dir, suffix=".tmp")
+    try:
+        with os.fdopen(file_descriptor, "wb") as file:
+            file.write(data)
+        os.replace(temporary_path, output_file)
+    except BaseException:
+        os.remove(temporary_path)
+        raise
+    return config
+
+
+def load_compiled_config(compiled_file: str) -> Config:
+    """
+    Load a config that was compiled with compile_config.
+    :raises ValueError: Raised when the config was compiled with an incompatible version of this package.
+    :param compiled_file: The path of the compiled config (pickle file or python module).
+    :return: The config.
+    """
+    if compiled_file.endswith(".py"):
+        spec = spec_from_file_location(f"_compiled_config_{abs(hash(os.path.abspath(compiled_file)))}", compiled_file)
+        module = module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module.CONFIG
+    with open(compiled_file, "rb") as file:
+        return loads_compiled_config(file.read())
+
+
+def loads_compiled_config(data: bytes) -> Config:
+    """
+    Load a compiled config from the content of a pickle file written by compile_config.
+    :raises ValueError: Raised when the config was compiled with an incompatible version of this package.
+    """
+    format_version, config = pickle.loads(data)
+    if format_version != FORMAT_VERSION:
+        raise ValueError(f"The config was compiled with format version {format_version}, but version "
+                         f"{FORMAT_VERSION} is required. Compile the config again.")
+    return config
@@ -0,0 +1,117 @@
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple, Union
+
+from .coercion import FieldTypes
+from .config_diff import ConfigDiff
+from .config_node import Config
+from .utils import normalize_path
+
+
+class ConcurrentConfig(object):
+    def __init__(self, config: Config):
+        """
+        Wraps a config, so that it can be read and modified by several threads at the same time. Readers access the
+        current version of the config without taking a lock. Writers are serialized by a lock and never modify the
+        current version: every write modifies a copy that shares all unchanged subtrees with the current version (see
+        ConfigNode.clone) and then replaces the current version with a single reference assignment. So every version is
+        a consistent snapshot that doesn't change while a reader uses it.
+        :param config: The initial config. It is copied, so later modifications of it don't affect this object.
+        """
+        self.__config = config.clone()
+        # serializes the writes (the read path never takes this lock)
+        self.__write_lock = threading.Lock()
+        self.version = 0
+
+    """
+    Methods to read the current config.
+    """
+    @property
+    def config(self) -> Config:
+        """
+        The current version of the config. Keep a reference to it to read several values from the same version. It
+        must not be modified, since it shares nodes with the other versions.
+        """
+        return self.__config
+
+    def get(self, path: Union[str, List[str]]):
+        """
+        Retrieve a value in the current config. See ConfigNode.get for details.
+        """
+        return self.__config.get(path)
+
+    """
+    Methods to modify the config. Each of them publishes a new version. See the methods of ConfigNode for details.
+    """
+    def add(self, path: Union[str, List[str]], value, overwrite: bool = True):
+        path = normalize_path(path)
+        self.__write([path[:-1]], lambda config: config.add(path, value, overwrite))
+
+    def update(self, path: Union[str, List[str]], value, upsert: bool = True):
+        path = normalize_path(path)
+        self.__write([path[:-1]], lambda config: config.update(path, value, upsert))
+
+    def remove(self, path: Union[str, List[str]]):
+        path = normalize_path(path)
+        self.__write([path[:-1]], lambda config: config.remove(path))
+
+    def update_many(self, values: Dict[Tuple[str, ...], object]):
+        self.__write([path[:-1] for path in values], lambda config: config.update_many(values))
+
+    def apply_diff(self, diff: ConfigDiff):
+        paths = [*diff.removed, *diff.changed, *diff.added]
+        self.__write([path[:-1] for path in paths], lambda config: config.apply_diff(diff))
+
+    def merge_with_env_variables(self,
+                                 prefix: Union[str, List[str]],
+                                 coerce_types: bool = False,
+                                 field_types: Dict[str, FieldTypes] = None):
+        # the merged fields are only known while merging, so the whole config is copied
+        self.__write(None, lambda config: config.merge_with_env_variables(prefix, coerce_types, field_types))
+
+    @contextmanager
+    def transaction(self) -> Iterator[Config]:
+        """
+        Modify several fields in a single new version, which readers see either completely or not at all. The context
+        manager yields a copy of the current config, which replaces the current config if the block doesn't raise an
+        exception. Other writers wait until the block is finished.
+        """
+        with self.__write_lock:
+            config = self.__config.clone()
+            yield config
+            self.__publish(config)
+
+    """
+    Built-in python functions
+    """
+    def __getattr__(self, item: str):
+        # private attributes are only missing while the object is created
+        if item.startswith("_ConcurrentConfig__"):
+            raise AttributeError(item)
+        return getattr(self.__config, item)
+
+    def __contains__(self, item: Union[str, List[str]]) -> bool:
+        return item in self.__config
+
+    def __str__(self):
+        return f"ConcurrentConfig(version={self.version}, config={self.__config})"
+
+    __repr__ = __str__
+
+    """
+    Private functions used in this class (e.g., for utility).
+    """
+    def __write(self, paths: Iterable[List[str]], modify: Callable[[Config], None]):
+        """
+        Applies a modification to a copy of the current config, in which the nodes on the given paths are copied, and
+        publishes the copy. If the modification raises an exception, the current config is kept.
+        """
+        with self.__write_lock:
+            config = self.__config.clone(paths)
+            modify(config)
+            self.__publish(config)
+
+    def __publish(self, config: Config):
+        # a single reference assignment, which is atomic for concurrent readers
+        self.__config = config
+        self.version += 1
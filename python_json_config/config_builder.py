@@ -1,23 +1,36 @@
-import json
+import copy
 from pathlib import Path
-from typing import Dict, Union, List
-
-import jsonschema
+from typing import Callable, Dict, Union, List, Set, Type, TypeVar
 
+from .build_cache import BuildCache, CacheKey
+from .codegen import generate_accessor_classes
+from .coercion import FieldTypes, coerce_env_values, schema_field_types
 from .config_node import Config
+from .field_patterns import is_field_pattern, iter_matching_fields, path_matches
+from .incremental import (FieldPath, changed_paths, dirty_paths, is_affected, assemble_config_dict,
+                          reassembled_paths, restore_previous_config)
+from .json_backends import get_json_backend
+from .reloading import ReloadingConfig
+from .schema_validation import SchemaValidator, get_schema_validator
+from .streaming import StreamingConfigParser, contains_deferred_fields
+from .utils import normalize_path, env_variable_values
+from .validation_engine import ValidationEngine
+
+# a class generated by generate_accessor_classes
+Model = TypeVar("Model")
 
 
 class ConfigBuilder(object):
     def __init__(self):
-        self.__config: Config = None
-
         # custom validation and transformation settings
         self.__validation_types: Dict[str, type] = {}
         self.__validation_functions: Dict[str, list] = {}
         self.__transformation_functions = {}
 
-        # stores the json schema used to validate the config
+        # stores the json schema used to validate the config and its compiled validator
         self.__json_schema: dict = None
+        self.__use_fastjsonschema: bool = True
+        self.__schema_validator: SchemaValidator = None
 
         # settings of required and optional fields and (non-)strict access
         self.__strict_access: bool = None
@@ -25,31 +38,45 @@ class ConfigBuilder(object):
 
         # environment variable prefixes  that will be merged into the config
         self.__environment_variable_prefixes: List[str] = []
+        # whether the values of environment variables are converted to the types of their fields
+        self.__coerce_env_types: bool = False
+
+        # whether the built config caches the values of accessed paths
+        self.__cache_lookups: bool = False
+
+        # whether the nodes of the built config are only created when they are accessed
+        self.__lazy: bool = False
+
+        # settings of the incremental parsing of config files (None if config files are parsed at once)
+        self.__streaming_settings: Dict[str, List[str]] = None
+
+        # concurrency limit and timeout of the validation functions (None if they run one after the other)
+        self.__validation_concurrency: int = None
+        self.__validation_timeout: float = None
+
+        # whether configs are built incrementally from the previous config and the state of the previous build
+        self.__incremental: bool = False
+        self.__previous_build: tuple = None
+
+        # cache of configs built from files (None if configs are always built)
+        self.__build_cache: BuildCache = None
 
     def validate_field_type(self, field_name: str, field_type: type):
         """
         Validate that the given field is of the given type when the final config is built.
-        :param field_name: The field that is validated.
+        :param field_name: The field that is validated. It can contain wildcards (see validate_field_value).
         :param field_type: The type that the field value should have.
         :return: The builder object for chaining of calls.
         """
         self.__validation_types[field_name] = field_type
         return self
 
-    def __validate_types(self):
-        for field_name, field_type in self.__validation_types.items():
-            value = self.__config.get(field_name)
-            # skip optional fields that do not exist
-            if value is None:
-                continue
-            assert isinstance(value, field_type), f'Config field "{field_name}" with value "{value}" is not of ' \
-                f"type {field_type}"
-
     def validate_field_value(self, field_name: str, validation_function):
         """
         Validate that the validation function returns true with the value of the given field when the final config is
         built.
-        :param field_name: The field that is validated.
+        :param field_name: The field that is validated. It can contain the wildcards "*" (any key) and "**" (any number
+                           of keys) to validate all fields it matches, e.g., "backends.*.port" or "**.timeout".
         :param validation_function: Function that takes the field value as input and validates it (returns True if the
                                     value is valid and False if it is invalid).
         :return: The builder object for chaining of calls.
@@ -64,27 +91,25 @@ class ConfigBuilder(object):
 
         return self
 
-    def __validate_field_values(self):
-        for field_name, validation_functions in self.__validation_functions.items():
-            value = self.__config.get(field_name)
-            # skip optional fields that do not exist
-            if value is None:
-                continue
-            for validation_function in validation_functions:
-                validation_result = validation_function(value)
-                error_message = f'Error validating field "{field_name}" with value "{value}"'
-
-                if isinstance(validation_result, tuple):
-                    result, validation_error = validation_result
-                    assert result, f"{error_message}: {validation_error}"
-                else:
-                    assert validation_result, error_message
+    def enable_parallel_validation(self, max_concurrency: int = 16, timeout: float = None):
+        """
+        Run the validation functions concurrently instead of one after the other, which speeds up validations that
+        wait for I/O (e.g., DNS lookups). Validation functions that are coroutine functions (async def) run in an
+        asyncio event loop and the other functions in a thread pool.
+        :param max_concurrency: The maximum number of validation functions that run at the same time.
+        :param timeout: Seconds after which a validation function fails with a timeout error. None for no timeout.
+        :return: The builder object for chaining of calls.
+        """
+        self.__validation_concurrency = max_concurrency
+        self.__validation_timeout = timeout
+        return self
 
     def transform_field_value(self, field_name: str, transformation_function):
         """
         Transform the given field value with the transformation function when the final config is built.
         The transformation function takes the field value as input and returns a new value.
-        :param field_name: The field that is validated.
+        :param field_name: The field that is transformed. It can contain the wildcards "*" (any key) and "**" (any
+                           number of keys) to transform all fields it matches, e.g., "backends.*.timeout".
         :param transformation_function: Function that takes the field value as input and transforms it into another
                                         value.
         :return: The builder object for chaining of calls.
@@ -92,26 +117,89 @@ class ConfigBuilder(object):
         self.__transformation_functions[field_name] = transformation_function
         return self
 
-    def __transform_field_values(self):
+    def __validate_fields(self, config: Config, dirty: Set[FieldPath] = None):
+        """
+        Validates the types and values of all fields in a single traversal of the config.
+        :raises ConfigValidationError: Raised with the errors of all invalid fields.
+        """
+        ValidationEngine(self.__validation_types,
+                         self.__validation_functions,
+                         max_concurrency=self.__validation_concurrency,
+                         timeout=self.__validation_timeout).validate(config, dirty)
+
+    def __transform_field_values(self, config: Config, dirty: Set[FieldPath] = None):
         for field_name, transformation_function in self.__transformation_functions.items():
-            value = self.__config.get(field_name)
+            if is_field_pattern(field_name):
+                self.__transform_matching_fields(config, field_name, transformation_function, dirty)
+                continue
+            if not self.__is_affected(field_name, dirty):
+                continue
+            value = config.get(field_name)
             # skip optional fields that do not exist
             if value is None:
                 continue
-            new_value = transformation_function(value)
-            self.__config.update(field_name, new_value)
+            config.update(field_name, transformation_function(value))
+
+    def __transform_matching_fields(self,
+                                    config: Config,
+                                    field_name: str,
+                                    transformation_function: Callable,
+                                    dirty: Set[FieldPath]):
+        """
+        Transforms the fields that match a field name with wildcards. The matching fields are collected in one
+        traversal together with the nodes that contain them, so each field is transformed in its node instead of being
+        looked up from the root.
+        """
+        fields = [(node, key) for node, key, path in iter_matching_fields(config, tuple(normalize_path(field_name)))
+                  if self.__is_affected(path, dirty)]
+        for node, key in fields:
+            value = node.get([key])
+            # skip optional fields that do not exist
+            if value is None:
+                continue
+            node.update([key], transformation_function(value))
+
+    @staticmethod
+    def __is_affected(field_name: Union[str, List[str]], dirty: Set[FieldPath]) -> bool:
+        """
+        Tests if a field has to be validated and transformed. In incremental builds, these are only the fields in the
+        subtrees that were rebuilt.
+        """
+        return dirty is None or is_affected(tuple(normalize_path(field_name)), dirty)
 
-    def validate_with_schema(self, schema: Union[str, dict]):
+    def validate_with_schema(self, schema: Union[str, dict], use_fastjsonschema: bool = True):
         """
-        Save the jsonschema for later validation.
+        Save the jsonschema for later validation. The schema is compiled into a validator once, which is reused for all
+        configs that are built.
         :param schema: The jsonschema with which the config will be validated. Can be either a file path to a JSON file
                        containing the schema or an already parsed dictionary.
+        :param use_fastjsonschema: If True and the fastjsonschema package is installed, the config is validated with
+                                   code that is generated from the schema if fastjsonschema supports the draft and
+                                   keywords of the schema (see SchemaValidator).
         """
         if isinstance(schema, dict):
             self.__json_schema = schema
         else:
-            with open(schema, "r") as json_file:
-                self.__json_schema = json.load(json_file)
+            self.__json_schema = self.__parse_json_file(schema)
+        self.__use_fastjsonschema = use_fastjsonschema
+        self.__schema_validator = None
+
+    def __get_schema_validator(self) -> SchemaValidator:
+        if self.__schema_validator is None:
+            self.__schema_validator = get_schema_validator(self.__json_schema, self.__use_fastjsonschema)
+        return self.__schema_validator
+
+    def generate_accessor_classes(self, root_class_name: str = "ConfigModel") -> str:
+        """
+        Generate the source code of classes with typed attributes for the JSON schema of this builder (see
+        codegen.generate_accessor_classes). Configs are built as objects of the generated classes with parse_config_as.
+        :raises ValueError: Raised when no JSON schema was set with validate_with_schema.
+        :param root_class_name: The name of the class of the whole config.
+        :return: The source code of a python module with the classes.
+        """
+        if self.__json_schema is None:
+            raise ValueError("Accessor classes can only be generated for builders with a JSON schema.")
+        return generate_accessor_classes(self.__json_schema, root_class_name)
 
     def set_field_access_optional(self):
         """
@@ -167,7 +255,56 @@ class ConfigBuilder(object):
             self.add_optional_field(field)
         return self
 
-    def merge_with_env_variables(self, prefix: Union[str, List[str]]):
+    def enable_lookup_cache(self):
+        """
+        Cache the values of accessed paths in the built config, so that repeated lookups of the same path (e.g.,
+        config.get("server.port")) do not walk through the config tree again. The cache is cleared whenever the config
+        is modified.
+        :return: The builder object for chaining of calls.
+        """
+        self.__cache_lookups = True
+        return self
+
+    def enable_lazy_loading(self):
+        """
+        Only create the nodes of nested objects of the built config when they are accessed for the first time. This
+        reduces the time to build large configs of which only small parts are used.
+        :return: The builder object for chaining of calls.
+        """
+        self.__lazy = True
+        return self
+
+    def enable_streaming(self, skip_fields: List[str] = None, lazy_fields: List[str] = None):
+        """
+        Parse config files incrementally instead of loading the whole file into memory at once (requires the ijson
+        package). The fields of the root object are validated with the JSON schema as soon as they are parsed.
+        :param skip_fields: Fields of the config that are not loaded. Skipped fields of the root object count as
+                            existing fields when the required fields of the root object are validated.
+        :param lazy_fields: Fields of the config that are only loaded when they are accessed for the first time. The
+                            config file is parsed again to load them, so it must not be changed in the meantime.
+                            Fields of the root object that contain skipped or lazy fields are not validated with the
+                            JSON schema, except for lazy fields of the root object, which are validated when they are
+                            loaded. If the schema of the root object can't be validated field by field (e.g., because
+                            it uses "allOf"), the lazy fields of the root object are loaded once for the validation.
+        :return: The builder object for chaining of calls.
+        """
+        self.__streaming_settings = {"skip_fields": skip_fields or [], "lazy_fields": lazy_fields or []}
+        return self
+
+    def enable_incremental_builds(self):
+        """
+        Build configs incrementally from the previously built config. The new config dictionary is compared with the
+        previous one and only the changed subtrees are rebuilt. Type validations, validation functions and
+        transformations only run for fields in the rebuilt subtrees, so they must only depend on the value of their
+        field. The other nodes of the previous config are moved to the new config, so the previous config must not be
+        modified anymore. If nothing changed, the previous config is returned.
+        Lazy and streamed configs and builds after a change of the builder settings are always built completely.
+        :return: The builder object for chaining of calls.
+        """
+        self.__incremental = True
+        return self
+
+    def merge_with_env_variables(self, prefix: Union[str, List[str]], coerce_types: bool = False):
         """
         Take all environment variables that start with the specified prefix or one of the specific prefixes and merge
         them into the config. These values will be added before the validations and transformations happen.
@@ -176,18 +313,79 @@ class ConfigBuilder(object):
         If the keys already exist in the config, the existing values will be overwritten by the values of the
         environment variables.
         :param prefix: Either a single or a list of prefixes of the environment variables (e.g., "FOO_").
+        :param coerce_types: If True, the values of the environment variables are converted to the types of their
+                             fields once when the config is built, instead of being merged as strings. The type of a
+                             field is the type set via validate_field_type, the type in the JSON schema or the type of
+                             the value in the config (in this order). Values that can't be converted raise a ValueError
+                             when the config is built.
         :return: The builder object for chaining of calls.
         """
         prefixes = [prefix] if isinstance(prefix, str) else prefix
         self.__environment_variable_prefixes += prefixes
+        self.__coerce_env_types = self.__coerce_env_types or coerce_types
         return self
 
+    def __merge_env_variables(self, config: Config, values: Dict[FieldPath, str]):
+        if self.__coerce_env_types:
+            values = coerce_env_values(config, values, self.__declared_field_types)
+        config.update_many(values)
+
+    def __declared_field_types(self, path: FieldPath) -> FieldTypes:
+        field_types = self.__validation_types.get(".".join(path))
+        if field_types is None:
+            field_types = next((field_type for field_name, field_type in self.__validation_types.items()
+                                if is_field_pattern(field_name)
+                                and path_matches(tuple(normalize_path(field_name)), path)), None)
+        if field_types is None and self.__json_schema is not None:
+            field_types = schema_field_types(self.__json_schema, path)
+        return field_types
+
     def __parse_json(self, json_data: str):
-        return json.loads(json_data)
+        return get_json_backend().loads(json_data)
 
     def __parse_json_file(self, json_file: str):
-        with open(json_file, "r") as file:
-            return json.load(file)
+        with open(json_file, "rb") as file:
+            return get_json_backend().loads(file.read())
+
+    def __is_streamed(self, config: Union[str, dict]) -> bool:
+        return self.__streaming_settings is not None and not isinstance(config, dict) and Path(config).exists()
+
+    def __stream_json_file(self, json_file: str, required_fields: List[str], optional_fields: List[str]) -> dict:
+        validator = None
+        if self.__json_schema is not None:
+            validator = self.__get_schema_validator().validator
+        parser = StreamingConfigParser(strict_access=self.__strict_access,
+                                       required_fields=required_fields,
+                                       optional_fields=optional_fields,
+                                       validator=validator,
+                                       lazy=self.__lazy,
+                                       **self.__streaming_settings)
+        return parser.parse(json_file)
+
+    def enable_build_cache(self,
+                           max_size: int = 32,
+                           cache_dir: str = None,
+                           hash_content: bool = False,
+                           cache_version: str = None):
+        """
+        Cache the configs that are built from files. Building a config again from the unchanged file with the same
+        settings and environment variables then only deserializes a copy of the cached config.
+        :param max_size: The maximum number of configs that are cached in memory.
+        :param cache_dir: If not None, the built configs are also stored in this directory and reused by other
+                          processes.
+        :param hash_content: If True, changes of files are detected by hashing their content and not only by their
+                             modification time and size.
+        :param cache_version: Required if a cache_dir is used. The version of the code that builds the configs, which
+                              must change whenever the validations and transformations (or the code they call) change,
+                              since configs in the cache directory are reused until the version changes.
+        :raises ValueError: Raised when a cache_dir is used without a cache_version.
+        :return: The builder object for chaining of calls.
+        """
+        self.__build_cache = BuildCache(max_size=max_size,
+                                        cache_dir=cache_dir,
+                                        hash_content=hash_content,
+                                        cache_version=cache_version)
+        return self
 
     def parse_config(self, config: Union[str, dict]) -> Config:
         """
@@ -196,32 +394,146 @@ class ConfigBuilder(object):
         :param config: Path to the config json file or a dictionary that contains the config values
         :return: The built config (that is validated and transformed according to the passed functions).
         """
-        # Either parse the JSON file or use the passed dictionary directly
-        if isinstance(config, dict):
-            config_dict = config
-        elif Path(config).exists():
-            config_dict = self.__parse_json_file(config)
-        else:
-            config_dict = self.__parse_json(config)
+        cache_key = self.__build_cache_key(config)
+        if cache_key is not None:
+            cached_config = self.__build_cache.get(cache_key)
+            if cached_config is not None:
+                return cached_config
+
+        built_config = self.__build_config(config)
+        if cache_key is not None:
+            self.__build_cache.put(cache_key, built_config)
+        return built_config
+
+    def parse_config_as(self, config: Union[str, dict], model_class: Type[Model], check_types: bool = True) -> Model:
+        """
+        Build the config like parse_config and return it as object of a class generated by generate_accessor_classes.
+        Fields are then accessed as plain attributes. The types of the fields are checked once when the objects are
+        created, so transformations have to keep the types of the schema (or the check has to be disabled).
+        :param config: Path to the config json file or a dictionary that contains the config values
+        :param model_class: The generated class of the whole config.
+        :param check_types: Whether the types of the fields are checked.
+        :return: The object of the model class.
+        """
+        return model_class.from_dict(self.parse_config(config).to_dict(), check_types=check_types)
 
-        # Validate with JSON schema if it exists
-        if self.__json_schema is not None:
-            jsonschema.validate(config_dict, self.__json_schema)
+    def __build_cache_key(self, config: Union[str, dict]) -> CacheKey:
+        if self.__build_cache is None or not isinstance(config, str):
+            return None
+        settings = (self.__build_settings(), self.__lazy, self.__streaming_settings)
+        return self.__build_cache.key(config, settings, env_variable_values(self.__environment_variable_prefixes))
+
+    def __build_config(self, config: Union[str, dict]) -> Config:
+        required_fields = [field for field, status in self.__field_access_settings.items() if status]
+        optional_fields = [field for field, status in self.__field_access_settings.items() if not status]
+        config_dict = self.__load_config_dict(config, required_fields, optional_fields)
+
+        # Validate with JSON schema if it exists (streamed files are validated while they are parsed)
+        if self.__json_schema is not None and not self.__is_streamed(config):
+            self.__get_schema_validator().validate(config_dict)
+
+        lazy = self.__lazy or contains_deferred_fields(config_dict)
+        if self.__incremental and not lazy and not self.__is_streamed(config):
+            # the passed dictionary is copied, since it could be modified before the next build
+            source_dict = copy.deepcopy(config_dict) if isinstance(config, dict) else config_dict
+            return self.__build_incrementally(source_dict, required_fields, optional_fields)
 
         # Build the config object. Dictionaries in the input data are resolved recursively in the object creation.
-        self.__config = Config(config_dict,
-                               strict_access=self.__strict_access,
-                               required_fields=[field for field, status in self.__field_access_settings.items()
-                                                if status],
-                               optional_fields=[field for field, status in self.__field_access_settings.items()
-                                                if not status])
+        # The config is only stored in a local variable, so that configs can be built concurrently (e.g., while the
+        # config is reloaded in the background).
+        config = Config(config_dict,
+                        strict_access=self.__strict_access,
+                        required_fields=required_fields,
+                        optional_fields=optional_fields,
+                        cache_lookups=self.__cache_lookups,
+                        lazy=lazy)
 
         # Add/Overwrite values set via environment variables
-        self.__config.merge_with_env_variables(self.__environment_variable_prefixes)
+        self.__merge_env_variables(config, env_variable_values(self.__environment_variable_prefixes))
 
         # Apply the custom validation and transformation function
-        self.__validate_types()
-        self.__validate_field_values()
-        self.__transform_field_values()
+        self.__validate_fields(config)
+        self.__transform_field_values(config)
+
+        return config
 
-        return self.__config
+    def __load_config_dict(self, config: Union[str, dict], required_fields: List[str], optional_fields: List[str]):
+        # Either parse the JSON file or use the passed dictionary directly
+        if isinstance(config, dict):
+            return config
+        elif Path(config).exists() and self.__streaming_settings is not None:
+            return self.__stream_json_file(config, required_fields, optional_fields)
+        elif Path(config).exists():
+            return self.__parse_json_file(config)
+        else:
+            return self.__parse_json(config)
+
+    def __build_incrementally(self, config_dict: dict, required_fields: List[str], optional_fields: List[str]):
+        settings = self.__build_settings()
+        environment = env_variable_values(self.__environment_variable_prefixes)
+        dirty = None
+        node_dict = config_dict
+        if self.__previous_build is not None and self.__previous_build[0] == settings:
+            _, previous_dict, previous_environment, previous_config = self.__previous_build
+            changed = list(changed_paths(previous_dict, config_dict))
+            changed += [path for path in set(environment) | set(previous_environment)
+                        if environment.get(path) != previous_environment.get(path)]
+            if not changed:
+                return previous_config
+            processed_paths = self.__processed_paths(environment)
+            dirty = dirty_paths(changed, processed_paths)
+            # fields that only exist in the environment are missing from the nodes that are assembled from the config
+            # dictionary, so they are rebuilt as well
+            dirty = dirty_paths(changed + list(reassembled_paths(environment, dirty)), processed_paths)
+            node_dict = assemble_config_dict(config_dict, previous_config, dirty)
+
+        try:
+            config = Config(node_dict,
+                            strict_access=self.__strict_access,
+                            required_fields=required_fields,
+                            optional_fields=optional_fields,
+                            cache_lookups=self.__cache_lookups)
+
+            # environment variables are only merged into the rebuilt subtrees, the other nodes already contain them
+            self.__merge_env_variables(config, {path: value for path, value in environment.items()
+                                                if dirty is None or is_affected(path, dirty)})
+
+            self.__validate_fields(config, dirty)
+            self.__transform_field_values(config, dirty)
+        except Exception:
+            # the previous config stays the current one, so it gets back the nodes that were moved to the new config
+            if dirty is not None:
+                restore_previous_config(self.__previous_build[3], dirty)
+            raise
+
+        self.__previous_build = (settings, config_dict, environment, config)
+        return config
+
+    def __build_settings(self) -> tuple:
+        """
+        Returns the settings that affect the built config. If they change, the next config is built completely.
+        """
+        return (tuple(self.__validation_types.items()),
+                tuple((field_name, tuple(functions)) for field_name, functions in self.__validation_functions.items()),
+                tuple(self.__transformation_functions.items()),
+                self.__json_schema,
+                self.__strict_access,
+                tuple(self.__field_access_settings.items()),
+                tuple(self.__environment_variable_prefixes),
+                self.__coerce_env_types,
+                self.__cache_lookups)
+
+    def __processed_paths(self, environment: Dict[FieldPath, str]) -> List[FieldPath]:
+        field_names = [*self.__validation_types, *self.__validation_functions, *self.__transformation_functions]
+        return [tuple(normalize_path(field_name)) for field_name in field_names] + list(environment)
+
+    def watch_config(self, config_file: str, **watch_settings) -> ReloadingConfig:
+        """
+        Build the config from a file and rebuild it in the background whenever the file changes. The settings of this
+        builder are used for every rebuild, so they shouldn't be changed afterwards.
+        :param config_file: Path to the config json file.
+        :param watch_settings: Settings of the watcher (debounce, poll_interval, use_inotify, on_reload and on_error,
+                               see ReloadingConfig).
+        :return: The started ReloadingConfig, whose config attribute is the current config.
+        """
+        return ReloadingConfig(self, config_file, **watch_settings).start()
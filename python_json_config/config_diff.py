@@ -0,0 +1,80 @@
+from typing import Dict, List, Tuple
+
+from .json_backends import get_json_backend
+from .msgpack_extensions import encode_typed, decode_typed
+
+FieldPath = Tuple[str, ...]
+
+
+class ConfigDiff(object):
+    def __init__(self,
+                 added: Dict[FieldPath, object] = None,
+                 removed: List[FieldPath] = None,
+                 changed: Dict[FieldPath, object] = None):
+        """
+        The changes between two configs, as created by ConfigNode.diff. Paths are tuples of keys (so that keys may
+        contain dots) and nested objects are stored as dictionaries. A diff can be applied to other configs with
+        ConfigNode.apply_diff and serialized to send it to other processes instead of the whole config.
+        :param added: The values of the fields that only exist in the new config, keyed by their path.
+        :param removed: The paths of the fields that only exist in the old config.
+        :param changed: The new values of the fields whose values differ, keyed by their path.
+        """
+        self.added = added or {}
+        self.removed = removed or []
+        self.changed = changed or {}
+
+    """
+    Serialization functions
+    """
+    def to_dict(self) -> dict:
+        return {
+            "added": [[list(path), value] for path, value in self.added.items()],
+            "removed": [list(path) for path in self.removed],
+            "changed": [[list(path), value] for path, value in self.changed.items()]
+        }
+
+    def to_json(self) -> str:
+        return get_json_backend().dumps(self.to_dict())
+
+    def to_msgpack(self) -> bytes:
+        """
+        Serialize the diff via msgpack. Like in ConfigNode.to_msgpack with preserve_types=True, timedelta, datetime,
+        date and time values are restored by from_msgpack.
+        """
+        import msgpack
+        return msgpack.packb(self.to_dict(), default=encode_typed, use_bin_type=True)
+
+    @classmethod
+    def from_dict(cls, diff_dict: dict) -> 'ConfigDiff':
+        return cls(added={tuple(path): value for path, value in diff_dict["added"]},
+                   removed=[tuple(path) for path in diff_dict["removed"]],
+                   changed={tuple(path): value for path, value in diff_dict["changed"]})
+
+    @classmethod
+    def from_json(cls, json_data: str) -> 'ConfigDiff':
+        return cls.from_dict(get_json_backend().loads(json_data))
+
+    @classmethod
+    def from_msgpack(cls, data: bytes) -> 'ConfigDiff':
+        import msgpack
+        return cls.from_dict(msgpack.unpackb(data, raw=False, ext_hook=decode_typed, strict_map_key=False))
+
+    """
+    Built-in python functions
+    """
+    def __bool__(self):
+        return bool(self.added or self.removed or self.changed)
+
+    def __len__(self):
+        return len(self.added) + len(self.removed) + len(self.changed)
+
+    def __eq__(self, other):
+        if isinstance(other, ConfigDiff):
+            return self.added == other.added and set(self.removed) == set(other.removed) \
+                and self.changed == other.changed
+        return NotImplemented
+
+    def __str__(self):
+        return f"ConfigDiff(added={self.added}, removed={self.removed}, changed={self.changed})"
+
+    __repr__ = __str__
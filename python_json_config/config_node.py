@@ -1,50 +1,86 @@
-import json
-import os
 import warnings
-from typing import List, Union, Tuple
+from hashlib import blake2b
+from functools import lru_cache
+from typing import List, Union, Tuple, Dict, Iterable
 
-import msgpack
-
-from .utils import normalize_path, parse_env_variable_name
+from .coercion import FieldTypes, coerce_env_values
+from .config_diff import ConfigDiff, FieldPath
+from .frozen_config import FrozenConfig
+from .json_backends import get_json_backend
+from .msgpack_extensions import encode_typed, decode_typed
+from .utils import normalize_path, env_variable_values, DeferredDict, FieldSettings
 
 
 class ConfigNode(object):
+    __slots__ = ("__parent", "__key", "__node_dict", "__lookup_cache", "__lazy_settings", "__content_hash",
+                 "strict_access", "required_fields", "optional_fields")
+
     def __init__(self,
                  config_dict: dict,
-                 path: List[str] = None,
+                 parent: 'ConfigNode' = None,
+                 key: str = None,
                  strict_access: bool = True,
-                 required_fields: List[Union[str, List[str]]] = None,
-                 optional_fields: List[Union[str, List[str]]] = None):
+                 required_fields: Union[List[Union[str, List[str]]], FieldSettings] = None,
+                 optional_fields: Union[List[Union[str, List[str]]], FieldSettings] = None,
+                 lookup_cache: dict = None,
+                 lazy: bool = False):
         """
         Create a node in the Config Tree. This node will create its children if there are nested objects in the config.
         :param config_dict: Source dictionary containing the part of the config that will be in this node and its
                             children. Each dictionary value in this dictionary will become another ConfigNode that is
-                            a child of this node.
-        :param path: The access path to this node, i.e. the config keys that are used to access this node.
+                            a child of this node. ConfigNode values become children of this node as they are, i.e.,
+                            they keep their access settings.
+        :param parent: The parent node of this node. None if this node is the root of the config.
+        :param key: The config key that is used to access this node in its parent.
         :param strict_access: If True, an error will be thrown if a non-existing field is accessed. If False,
                                     None will be returned instead.
         :param required_fields: A list of field names, for which an error will be thrown if they are accessed but don't
                                 exist. These names either contain dots for the subfields or are already normalized
-                                paths.
+                                paths. The list is compiled into FieldSettings, which are shared with the children.
         :param optional_fields: A list of field names, for which None will be returned if they are accessed but don't
                                 exist. These names either contain dots for the subfields or are already normalized
-                                paths.
+                                paths. The list is compiled into FieldSettings, which are shared with the children.
+        :param lookup_cache: The lookup cache of the Config this node belongs to. It is shared by all nodes of the
+                             Config and cleared whenever one of them is modified. None if caching is disabled.
+        :param lazy: If True, the children of this node are not created until they are accessed for the first time.
+                     Until then, the nested dictionaries of the config dictionary are stored as they are. Values of
+                     type DeferredDict are loaded when they are accessed for the first time.
         """
-        self.__path = path or []
+        self.__parent = parent
+        self.__key = key
         self.strict_access = strict_access
+        self.__lookup_cache = lookup_cache
+        self.__content_hash = None
 
-        self.required_fields, required_subfields = self.__parse_field_settings(required_fields or [])
-        self.optional_fields, optional_subfields = self.__parse_field_settings(optional_fields or [])
+        required_settings = FieldSettings.compile(required_fields)
+        optional_settings = FieldSettings.compile(optional_fields)
+        self.required_fields = required_settings.fields
+        self.optional_fields = optional_settings.fields
+
+        if lazy:
+            # keep the nested dictionaries and the settings of the subfields to create the children on first access
+            self.__lazy_settings = (required_settings, optional_settings)
+            self.__node_dict = dict(config_dict)
+            for key, value in self.__node_dict.items():
+                if isinstance(value, ConfigNode):
+                    value.__adopt(self, key)
+            return
+        self.__lazy_settings = None
 
         # parse the config dictionary and create children if necessary
         node_dict = {}
         for key, value in config_dict.items():
             if isinstance(value, dict):
-                node_dict[key] = ConfigNode(value,
-                                            path=self.__path + [key],
-                                            strict_access=strict_access,
-                                            required_fields=required_subfields,
-                                            optional_fields=optional_subfields)
+                node_dict[key] = self.__node_class(value,
+                                                   parent=self,
+                                                   key=key,
+                                                   strict_access=strict_access,
+                                                   required_fields=required_settings.child(key),
+                                                   optional_fields=optional_settings.child(key),
+                                                   lookup_cache=lookup_cache)
+            elif isinstance(value, ConfigNode):
+                value.__adopt(self, key)
+                node_dict[key] = value
             else:
                 node_dict[key] = value
 
@@ -70,6 +106,8 @@ class ConfigNode(object):
         key = path[0]
         try:
             value = self.__node_dict[key]
+            if self.__lazy_settings is not None and isinstance(value, (dict, DeferredDict)):
+                value = self.__materialize_child(key, value)
             if len(path) == 1:
                 return value
             else:
@@ -90,11 +128,13 @@ class ConfigNode(object):
                       a ConfigNode.
         :param overwrite: If True, the value will be inserted if it already exists. Otherwise, a warning is printed.
         """
+        self.__invalidate_lookup_cache()
+        self.__invalidate_content_hash()
         path = normalize_path(path)
         key = path[0]
         if len(path) == 1:
             if isinstance(value, dict):
-                self.__node_dict[key] = ConfigNode(value, path=self.__path + [key])
+                self.__node_dict[key] = self.__node_class(value, parent=self, key=key, lookup_cache=self.__lookup_cache)
             else:
                 if key in self.__node_dict and not overwrite:
                     warnings.warn(RuntimeWarning(f'Overwriting already existing key {self.__path_for_key(key)} '
@@ -102,7 +142,7 @@ class ConfigNode(object):
                 self.__node_dict[key] = value
         else:
             if key not in self.__node_dict:
-                self.__node_dict[key] = ConfigNode({}, path=self.__path + [key])
+                self.__node_dict[key] = self.__node_class({}, parent=self, key=key, lookup_cache=self.__lookup_cache)
             self.get(key).add(path=path[1:], value=value, overwrite=overwrite)
 
     def update(self, path: Union[str, List[str]], value, upsert: bool = True) -> None:
@@ -115,6 +155,8 @@ class ConfigNode(object):
                       a ConfigNode.
         :param upsert: If True, the value will be inserted if it doesn't exist. Otherwise, an exception is raised.
         """
+        self.__invalidate_lookup_cache()
+        self.__invalidate_content_hash()
         path = normalize_path(path)
         key = path[0]
         if len(path) == 1:
@@ -122,63 +164,188 @@ class ConfigNode(object):
                 raise RuntimeError(f"Updating not existing key {self.__path_for_key(key)}. To insert non existing keys"
                                    f"set upsert=True.")
             if isinstance(value, dict):
-                self.__node_dict[key] = ConfigNode(value, path=self.__path + [key], strict_access=self.strict_access)
+                self.__node_dict[key] = self.__node_class(value,
+                                                          parent=self,
+                                                          key=key,
+                                                          strict_access=self.strict_access,
+                                                          lookup_cache=self.__lookup_cache)
             else:
                 self.__node_dict[key] = value
         else:
             if key not in self.__node_dict and upsert:
-                self.__node_dict[key] = ConfigNode({}, path=self.__path + [key], strict_access=self.strict_access)
+                self.__node_dict[key] = self.__node_class({},
+                                                          parent=self,
+                                                          key=key,
+                                                          strict_access=self.strict_access,
+                                                          lookup_cache=self.__lookup_cache)
             elif key not in self.__node_dict:
                 raise RuntimeError(f"Updating not existing key {self.__path_for_key(key)}. To insert non existing keys"
                                    f"set upsert=True.")
             self.get(key).update(path=path[1:], value=value, upsert=upsert)
 
-    def merge_with_env_variables(self, prefix: Union[str, List[str]]):
+    def remove(self, path: Union[str, List[str]]):
+        """
+        Remove a field from the config.
+        :raises RuntimeError: Raised when the field doesn't exist.
+        :param path: The name of the field. Can be either a string with '.' as delimiter of the nesting levels or a list
+                     of keys with each element being one nesting level.
+        """
+        self.__invalidate_lookup_cache()
+        self.__invalidate_content_hash()
+        path = normalize_path(path)
+        key = path[0]
+        if key not in self.__node_dict:
+            raise RuntimeError(f"Removing not existing key {self.__path_for_key(key)}.")
+        if len(path) == 1:
+            del self.__node_dict[key]
+        else:
+            self.get(key).remove(path[1:])
+
+    def content_hash(self) -> str:
+        """
+        Returns a fingerprint of the contents of this node and its children, which is the same for equal configs in
+        all processes (the order of the keys doesn't matter). The hashes of the nodes are cached and modifications via
+        add, update and remove only invalidate the hashes of the modified node and its ancestors, so that only they are
+        computed again. Modifications of mutable values (e.g., appending to a list in the config) are not detected.
+        :return: The hash as hexadecimal string.
+        """
+        return self.__get_content_hash().hex()
+
+    def diff(self, other: 'ConfigNode') -> ConfigDiff:
+        """
+        Compute the changes from this config to another config. Both trees are walked in parallel and subtrees that
+        are the same object (e.g., nodes that were taken over by an incremental build) are skipped. Cached content
+        hashes are not used, since they don't reflect modifications of mutable values (see content_hash).
+        :param other: The new config.
+        :return: The added, removed and changed fields. Applying the diff to this config results in the other config.
+        """
+        diff = ConfigDiff()
+        for kind, path, value in self.__changes(other, ()):
+            if kind == "added":
+                diff.added[path] = value
+            elif kind == "removed":
+                diff.removed.append(path)
+            else:
+                diff.changed[path] = value
+        return diff
+
+    def apply_diff(self, diff: ConfigDiff):
+        """
+        Apply the changes of a diff to this config.
+        :raises RuntimeError: Raised when a removed or changed field doesn't exist.
+        :param diff: The diff (see diff).
+        """
+        for path in diff.removed:
+            self.remove(list(path))
+        for path, value in diff.changed.items():
+            self.update(list(path), value, upsert=False)
+        for path, value in diff.added.items():
+            self.update(list(path), value, upsert=True)
+
+    def update_many(self, values: Dict[Tuple[str, ...], object]):
+        """
+        Update several fields in a single batch. The paths are grouped into a tree first, so that every node is only
+        visited once instead of walking from this node for every path. Fields that don't exist are inserted.
+        If a path is a prefix of another path, the value that comes later in the dictionary replaces the other one.
+        :param values: The new values keyed by the normalized paths of the fields (e.g., ("server", "port")).
+        """
+        overlay = {}
+        for path, value in values.items():
+            level = overlay
+            for key in path[:-1]:
+                if not isinstance(level.get(key), _Overlay):
+                    level[key] = _Overlay()
+                level = level[key]
+            level[path[-1]] = value
+        self.__merge_overlay(overlay)
+
+    def merge_with_env_variables(self,
+                                 prefix: Union[str, List[str]],
+                                 coerce_types: bool = False,
+                                 field_types: Dict[str, FieldTypes] = None):
         """
         Take all environment variables that start with the specified prefix or one of the specific prefixes and merge
         them into the config. These values overwrite existing ones.
         The environment variable names will be split on underscores (_) and changed to lowercase to determine the
         different keys (e.g., "FOO_BAR_TEST_ME" will result in the keys ["bar", "test", "me"] (with the prefix "FOO").
+        The environment is read in a single pass and all values are merged in a single batch (see update_many).
+        :raises ValueError: Raised when types are coerced and a value can't be converted to the type of its field.
         :param prefix: Either a single or a list of prefixes of the environment variables (e.g., "FOO_").
+        :param coerce_types: If True, the values are converted to the types of the fields (see coerce_env_values)
+                             instead of being merged as strings.
+        :param field_types: The types of fields (e.g., {"server.port": int}). Values of other fields are converted to
+                            the type of the current value of the field. Only used if coerce_types is True.
         """
         prefixes = [prefix] if isinstance(prefix, str) else prefix
-        for key in os.environ:
-            for prefix in prefixes:
-                if key.startswith(f"{prefix}_"):
-                    value = os.environ[key]
-                    cleaned_key = parse_env_variable_name(key[len(prefix) + 1:])
-                    self.update(path=cleaned_key, value=value, upsert=True)
+        values = env_variable_values(prefixes)
+        if values and coerce_types:
+            declared_types = {tuple(normalize_path(field)): types for field, types in (field_types or {}).items()}
+            values = coerce_env_values(self, values, declared_types.get)
+        if values:
+            self.update_many(values)
+
+    def clone(self, paths: Iterable[Union[str, List[str]]] = None) -> 'ConfigNode':
+        """
+        Create a copy of this node, which becomes the root of its own tree. If paths are given, only this node and the
+        nodes on the given paths are copied and all other subtrees are shared with this node (path copying), so the
+        copy takes time proportional to the length of the paths instead of the size of the config. The fields of the
+        copied nodes can be modified (e.g., the field "server.port" if "server" was copied) without affecting this
+        node, but the shared subtrees must not be modified. Values (e.g., lists) are never copied.
+        :param paths: The paths of the nodes that are copied (e.g., ["server"]). If None, all nodes are copied.
+        :return: The copy. If lookups are cached, the copy has its own lookup cache.
+        """
+        tree = None
+        if paths is not None:
+            tree = {}
+            for path in paths:
+                level = tree
+                for key in normalize_path(path):
+                    level = level.setdefault(key, {})
+        return self.__copy(None, None, tree, None if self.__lookup_cache is None else {})
 
     """
     Iteration functions
     """
     def keys(self):
-        for key, value in self.__node_dict.items():
+        for key, value in self.__child_items():
             if isinstance(value, ConfigNode):
                 yield from value.keys()
             else:
                 yield self.__path_for_key(key)
 
     def values(self):
-        for key, value in self.__node_dict.items():
+        for key, value in self.__child_items():
             if isinstance(value, ConfigNode):
                 yield from value.values()
             else:
                 yield value
 
     def items(self):
-        for key, value in self.__node_dict.items():
+        for key, value in self.__child_items():
             if isinstance(value, ConfigNode):
                 yield from value.items()
             else:
                 yield self.__path_for_key(key), value
 
+    def child_items(self):
+        """
+        Iterates over the keys and values of the direct children of this node (i.e., nested nodes are not flattened).
+        """
+        yield from self.__child_items()
+
     """
     Serialization functions
     """
+    def adopt_children(self):
+        """
+        Makes this node the parent of its child nodes again, e.g., after they were moved into a config whose
+        incremental build failed.
+        """
+        self.__adopt_children(self.__node_dict)
+
     def to_dict(self) -> dict:
         config_dict = {}
-        for key, value in self.__node_dict.items():
+        for key, value in self.__child_items():
             if isinstance(value, ConfigNode):
                 config_dict[key] = value.to_dict()
             else:
@@ -189,21 +356,57 @@ class ConfigNode(object):
         """
         Serialize the config to a json dictionary/object. The default serialization method for non-JSON serializable
         types is just using their string representation (e.g., datetime.timedelta).
+        The JSON library that is used can be set via json_backends.set_json_backend.
         :return: The JSON object of the config as string.
         """
-        return json.dumps(self.to_dict(), default=str)
+        return get_json_backend().dumps(self.to_dict())
 
-    def to_msgpack(self) -> bytes:
+    def to_msgpack(self, preserve_types: bool = False) -> bytes:
         """
-        Serialize the config as a dictionary via msgpack. To handle unserializable data types, the config is first
-        parsed to json (which converts every unparsable type to strings), parsed back and then serialized with msgpack.
+        Serialize the config as a dictionary via msgpack. The config tree is serialized directly in a single pass.
+        :param preserve_types: If False, unserializable data types are serialized with their string representation (like
+                               in to_json). If True, timedelta, datetime, date and time values are serialized as msgpack
+                               extension types, which are restored by from_msgpack.
         :return: The binary msgpack representation of the config.
         """
-        return msgpack.dumps(json.loads(self.to_json()))
+        import msgpack
+        default = self.__encode_msgpack_typed if preserve_types else self.__encode_msgpack
+        return msgpack.packb(self.__node_dict, default=default, use_bin_type=True)
+
+    def freeze(self) -> FrozenConfig:
+        """
+        Create an immutable snapshot of this node and its children, which stores all values in a flat dictionary keyed
+        by their full path. Lookups in the snapshot are a single dictionary access, it is hashable and can be shared
+        between threads without locking.
+        :return: The snapshot of the config.
+        """
+        required_fields, optional_fields = self.__collect_field_settings("")
+        return FrozenConfig(self.to_dict(),
+                            strict_access=self.strict_access,
+                            required_fields=required_fields,
+                            optional_fields=optional_fields)
 
     @classmethod
     def from_msgpack(cls, data: bytes) -> 'ConfigNode':
-        return cls(msgpack.loads(data, raw=False))
+        """
+        Deserialize a config that was serialized via msgpack. The nodes of the config are created directly while the
+        data is unpacked. Values that were serialized with preserve_types=True are restored.
+        :param data: The binary msgpack representation of the config.
+        :return: The deserialized config.
+        """
+        import msgpack
+        root = msgpack.unpackb(data,
+                               raw=False,
+                               object_hook=ConfigNode.__from_node_dict,
+                               list_hook=ConfigNode.__restore_list,
+                               ext_hook=decode_typed,
+                               # configs may contain dictionaries with other keys than strings (e.g., integers)
+                               strict_map_key=False)
+        if cls is ConfigNode:
+            return root
+        config = cls({})
+        config.__adopt_children(root.__node_dict)
+        return config
 
     """
     Built-in python functions
@@ -220,10 +423,25 @@ class ConfigNode(object):
         returned in the field does not exist.
         :raises AttributeError: Raised when a non-existing field is accessed when either strict access is defined or the
                                 field is a required field.
+        Fields are looked up directly in the children of this node, without normalizing the name into a path. If lookups
+        are cached (see Config), the values are also stored as attributes of this node, so that later accesses of the
+        same field don't call this method at all. They are removed when this node is modified.
         :param item: the field that is accessed.
         :return: The value of the referenced field.
         """
-        return self.get(item)
+        # private attributes are only missing while unpickling, before __setstate__ was called
+        if item.startswith("_ConfigNode__"):
+            raise AttributeError(item)
+        try:
+            value = self.__node_dict[item]
+        except KeyError:
+            # missing fields are handled by get
+            return self.get(item)
+        if self.__lazy_settings is not None and isinstance(value, (dict, DeferredDict)):
+            value = self.__materialize_child(item, value)
+        if isinstance(self, _CachedAttributes):
+            self.__dict__[item] = value
+        return value
 
     def __contains__(self, item: Union[str, List[str]]) -> bool:
         """
@@ -242,31 +460,72 @@ class ConfigNode(object):
 
     def __str__(self):
         return f"ConfigNode(path={self.__path}, values={self.__node_dict}, strict_access={self.strict_access}, " \
-               f"required_fields={self.required_fields}, optional_fields={self.optional_fields})"
+               f"required_fields={list(self.required_fields)}, optional_fields={list(self.optional_fields)})"
 
     __repr__ = __str__
 
     def __eq__(self, other):
         if isinstance(other, ConfigNode):
+            # stops at the first difference
+            return next(self.__changes(other, ()), None) is None
+        elif isinstance(other, FrozenConfig):
             return self.to_dict() == other.to_dict()
         else:
             return False
 
     def __getstate__(self):
         """
-        This method is needed to enable pickling since this class overwrites __getattr__.
+        This method is needed to enable pickling since this class overwrites __getattr__ and uses __slots__.
+        The state is a tuple of the slot values, which is smaller and faster to unpickle than a dictionary.
         """
-        return vars(self)
+        return tuple(getattr(self, name) for name in _slot_names(type(self)))
 
     def __setstate__(self, state):
         """
-        This method is needed to enable pickling since this class overwrites __getattr__.
+        This method is needed to enable pickling since this class overwrites __getattr__ and uses __slots__.
         """
-        vars(self).update(state)
+        if isinstance(state, dict) and "_ConfigNode__path" in state:
+            self.__set_legacy_state(state)
+            return
+        # configs pickled by older versions with __slots__ store the state as dictionary
+        items = state.items() if isinstance(state, dict) else zip(_slot_names(type(self)), state)
+        for name, value in items:
+            setattr(self, name, value)
 
     """
     Private functions used in this class (e.g., for utility).
     """
+    def __set_legacy_state(self, state: dict):
+        """
+        Restores a node that was pickled by a version without __slots__, whose state is the dictionary of its
+        attributes. It contains the path of the node instead of its parent and the names of the required and optional
+        fields of the node as lists. The children were already restored and are adopted by this node.
+        """
+        path = state["_ConfigNode__path"]
+        self.__parent = None
+        self.__key = path[-1] if path else None
+        self.__lazy_settings = None
+        self.__content_hash = None
+        self.strict_access = state["strict_access"]
+        self.required_fields = frozenset(state["required_fields"])
+        self.optional_fields = frozenset(state["optional_fields"])
+        # the cached values of the pickled lookup cache are not restored
+        lookup_cache = None if state.get("_ConfigNode__lookup_cache") is None else {}
+        for name in _slot_names(type(self)):
+            if name.endswith("__lookup_cache"):
+                setattr(self, name, lookup_cache)
+        self.__adopt_children(state["_ConfigNode__node_dict"])
+
+    @property
+    def __path(self) -> List[str]:
+        path = []
+        node = self
+        while node.__parent is not None:
+            path.append(node.__key)
+            node = node.__parent
+        path.reverse()
+        return path
+
     @property
     def __path_str(self):
         return ".".join(self.__path)
@@ -275,32 +534,334 @@ class ConfigNode(object):
         print_path = self.__path_str + "." * bool(self.__path)
         return print_path + key
 
-    def __parse_field_settings(self, field_names: List[Union[str, List[str]]]) -> Tuple[List[str], List[List[str]]]:
+    def __collect_field_settings(self, prefix: str) -> Tuple[List[str], List[str]]:
         """
-        Parses settings (required or optional) for fields and subfields of this node.
-        :param field_names: A list of either field names containing dots or already normalized paths.
-        :return: A tuple of first a list of the field names that are in this node and secondly a list of normalized
-                 paths of subfields (i.e., fields in children of this node).
+        Collects the required and optional fields of this node and its children.
+        :param prefix: The path prefix that is prepended to the field names of this node.
+        :return: A tuple of the full paths of the required fields and the full paths of the optional fields.
         """
-        settings = []
-        subfield_settings = []
-        normalized_fields = [normalize_path(field) for field in field_names]
-        for path in normalized_fields:
-            if len(path) == 1:
-                settings.append(path[0])
-            else:
-                subfield_settings.append(path[1:])
-        return settings, subfield_settings
+        required_fields = [prefix + field for field in self.required_fields]
+        optional_fields = [prefix + field for field in self.optional_fields]
+        for key, value in self.__child_items():
+            if isinstance(value, ConfigNode):
+                child_required_fields, child_optional_fields = value.__collect_field_settings(f"{prefix}{key}.")
+                required_fields += child_required_fields
+                optional_fields += child_optional_fields
+        return required_fields, optional_fields
+
+    def __changes(self, other: 'ConfigNode', path: FieldPath):
+        """
+        Walks this node and the other node in parallel and yields the differences as tuples of the kind of change
+        ("added", "removed" or "changed"), the path and the new value.
+        """
+        if self is other:
+            return
+        other_items = dict(other.__child_items())
+        for key, value in self.__child_items():
+            field_path = path + (key,)
+            if key not in other_items:
+                yield "removed", field_path, None
+                continue
+            other_value = other_items[key]
+            if value is other_value:
+                continue
+            if isinstance(value, ConfigNode) and isinstance(other_value, ConfigNode):
+                yield from value.__changes(other_value, field_path)
+            elif isinstance(value, ConfigNode) or isinstance(other_value, ConfigNode) or value != other_value:
+                yield "changed", field_path, ConfigNode.__plain_value(other_value)
+        for key, other_value in other_items.items():
+            if key not in self.__node_dict:
+                yield "added", path + (key,), ConfigNode.__plain_value(other_value)
+
+    @staticmethod
+    def __plain_value(value):
+        return value.to_dict() if isinstance(value, ConfigNode) else value
+
+    def __child_items(self):
+        """
+        Iterates over the keys and values of this node and creates the children that were not yet accessed if this
+        node is lazy.
+        """
+        if self.__lazy_settings is None:
+            yield from self.__node_dict.items()
+            return
+        for key, value in self.__node_dict.items():
+            if isinstance(value, (dict, DeferredDict)):
+                value = self.__materialize_child(key, value)
+            yield key, value
+
+    def __materialize_child(self, key: str, config_dict: Union[dict, DeferredDict]) -> 'ConfigNode':
+        """
+        Creates the child of a lazy node that was not accessed before and replaces its dictionary in this node.
+        """
+        if isinstance(config_dict, DeferredDict):
+            config_dict = config_dict.load()
+            if not isinstance(config_dict, dict):
+                self.__node_dict[key] = config_dict
+                return config_dict
+        required_settings, optional_settings = self.__lazy_settings
+        child = self.__node_class(config_dict,
+                                  parent=self,
+                                  key=key,
+                                  strict_access=self.strict_access,
+                                  required_fields=required_settings.child(key),
+                                  optional_fields=optional_settings.child(key),
+                                  lookup_cache=self.__lookup_cache,
+                                  lazy=True)
+        self.__node_dict[key] = child
+        return child
+
+    @staticmethod
+    def __encode_msgpack(value):
+        if isinstance(value, ConfigNode):
+            return value.__node_dict
+        elif isinstance(value, DeferredDict):
+            return value.load()
+        return str(value)
+
+    @staticmethod
+    def __encode_msgpack_typed(value):
+        if isinstance(value, ConfigNode):
+            return value.__node_dict
+        elif isinstance(value, DeferredDict):
+            return value.load()
+        return encode_typed(value)
+
+    @staticmethod
+    def __from_node_dict(node_dict: dict) -> 'ConfigNode':
+        """
+        Creates a node from an unpacked msgpack map, whose nested maps were already turned into nodes.
+        """
+        node = ConfigNode({})
+        node.__adopt_children(node_dict)
+        return node
+
+    @staticmethod
+    def __restore_list(values: list) -> list:
+        """
+        Turns the nodes that were created for maps in an unpacked msgpack array back into dictionaries, since
+        dictionaries in lists are not converted to nodes.
+        """
+        return [value.to_dict() if isinstance(value, ConfigNode) else value for value in values]
+
+    @property
+    def __node_class(self) -> type:
+        """
+        The class of the children of this node. Nodes of configs with cached lookups also cache accessed fields as
+        attributes (see __getattr__).
+        """
+        return ConfigNode if self.__lookup_cache is None else _CachingConfigNode
+
+    def __copy(self, parent: 'ConfigNode', key: str, tree: dict, lookup_cache: dict) -> 'ConfigNode':
+        """
+        Copies this node and its children that are nodes and keys of the tree of paths (all children if it is None).
+        """
+        node = object.__new__(type(self))
+        for name in _slot_names(type(self)):
+            # Config has its own slot for the lookup cache
+            setattr(node, name, lookup_cache if name.endswith("__lookup_cache") else getattr(self, name))
+        node.__parent = parent
+        node.__key = key
+        node.__node_dict = dict(self.__node_dict)
+        for child_key, value in node.__node_dict.items():
+            if isinstance(value, ConfigNode) and (tree is None or child_key in tree):
+                node.__node_dict[child_key] = value.__copy(node, child_key, None if tree is None else tree[child_key],
+                                                           lookup_cache)
+        return node
+
+    def __adopt(self, parent: 'ConfigNode', key: str):
+        """
+        Makes this node, which was created separately, the child of the given node.
+        """
+        self.__parent = parent
+        self.__key = key
+        if self.__lookup_cache is not parent.__lookup_cache:
+            self.__set_lookup_cache(parent.__lookup_cache)
+
+    def __set_lookup_cache(self, lookup_cache: dict):
+        self.__lookup_cache = lookup_cache
+        for value in self.__node_dict.values():
+            if isinstance(value, ConfigNode):
+                value.__set_lookup_cache(lookup_cache)
+
+    def __adopt_children(self, node_dict: dict):
+        """
+        Sets the node dictionary of this node and makes this node the parent of the nodes in it.
+        """
+        for key, value in node_dict.items():
+            if isinstance(value, ConfigNode):
+                value.__adopt(self, key)
+        self.__node_dict = node_dict
+
+    def __get_content_hash(self) -> bytes:
+        if self.__content_hash is None:
+            entries = []
+            for key, value in self.__child_items():
+                if isinstance(value, ConfigNode):
+                    entries.append((_pack_content(key), value.__get_content_hash()))
+                else:
+                    entries.append((_pack_content(key), blake2b(b"v" + _pack_content(value), digest_size=16).digest()))
+            digest = blake2b(b"n", digest_size=16)
+            for packed_key, value_hash in sorted(entries):
+                digest.update(len(packed_key).to_bytes(4, "little"))
+                digest.update(packed_key)
+                digest.update(value_hash)
+            self.__content_hash = digest.digest()
+        return self.__content_hash
+
+    def __merge_overlay(self, overlay: dict):
+        self.__invalidate_lookup_cache()
+        self.__invalidate_content_hash()
+        for key, value in overlay.items():
+            if not isinstance(value, _Overlay):
+                self.__node_dict[key] = self.__node_class(value,
+                                                          parent=self,
+                                                          key=key,
+                                                          strict_access=self.strict_access,
+                                                          lookup_cache=self.__lookup_cache) \
+                    if isinstance(value, dict) else value
+                continue
+            child = self.__node_dict.get(key)
+            if self.__lazy_settings is not None and isinstance(child, (dict, DeferredDict)):
+                child = self.__materialize_child(key, child)
+            if not isinstance(child, ConfigNode):
+                child = self.__node_class({}, parent=self, key=key, strict_access=self.strict_access,
+                                          lookup_cache=self.__lookup_cache)
+                self.__node_dict[key] = child
+            child.__merge_overlay(value)
+
+    def __invalidate_content_hash(self):
+        """
+        Invalidates the content hashes of this node and its ancestors. The hashes of all ancestors of a node without
+        hash are invalid as well, so the walk to the root stops at the first node without hash.
+        """
+        node = self
+        while node is not None and node.__content_hash is not None:
+            node.__content_hash = None
+            node = node.__parent
+
+    def __invalidate_lookup_cache(self):
+        """
+        Clears the lookup cache of the config and the cached attributes of this node (the attributes of other nodes are
+        their children, which are not replaced by modifications of this node).
+        """
+        if self.__lookup_cache:
+            self.__lookup_cache.clear()
+        if isinstance(self, _CachedAttributes):
+            self.__dict__.clear()
+
+
+class _Overlay(dict):
+    """
+    Level of the tree of paths in ConfigNode.update_many. A separate type distinguishes it from dictionary values.
+    """
+
+
+# msgpack extension type codes of the values in content hashes that msgpack doesn't support directly (the codes of
+# encode_typed are used for timedelta, datetime, date and time values)
+_TUPLE_CONTENT_TYPE = 16
+_OTHER_CONTENT_TYPE = 17
+
+
+def _pack_content(value) -> bytes:
+    """
+    Serializes a value for the content hash. Tuples and other types that msgpack doesn't support directly are packed
+    as extension types with their own codes, so that they differ from lists and strings.
+    """
+    import msgpack
+    return msgpack.packb(value, default=_encode_content, use_bin_type=True, strict_types=True)
+
+
+def _encode_content(value):
+    import msgpack
+    if isinstance(value, tuple):
+        return msgpack.ExtType(_TUPLE_CONTENT_TYPE, _pack_content(list(value)))
+    encoded_value = encode_typed(value)
+    if isinstance(encoded_value, msgpack.ExtType):
+        return encoded_value
+    # other values are identified by their type and representation instead of their string representation
+    value_type = type(value)
+    return msgpack.ExtType(_OTHER_CONTENT_TYPE,
+                           _pack_content([f"{value_type.__module__}.{value_type.__qualname__}", repr(value)]))
+
+
+@lru_cache(maxsize=None)
+def _slot_names(cls: type) -> Tuple[str, ...]:
+    """
+    Returns the names of all slots of the given class and its base classes. Names of private slots are mangled.
+    """
+    names = []
+    for base_class in cls.__mro__:
+        for name in getattr(base_class, "__slots__", ()):
+            # cached attributes are not part of the state
+            if name == "__dict__":
+                continue
+            if name.startswith("__") and not name.endswith("__"):
+                name = f"_{base_class.__name__.lstrip('_')}{name}"
+            names.append(name)
+    return tuple(names)
 
 
 class Config(ConfigNode):
+    __slots__ = ("__lookup_cache",)
+
+    def __new__(cls, *args, **kwargs):
+        # configs with cached lookups also cache the accessed fields of their nodes as attributes, which needs __dict__
+        cache_lookups = kwargs.get("cache_lookups", args[4] if len(args) > 4 else False)
+        if cls is Config and cache_lookups:
+            cls = _CachingConfig
+        return super(Config, cls).__new__(cls)
+
     def __init__(self,
                  config_dict: dict,
                  strict_access: bool = True,
                  required_fields: List[Union[str, List[str]]] = None,
-                 optional_fields: List[Union[str, List[str]]] = None):
+                 optional_fields: List[Union[str, List[str]]] = None,
+                 cache_lookups: bool = False,
+                 lazy: bool = False):
+        """
+        Create the root node of the Config Tree.
+        :param cache_lookups: If True, the values of accessed paths (e.g., "server.port") are cached, so that repeated
+                              lookups of the same path are a single dictionary access instead of a walk through the
+                              tree. The cache is cleared whenever any node of the config is modified. Fields that are
+                              accessed as attributes (e.g., config.server.port) are cached as attributes of their
+                              nodes, so that repeated accesses are plain attribute loads.
+        :param lazy: If True, the nodes for nested objects are not created until they are accessed for the first time.
+        For the other parameters see ConfigNode.
+        """
+        self.__lookup_cache = {} if cache_lookups else None
         super(Config, self).__init__(config_dict=config_dict,
-                                     path=[],
                                      strict_access=strict_access,
                                      required_fields=required_fields,
-                                     optional_fields=optional_fields)
+                                     optional_fields=optional_fields,
+                                     lookup_cache=self.__lookup_cache,
+                                     lazy=lazy)
+
+    def get(self, path: Union[str, List[str]]):
+        """
+        Retrieve a value in the config. If lookup caching is enabled, the values of string paths are cached.
+        See ConfigNode.get for details.
+        """
+        if self.__lookup_cache is None or not isinstance(path, str):
+            return super(Config, self).get(path)
+        try:
+            return self.__lookup_cache[path]
+        except KeyError:
+            value = super(Config, self).get(path)
+            self.__lookup_cache[path] = value
+            return value
+
+
+class _CachedAttributes(object):
+    """
+    Base class of the nodes whose __dict__ stores the values of their accessed fields (see ConfigNode.__getattr__).
+    """
+    __slots__ = ()
+
+
+class _CachingConfigNode(ConfigNode, _CachedAttributes):
+    __slots__ = ("__dict__",)
+
+
+class _CachingConfig(Config, _CachedAttributes):
+    __slots__ = ("__dict__",)
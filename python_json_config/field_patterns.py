@@ -0,0 +1,81 @@
+from typing import Iterator, Tuple, List, Union
+
+from .config_node import ConfigNode
+from .utils import normalize_path
+
+FieldPath = Tuple[str, ...]
+
+# matches any single key
+ANY_KEY = "*"
+# matches any number of keys (including none)
+ANY_KEYS = "**"
+
+
+def is_field_pattern(field_name: Union[str, List[str]]) -> bool:
+    """
+    Tests if a field name contains wildcards (e.g., "backends.*.port" or "**.timeout").
+    """
+    return any(key in (ANY_KEY, ANY_KEYS) for key in normalize_path(field_name))
+
+
+def path_matches(pattern: FieldPath, path: FieldPath) -> bool:
+    """
+    Tests if the path of a field matches a field name that may contain wildcards.
+    :param pattern: The normalized field name.
+    :param path: The path of the field.
+    """
+    if not pattern:
+        return not path
+    if pattern[0] == ANY_KEYS:
+        return any(path_matches(pattern[1:], path[index:]) for index in range(len(path) + 1))
+    return bool(path) and pattern[0] in (ANY_KEY, path[0]) and path_matches(pattern[1:], path[1:])
+
+
+def iter_matching_paths(node: ConfigNode, pattern: FieldPath) -> Iterator[FieldPath]:
+    """
+    Yields the paths of the existing fields of a config that match a field name with wildcards, in the order of the
+    fields in the config. Every matching field is yielded once.
+    :param node: The ConfigNode whose fields are matched.
+    :param pattern: The normalized field name.
+    """
+    for _, _, path in iter_matching_fields(node, pattern):
+        yield path
+
+
+def iter_matching_fields(node: ConfigNode, pattern: FieldPath) -> Iterator[Tuple[ConfigNode, str, FieldPath]]:
+    """
+    Like iter_matching_paths, but yields the node that contains each matching field and the key of the field in that
+    node together with its path, so that the field can be read and modified without looking it up from the root.
+    :param node: The ConfigNode whose fields are matched.
+    :param pattern: The normalized field name.
+    """
+    seen = set()
+    for field in _iter_matching_fields(node, tuple(pattern), ()):
+        path = field[2]
+        if path not in seen:
+            seen.add(path)
+            yield field
+
+
+def _iter_matching_fields(node: ConfigNode,
+                          pattern: FieldPath,
+                          path: FieldPath) -> Iterator[Tuple[ConfigNode, str, FieldPath]]:
+    key, rest = pattern[0], pattern[1:]
+    if key == ANY_KEYS:
+        # no keys
+        if rest:
+            yield from _iter_matching_fields(node, rest, path)
+        # one or more keys
+        for child_key, value in node.child_items():
+            if not rest:
+                yield node, child_key, path + (child_key,)
+            if isinstance(value, ConfigNode):
+                yield from _iter_matching_fields(value, pattern, path + (child_key,))
+        return
+
+    items = node.child_items() if key == ANY_KEY else [(key, node.get([key]))] if key in node else []
+    for child_key, value in items:
+        if not rest:
+            yield node, child_key, path + (child_key,)
+        elif isinstance(value, ConfigNode):
+            yield from _iter_matching_fields(value, rest, path + (child_key,))
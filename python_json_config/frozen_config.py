@@ -0,0 +1,228 @@
+from typing import List, Union, Tuple, FrozenSet
+
+from .json_backends import get_json_backend
+
+
+class FrozenConfig(object):
+    __slots__ = ("__values", "__prefix", "__children", "__settings", "__hash")
+
+    def __init__(self,
+                 config_dict: dict,
+                 strict_access: bool = True,
+                 required_fields: List[str] = None,
+                 optional_fields: List[str] = None):
+        """
+        Create an immutable snapshot of a config. All values are stored in a single flat dictionary that is keyed by
+        the full path of the values (e.g., "server.port"), so that every lookup is a single dictionary access. Nested
+        objects are represented by lightweight views on the same dictionary, which enable attribute access
+        (e.g., config.server.port). Lists and sets are stored as tuples and frozensets.
+        Since the snapshot can't be modified, it is hashable and can be shared between threads without locking.
+        :param config_dict: Source dictionary containing the config values.
+        :param strict_access: If True, an error will be thrown if a non-existing field is accessed. If False, None will
+                              be returned instead.
+        :param required_fields: A list of full field paths (e.g., "server.port"), for which an error will be thrown if
+                                they are accessed but don't exist.
+        :param optional_fields: A list of full field paths, for which None will be returned if they are accessed but
+                                don't exist.
+        """
+        settings = (strict_access, frozenset(required_fields or []), frozenset(optional_fields or []))
+        values = {}
+        self.__initialize(values, "", FrozenConfig.__flatten(config_dict, "", values, settings), settings)
+
+    def __initialize(self, values: dict, prefix: str, children: Tuple[str, ...], settings: tuple):
+        object.__setattr__(self, "_FrozenConfig__values", values)
+        object.__setattr__(self, "_FrozenConfig__prefix", prefix)
+        object.__setattr__(self, "_FrozenConfig__children", children)
+        object.__setattr__(self, "_FrozenConfig__settings", settings)
+        object.__setattr__(self, "_FrozenConfig__hash", None)
+
+    @staticmethod
+    def __flatten(config_dict: dict, prefix: str, values: dict, settings: tuple) -> Tuple[str, ...]:
+        """
+        Insert the values of the passed dictionary and of all nested dictionaries into the flat value dictionary.
+        :return: The keys of the passed dictionary.
+        """
+        for key, value in config_dict.items():
+            path = prefix + key
+            if isinstance(value, dict):
+                view = FrozenConfig.__new__(FrozenConfig)
+                view.__initialize(values, path + ".", FrozenConfig.__flatten(value, path + ".", values, settings),
+                                  settings)
+                values[path] = view
+            else:
+                values[path] = _freeze_value(value)
+        return tuple(config_dict.keys())
+
+    """
+    Methods to access the config contents.
+    """
+    def get(self, path: Union[str, List[str]]):
+        """
+        Retrieve a value in the config.
+        If strict access is defined or the field is a required field, an AttributeError is thrown if the referenced
+        field does not exist. Otherwise, i.e. non-strict access is defined or the field is an optional field, None is
+        returned in the field does not exist.
+        :raises AttributeError: Raised when a non-existing field is accessed when either strict access is defined or the
+                                field is a required field.
+        :param path: The key of the field. Can be either a string with '.' as delimiter of the nesting levels or a list
+                     of keys with each element being one nesting level.
+        :return: The value of the referenced field.
+        """
+        full_path = self.__prefix + (path if isinstance(path, str) else ".".join(path))
+        try:
+            return self.__values[full_path]
+        except KeyError:
+            return self.__get_missing(full_path)
+
+    def __get_missing(self, full_path: str):
+        strict_access, required_fields, optional_fields = self.__settings
+        keys = full_path.split(".")
+        for index in range(len(keys)):
+            path = ".".join(keys[:index + 1])
+            if path not in self.__values:
+                break
+            if not isinstance(self.__values[path], FrozenConfig):
+                raise AttributeError(f'Value of key "{path}" is not a config object')
+
+        if path in optional_fields or (not strict_access and path not in required_fields):
+            return None
+        raise AttributeError(f'No value exists for key "{path}"')
+
+    def add(self, path: Union[str, List[str]], value, overwrite: bool = True):
+        self.__raise_immutable()
+
+    def update(self, path: Union[str, List[str]], value, upsert: bool = True):
+        self.__raise_immutable()
+
+    def merge_with_env_variables(self, prefix: Union[str, List[str]]):
+        self.__raise_immutable()
+
+    """
+    Iteration functions
+    """
+    def keys(self):
+        for key, value in self.__child_items():
+            if isinstance(value, FrozenConfig):
+                yield from value.keys()
+            else:
+                yield self.__prefix + key
+
+    def values(self):
+        for key, value in self.__child_items():
+            if isinstance(value, FrozenConfig):
+                yield from value.values()
+            else:
+                yield value
+
+    def items(self):
+        for key, value in self.__child_items():
+            if isinstance(value, FrozenConfig):
+                yield from value.items()
+            else:
+                yield self.__prefix + key, value
+
+    """
+    Serialization functions
+    """
+    def to_dict(self) -> dict:
+        config_dict = {}
+        for key, value in self.__child_items():
+            if isinstance(value, FrozenConfig):
+                config_dict[key] = value.to_dict()
+            else:
+                config_dict[key] = _thaw_value(value)
+        return config_dict
+
+    def to_json(self) -> str:
+        """
+        Serialize the config to a json dictionary/object. The default serialization method for non-JSON serializable
+        types is just using their string representation (e.g., datetime.timedelta).
+        :return: The JSON object of the config as string.
+        """
+        return get_json_backend().dumps(self.to_dict())
+
+    """
+    Built-in python functions
+    """
+    def __iter__(self):
+        yield from self.keys()
+
+    def __getattr__(self, item: str):
+        return self.get(item)
+
+    def __setattr__(self, key, value):
+        self.__raise_immutable()
+
+    def __delattr__(self, item):
+        self.__raise_immutable()
+
+    def __contains__(self, item: Union[str, List[str]]) -> bool:
+        try:
+            result = self.get(item)
+            return result is not None
+        except AttributeError:
+            return False
+
+    def __str__(self):
+        return f"FrozenConfig(path={self.__prefix[:-1]!r}, values={self.to_dict()}, " \
+               f"strict_access={self.__settings[0]})"
+
+    __repr__ = __str__
+
+    def __eq__(self, other):
+        if isinstance(other, FrozenConfig):
+            return self is other or (hash(self) == hash(other) and self.to_dict() == other.to_dict())
+        return NotImplemented
+
+    def __hash__(self):
+        if self.__hash is None:
+            # the hash is computed lazily, concurrent computations just store the same value
+            prefix_length = len(self.__prefix)
+            object.__setattr__(self, "_FrozenConfig__hash",
+                               hash(frozenset((key[prefix_length:], value) for key, value in self.items())))
+        return self.__hash
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        strict_access, required_fields, optional_fields = self.__settings
+        return FrozenConfig, (self.to_dict(),
+                              strict_access,
+                              self.__relative_paths(required_fields),
+                              self.__relative_paths(optional_fields))
+
+    """
+    Private functions used in this class (e.g., for utility).
+    """
+    def __child_items(self):
+        for key in self.__children:
+            yield key, self.__values[self.__prefix + key]
+
+    def __relative_paths(self, paths: FrozenSet[str]) -> List[str]:
+        return [path[len(self.__prefix):] for path in paths if path.startswith(self.__prefix)]
+
+    @staticmethod
+    def __raise_immutable():
+        raise TypeError("FrozenConfig objects are immutable.")
+
+
+def _freeze_value(value):
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze_value(element) for element in value)
+    elif isinstance(value, (set, frozenset)):
+        return frozenset(_freeze_value(element) for element in value)
+    elif isinstance(value, dict):
+        return FrozenConfig(value)
+    return value
+
+
+def _thaw_value(value):
+    if isinstance(value, tuple):
+        return [_thaw_value(element) for element in value]
+    elif isinstance(value, FrozenConfig):
+        return value.to_dict()
+    return value
@@ -0,0 +1,120 @@
+from typing import Iterator, Iterable, Set, Tuple
+
+from .config_node import ConfigNode
+from .field_patterns import ANY_KEY, ANY_KEYS, path_matches
+
+FieldPath = Tuple[str, ...]
+
+
+def changed_paths(old_dict: dict, new_dict: dict, path: FieldPath = ()) -> Iterator[FieldPath]:
+    """
+    Compares two config dictionaries and yields the paths of the fields that were added, removed or changed. Nested
+    dictionaries are compared recursively, so only the topmost changed paths are yielded.
+    :param old_dict: The previous config dictionary.
+    :param new_dict: The new config dictionary.
+    :param path: The path of the compared dictionaries.
+    """
+    for key, new_value in new_dict.items():
+        field_path = path + (key,)
+        if key not in old_dict:
+            yield field_path
+            continue
+        old_value = old_dict[key]
+        if isinstance(old_value, dict) and isinstance(new_value, dict):
+            yield from changed_paths(old_value, new_value, field_path)
+        elif type(old_value) is not type(new_value) or old_value != new_value:
+            yield field_path
+    for key in old_dict:
+        if key not in new_dict:
+            yield path + (key,)
+
+
+def dirty_paths(changed: Iterable[FieldPath], processed_paths: Iterable[FieldPath]) -> Set[FieldPath]:
+    """
+    Determines the subtrees that have to be rebuilt from the source dictionary. These are the changed fields and the
+    processed fields (i.e., fields that are validated, transformed or set by environment variables) that contain a
+    changed field, since their processing depends on the whole subtree.
+    :param changed: The paths of the changed fields.
+    :param processed_paths: The paths of the processed fields, which may contain wildcards.
+    :return: The paths of the roots of the subtrees that have to be rebuilt.
+    """
+    dirty = set(changed)
+    ancestors = _ancestors(dirty)
+    patterns = []
+    for path in processed_paths:
+        if ANY_KEY in path or ANY_KEYS in path:
+            patterns.append(path)
+        elif path in ancestors:
+            dirty.add(path)
+    dirty.update(ancestor for ancestor in ancestors if any(path_matches(pattern, ancestor) for pattern in patterns))
+    return dirty
+
+
+def is_affected(path: FieldPath, dirty: Set[FieldPath]) -> bool:
+    """
+    Tests if a field is in one of the rebuilt subtrees, i.e., if it has to be processed again.
+    """
+    return any(path[:index] in dirty for index in range(1, len(path) + 1))
+
+
+def assemble_config_dict(new_dict: dict, previous_config: ConfigNode, dirty: Set[FieldPath]) -> dict:
+    """
+    Creates the source dictionary of the new config. Rebuilt subtrees are taken from the new dictionary and the nodes
+    and values of all other fields are taken from the previous config. The nodes of the previous config become nodes
+    of the new config, so the previous config must not be modified anymore.
+    :param new_dict: The new config dictionary.
+    :param previous_config: The config that was built from the previous config dictionary.
+    :param dirty: The paths of the subtrees that are rebuilt.
+    :return: The source dictionary, which contains ConfigNodes of the previous config.
+    """
+    return _assemble(new_dict, previous_config, dirty, _ancestors(dirty), ())
+
+
+def reassembled_paths(paths: Iterable[FieldPath], dirty: Set[FieldPath]) -> Set[FieldPath]:
+    """
+    Returns the paths of fields that are not taken from the previous config by assemble_config_dict, i.e., the fields
+    in the rebuilt subtrees and the fields whose parents are assembled from the keys of the new dictionary (the root
+    and the ancestors of the rebuilt subtrees). Fields that are set by environment variables are missing from these
+    parents if they don't exist in the dictionary, so they have to be set and processed again.
+    :param paths: The paths of the fields.
+    :param dirty: The paths of the subtrees that are rebuilt.
+    """
+    ancestors = _ancestors(dirty)
+    return {path for path in paths
+            if is_affected(path, dirty) or all(path[:index] in ancestors for index in range(1, len(path)))}
+
+
+def restore_previous_config(previous_config: ConfigNode, dirty: Set[FieldPath]):
+    """
+    Moves the nodes that were taken from the previous config by assemble_config_dict back to it, so that the previous
+    config can be used and modified again if the new config is discarded (e.g., because its validation failed).
+    :param previous_config: The config that was passed to assemble_config_dict.
+    :param dirty: The paths of the subtrees that were rebuilt.
+    """
+    # the taken nodes are children of the root or of the ancestors of the rebuilt subtrees
+    previous_config.adopt_children()
+    for path in _ancestors(dirty):
+        # the ancestors of fields that are new in the discarded config don't exist in the previous config
+        if list(path) not in previous_config:
+            continue
+        node = previous_config.get(list(path))
+        if isinstance(node, ConfigNode):
+            node.adopt_children()
+
+
+def _assemble(new_dict: dict, previous_node: ConfigNode, dirty: Set[FieldPath], ancestors: Set[FieldPath],
+              path: FieldPath) -> dict:
+    config_dict = {}
+    for key, value in new_dict.items():
+        field_path = path + (key,)
+        if field_path in dirty:
+            config_dict[key] = value
+        elif field_path in ancestors:
+            config_dict[key] = _assemble(value, previous_node.get([key]), dirty, ancestors, field_path)
+        else:
+            config_dict[key] = previous_node.get([key])
+    return config_dict
+
+
+def _ancestors(paths: Iterable[FieldPath]) -> Set[FieldPath]:
+    return {path[:index] for path in paths for index in range(1, len(path))}
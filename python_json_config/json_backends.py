@@ -0,0 +1,108 @@
+import json
+from typing import Callable, Union, Optional
+
+JsonData = Union[str, bytes]
+
+
+class JsonBackend(object):
+    def __init__(self, name: str, loads: Callable[[JsonData], object], dumps: Callable[[object], str]):
+        """
+        Wraps a JSON library that is used to parse and serialize configs.
+        :param name: The name of the backend.
+        :param loads: Function that parses a JSON string or bytes object.
+        :param dumps: Function that serializes an object to a JSON string. Non-JSON serializable values have to be
+                      serialized with their string representation (e.g., datetime.timedelta).
+        """
+        self.name = name
+        self.loads = loads
+        self.dumps = dumps
+
+    def __str__(self):
+        return f"JsonBackend(name={self.name})"
+
+    __repr__ = __str__
+
+
+def _json_dumps(data) -> str:
+    return json.dumps(data, default=str)
+
+
+def _create_json_backend() -> JsonBackend:
+    return JsonBackend("json", json.loads, _json_dumps)
+
+
+def _create_orjson_backend() -> JsonBackend:
+    import orjson
+    # datetime objects are serialized via str like in the json module instead of orjson's ISO format
+    options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+    def dumps(data) -> str:
+        try:
+            return orjson.dumps(data, default=str, option=options).decode("utf-8")
+        except orjson.JSONEncodeError:
+            # e.g., integers larger than 64 bit
+            return _json_dumps(data)
+
+    return JsonBackend("orjson", orjson.loads, dumps)
+
+
+def _create_ujson_backend() -> JsonBackend:
+    import ujson
+
+    def dumps(data) -> str:
+        try:
+            return ujson.dumps(data, default=str, escape_forward_slashes=False)
+        except (TypeError, OverflowError):
+            # older ujson versions don't support the default parameter
+            return _json_dumps(data)
+
+    return JsonBackend("ujson", ujson.loads, dumps)
+
+
+def _create_simdjson_backend() -> JsonBackend:
+    import simdjson
+    # simdjson only supports parsing
+    return JsonBackend("simdjson", simdjson.loads, _json_dumps)
+
+
+# The available backends
+_BACKEND_FACTORIES = {
+    "orjson": _create_orjson_backend,
+    "simdjson": _create_simdjson_backend,
+    "ujson": _create_ujson_backend,
+    "json": _create_json_backend
+}
+
+_active_backend: Optional[JsonBackend] = None
+
+
+def set_json_backend(name: str = None) -> JsonBackend:
+    """
+    Set the JSON library that is used to parse and serialize configs. The other libraries are faster than the json
+    module, but parse some documents differently (e.g., orjson rejects NaN and integers larger than 64 bit), so they are
+    only used if they are set explicitly.
+    :param name: One of "orjson", "simdjson", "ujson" or "json". If None, the json module is used.
+    :raises ImportError: Raised when the library of the requested backend is not installed.
+    :return: The selected backend.
+    """
+    global _active_backend
+    if name is None:
+        _active_backend = None
+        return get_json_backend()
+
+    if name not in _BACKEND_FACTORIES:
+        raise ValueError(f'Unknown JSON backend "{name}". Available backends: {list(_BACKEND_FACTORIES)}')
+    _active_backend = _BACKEND_FACTORIES[name]()
+    return _active_backend
+
+
+def get_json_backend() -> JsonBackend:
+    """
+    Returns the JSON backend that is used to parse and serialize configs. If no backend was set with
+    set_json_backend, this is the json module.
+    :return: The active backend.
+    """
+    global _active_backend
+    if _active_backend is None:
+        _active_backend = _create_json_backend()
+    return _active_backend
@@ -0,0 +1,239 @@
+import mmap
+import os
+import struct
+from typing import List, Union, Tuple, Iterator
+
+import msgpack
+
+from .config_node import ConfigNode
+from .msgpack_extensions import encode_typed, decode_typed
+
+# Binary config format:
+#     header:     magic (4 bytes), version (uint16), padding (uint16), number of entries (uint32),
+#                 offset of the key heap (uint64), offset of the value heap (uint64)
+#     entries:    one entry per field, sorted by the UTF-8 encoded full path of the field:
+#                 key offset (uint32), key length (uint32), value offset (uint64), value length (uint32),
+#                 kind (uint8), padding (3 bytes)
+#     key heap:   the UTF-8 encoded full paths of the fields (e.g., "server.port")
+#     value heap: the msgpack encoded values of the fields
+# All numbers are little-endian and all offsets in the entries are relative to the start of their heap.
+MAGIC = b"PJCM"
+VERSION = 1
+HEADER = struct.Struct("<4sHxxIQQ")
+ENTRY = struct.Struct("<IIQIB3x")
+
+# kinds of entries
+VALUE_ENTRY = 0
+EMPTY_NODE_ENTRY = 1
+
+
+def write_mapped_config(config: ConfigNode, file_path: str):
+    """
+    Write the config in a binary format that can be opened with MappedConfig. The file is replaced atomically, so that
+    processes that open it concurrently either see the old or the new config.
+    :param config: The config that is written.
+    :param file_path: The path of the written file.
+    """
+    entries = sorted(_flatten(config.to_dict(), ""))
+    key_heap = bytearray()
+    value_heap = bytearray()
+    entry_table = bytearray()
+    for key, kind, value in entries:
+        packed_value = b"" if kind == EMPTY_NODE_ENTRY else msgpack.packb(value, default=encode_typed,
+                                                                          use_bin_type=True)
+        entry_table += ENTRY.pack(len(key_heap), len(key), len(value_heap), len(packed_value), kind)
+        key_heap += key
+        value_heap += packed_value
+
+    key_heap_offset = HEADER.size + len(entry_table)
+    value_heap_offset = key_heap_offset + len(key_heap)
+    temporary_path = f"{file_path}.{os.getpid()}.tmp"
+    with open(temporary_path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, len(entries), key_heap_offset, value_heap_offset))
+        file.write(entry_table)
+        file.write(key_heap)
+        file.write(value_heap)
+    os.replace(temporary_path, file_path)
+
+
+def _flatten(config_dict: dict, prefix: str) -> Iterator[Tuple[bytes, int, object]]:
+    for key, value in config_dict.items():
+        path = prefix + key
+        if not isinstance(value, dict):
+            yield path.encode("utf-8"), VALUE_ENTRY, value
+        elif value:
+            yield from _flatten(value, path + ".")
+        else:
+            yield path.encode("utf-8"), EMPTY_NODE_ENTRY, None
+
+
+class _MappedFile(object):
+    def __init__(self, file_path: str):
+        with open(file_path, "rb") as file:
+            self.mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.buffer = memoryview(self.mmap)
+        if len(self.buffer) < HEADER.size or HEADER.unpack_from(self.buffer, 0)[:2] != (MAGIC, VERSION):
+            self.close()
+            raise ValueError(f"{file_path} is not a mapped config file of version {VERSION}.")
+        _, _, self.entry_count, self.key_heap_offset, self.value_heap_offset = HEADER.unpack_from(self.buffer, 0)
+
+    def entry(self, index: int) -> Tuple[int, int, int, int, int]:
+        return ENTRY.unpack_from(self.buffer, HEADER.size + index * ENTRY.size)
+
+    def key(self, index: int) -> bytes:
+        key_offset, key_length, _, _, _ = self.entry(index)
+        start = self.key_heap_offset + key_offset
+        return self.buffer[start:start + key_length].tobytes()
+
+    def kind(self, index: int) -> int:
+        return self.entry(index)[4]
+
+    def value(self, index: int):
+        _, _, value_offset, value_length, _ = self.entry(index)
+        start = self.value_heap_offset + value_offset
+        return msgpack.unpackb(self.buffer[start:start + value_length], raw=False, ext_hook=decode_typed,
+                               strict_map_key=False)
+
+    def lower_bound(self, key: bytes) -> int:
+        """
+        Binary search for the index of the first entry whose key is not smaller than the given key.
+        """
+        low, high = 0, self.entry_count
+        while low < high:
+            middle = (low + high) // 2
+            if self.key(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def close(self):
+        self.buffer.release()
+        self.mmap.close()
+
+
+class MappedConfig(object):
+    def __init__(self, file_path: str, strict_access: bool = True):
+        """
+        Open a config that was written with write_mapped_config. The file is memory-mapped and values are only read
+        from the mapped file when they are accessed, so that processes that open the same file share its memory.
+        Nested objects are returned as views on the same file.
+        :param file_path: The path of the file.
+        :param strict_access: If True, an error will be thrown if a non-existing field is accessed. If False, None will
+                              be returned instead.
+        """
+        self.__file = _MappedFile(file_path)
+        self.__prefix = ""
+        self.__strict_access = strict_access
+
+    @classmethod
+    def __view(cls, file: _MappedFile, prefix: str, strict_access: bool) -> 'MappedConfig':
+        view = cls.__new__(cls)
+        view.__file = file
+        view.__prefix = prefix
+        view.__strict_access = strict_access
+        return view
+
+    """
+    Methods to access the config contents.
+    """
+    def get(self, path: Union[str, List[str]]):
+        """
+        Retrieve a value in the config. If the path references a nested object, a view on this object is returned.
+        :raises AttributeError: Raised when a non-existing field is accessed and strict access is defined.
+        :param path: The key of the field. Can be either a string with '.' as delimiter of the nesting levels or a list
+                     of keys with each element being one nesting level.
+        :return: The value of the referenced field.
+        """
+        full_path = self.__prefix + (path if isinstance(path, str) else ".".join(path))
+        key = full_path.encode("utf-8")
+        index = self.__file.lower_bound(key)
+        if index < self.__file.entry_count and self.__file.key(index) == key:
+            if self.__file.kind(index) == VALUE_ENTRY:
+                return self.__file.value(index)
+            return self.__view(self.__file, full_path + ".", self.__strict_access)
+        # keys of siblings (e.g., "server-backup") can sort between the key and the fields of a nested object
+        index = self.__file.lower_bound(key + b".")
+        if index < self.__file.entry_count and self.__file.key(index).startswith(key + b"."):
+            return self.__view(self.__file, full_path + ".", self.__strict_access)
+
+        if self.__strict_access:
+            raise AttributeError(f'No value exists for key "{full_path}"')
+        return None
+
+    """
+    Iteration functions
+    """
+    def keys(self):
+        for index in self.__entry_range():
+            if self.__file.kind(index) == VALUE_ENTRY:
+                yield self.__file.key(index).decode("utf-8")
+
+    def values(self):
+        for key, value in self.items():
+            yield value
+
+    def items(self):
+        for index in self.__entry_range():
+            if self.__file.kind(index) == VALUE_ENTRY:
+                yield self.__file.key(index).decode("utf-8"), self.__file.value(index)
+
+    """
+    Serialization functions
+    """
+    def to_dict(self) -> dict:
+        config_dict = {}
+        for index in self.__entry_range():
+            keys = self.__file.key(index).decode("utf-8")[len(self.__prefix):].split(".")
+            node_dict = config_dict
+            for key in keys[:-1]:
+                node_dict = node_dict.setdefault(key, {})
+            node_dict[keys[-1]] = self.__file.value(index) if self.__file.kind(index) == VALUE_ENTRY else {}
+        return config_dict
+
+    def close(self):
+        """
+        Close the mapped file. Views on nested objects of this config can't be used afterwards.
+        """
+        self.__file.close()
+
+    """
+    Built-in python functions
+    """
+    def __iter__(self):
+        yield from self.keys()
+
+    def __getattr__(self, item: str):
+        # private attributes are only missing while the object is created
+        if item.startswith("_MappedConfig__"):
+            raise AttributeError(item)
+        return self.get(item)
+
+    def __contains__(self, item: Union[str, List[str]]) -> bool:
+        try:
+            return self.get(item) is not None
+        except AttributeError:
+            return False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __str__(self):
+        return f"MappedConfig(path={self.__prefix[:-1]!r}, values={self.to_dict()})"
+
+    __repr__ = __str__
+
+    """
+    Private functions used in this class (e.g., for utility).
+    """
+    def __entry_range(self) -> range:
+        if not self.__prefix:
+            return range(self.__file.entry_count)
+        prefix = self.__prefix.encode("utf-8")
+        start = self.__file.lower_bound(prefix)
+        # "/" is the character following "." and therefore the upper bound of all keys starting with the prefix
+        end = self.__file.lower_bound(prefix[:-1] + b"/")
+        return range(start, end)
@@ -0,0 +1,61 @@
+from datetime import timedelta, datetime, date, time, timezone
+
+# msgpack extension type codes of the values that are serialized with their type
+TIMEDELTA_TYPE = 1
+DATETIME_TYPE = 2
+DATE_TYPE = 3
+TIME_TYPE = 4
+
+
+def encode_typed(value):
+    """
+    Default hook for msgpack that serializes timedelta, datetime, date and time objects as msgpack extension types,
+    so that they can be restored when deserializing. Other non-serializable values are serialized with their string
+    representation.
+    :param value: The value that can't be serialized by msgpack itself.
+    :return: The msgpack extension type or string representation of the value.
+    """
+    import msgpack
+    if isinstance(value, timedelta):
+        return msgpack.ExtType(TIMEDELTA_TYPE, msgpack.packb([value.days, value.seconds, value.microseconds]))
+    # datetime is a subclass of date, so it has to be tested first
+    elif isinstance(value, datetime):
+        return msgpack.ExtType(DATETIME_TYPE, msgpack.packb([value.year, value.month, value.day, *_pack_time(value)]))
+    elif isinstance(value, date):
+        return msgpack.ExtType(DATE_TYPE, msgpack.packb([value.year, value.month, value.day]))
+    elif isinstance(value, time):
+        return msgpack.ExtType(TIME_TYPE, msgpack.packb(_pack_time(value)))
+    return str(value)
+
+
+def decode_typed(code: int, data: bytes):
+    """
+    Extension type hook for msgpack that restores the values serialized by encode_typed.
+    :param code: The extension type code.
+    :param data: The serialized value.
+    :return: The deserialized value or the msgpack ExtType object for unknown codes.
+    """
+    import msgpack
+    if code == TIMEDELTA_TYPE:
+        days, seconds, microseconds = msgpack.unpackb(data)
+        return timedelta(days=days, seconds=seconds, microseconds=microseconds)
+    elif code == DATETIME_TYPE:
+        year, month, day, *time_values = msgpack.unpackb(data)
+        return datetime(year, month, day, *_unpack_time(time_values))
+    elif code == DATE_TYPE:
+        return date(*msgpack.unpackb(data))
+    elif code == TIME_TYPE:
+        return time(*_unpack_time(msgpack.unpackb(data)))
+    return msgpack.ExtType(code, data)
+
+
+def _pack_time(value) -> list:
+    utc_offset = value.utcoffset()
+    return [value.hour, value.minute, value.second, value.microsecond,
+            None if utc_offset is None else utc_offset.total_seconds()]
+
+
+def _unpack_time(time_values: list) -> list:
+    *time_values, utc_offset = time_values
+    tzinfo = None if utc_offset is None else timezone(timedelta(seconds=utc_offset))
+    return [*time_values, tzinfo]
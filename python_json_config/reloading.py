@@ -0,0 +1,212 @@
+import os
+import threading
+import time
+from typing import Callable, Union, List, Tuple, TYPE_CHECKING
+
+from .config_node import Config
+
+if TYPE_CHECKING:
+    from .config_builder import ConfigBuilder
+
+FileSignature = Tuple[int, int, int]
+
+
+class ReloadingConfig(object):
+    def __init__(self,
+                 builder: 'ConfigBuilder',
+                 config_file: str,
+                 debounce: float = 0.1,
+                 poll_interval: float = 1.0,
+                 use_inotify: bool = True,
+                 on_reload: Callable[[Config], None] = None,
+                 on_error: Callable[[Exception], None] = None):
+        """
+        Builds a config from a file and rebuilds it in a background thread whenever the file changes. Each rebuild runs
+        the whole pipeline of the builder (parsing, schema validation, environment variables, validations and
+        transformations) on a new Config object, which then replaces the current config with a single assignment. So
+        readers never see a partially built config and don't need a lock. If a rebuild fails, the current config is
+        kept.
+        The initial config is built immediately and errors are raised. The watcher is started with start() (or by using
+        this object as context manager).
+        :param builder: The builder with the settings of the config.
+        :param config_file: The path of the config file.
+        :param debounce: Seconds without changes of the file after which the config is rebuilt, so that a burst of
+                         changes (e.g., an editor writing the file in several steps) results in a single rebuild.
+        :param poll_interval: Seconds between two checks of the file if inotify is not available.
+        :param use_inotify: If True and the inotify_simple package is installed (Linux only), the file is watched with
+                            inotify instead of polling its modification time.
+        :param on_reload: Function that is called with the new config after it replaced the current one.
+        :param on_error: Function that is called with the exception if a rebuild failed.
+        """
+        self.__builder = builder
+        self.__config_file = os.path.abspath(config_file)
+        self.__debounce = debounce
+        self.__poll_interval = poll_interval
+        self.__use_inotify = use_inotify
+        self.__on_reload = on_reload
+        self.__on_error = on_error
+
+        # serializes the rebuilds (the read path never takes this lock)
+        self.__reload_lock = threading.Lock()
+        self.__stop_event = threading.Event()
+        self.__thread: threading.Thread = None
+
+        self.__signature = self.__file_signature()
+        self.__config: Config = builder.parse_config(self.__config_file)
+        self.version = 0
+        self.last_error: Exception = None
+
+    """
+    Methods to access the current config.
+    """
+    @property
+    def config(self) -> Config:
+        """
+        The current config. Keep a reference to it to read several values from the same version of the config.
+        """
+        return self.__config
+
+    def get(self, path: Union[str, List[str]]):
+        """
+        Retrieve a value in the current config. See ConfigNode.get for details.
+        """
+        return self.__config.get(path)
+
+    def reload(self) -> bool:
+        """
+        Rebuild the config from the file and replace the current config if the rebuild succeeds.
+        :return: True if the config was replaced and False if the rebuild failed (the error is stored in last_error).
+        """
+        with self.__reload_lock:
+            self.__signature = self.__file_signature()
+            try:
+                config = self.__builder.parse_config(self.__config_file)
+            except Exception as exception:
+                self.last_error = exception
+                if self.__on_error is not None:
+                    self.__on_error(exception)
+                return False
+            # a single reference assignment, which is atomic for concurrent readers
+            self.__config = config
+            self.version += 1
+            self.last_error = None
+        if self.__on_reload is not None:
+            self.__on_reload(config)
+        return True
+
+    """
+    Methods to control the watcher.
+    """
+    def start(self) -> 'ReloadingConfig':
+        """
+        Start watching the config file in a background thread.
+        :return: This object for chaining of calls.
+        """
+        if self.__thread is not None and self.__thread.is_alive():
+            return self
+        self.__stop_event.clear()
+        inotify = self.__create_inotify() if self.__use_inotify else None
+        target = self.__watch_inotify if inotify is not None else self.__watch_polling
+        self.__thread = threading.Thread(target=target,
+                                         args=(inotify,) if inotify is not None else (),
+                                         name=f"ReloadingConfig({self.__config_file})",
+                                         daemon=True)
+        self.__thread.start()
+        return self
+
+    def stop(self, timeout: float = None):
+        """
+        Stop watching the config file and wait for the background thread to finish.
+        """
+        self.__stop_event.set()
+        if self.__thread is not None:
+            self.__thread.join(timeout)
+            self.__thread = None
+
+    @property
+    def watching(self) -> bool:
+        return self.__thread is not None and self.__thread.is_alive()
+
+    """
+    Built-in python functions
+    """
+    def __getattr__(self, item: str):
+        # private attributes are only missing while the object is created
+        if item.startswith("_ReloadingConfig__"):
+            raise AttributeError(item)
+        return self.__config.get(item)
+
+    def __contains__(self, item: Union[str, List[str]]) -> bool:
+        return item in self.__config
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def __str__(self):
+        return f"ReloadingConfig(file={self.__config_file!r}, version={self.version}, config={self.__config})"
+
+    __repr__ = __str__
+
+    """
+    Private functions used in this class (e.g., for utility).
+    """
+    def __file_signature(self) -> FileSignature:
+        """
+        Returns the modification time, size and inode of the config file, which change when the file is modified or
+        replaced. None if the file doesn't exist.
+        """
+        try:
+            stat = os.stat(self.__config_file)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+    def __create_inotify(self):
+        try:
+            from inotify_simple import INotify, flags
+        except ImportError:
+            return None
+        try:
+            inotify = INotify()
+            # the directory is watched, so that the file is still watched after it was replaced (e.g., by a rename)
+            inotify.add_watch(os.path.dirname(self.__config_file),
+                              flags.CLOSE_WRITE | flags.MOVED_TO | flags.CREATE | flags.MODIFY)
+        except OSError:
+            return None
+        return inotify
+
+    def __watch_inotify(self, inotify):
+        file_name = os.path.basename(self.__config_file)
+        try:
+            while not self.__stop_event.is_set():
+                events = inotify.read(timeout=int(self.__poll_interval * 1000))
+                if not any(event.name == file_name for event in events):
+                    continue
+                # wait until the file didn't change within the debounce period (events of other files in the same
+                # directory don't extend the period)
+                deadline = time.monotonic() + self.__debounce
+                while time.monotonic() < deadline:
+                    events = inotify.read(timeout=max(1, int((deadline - time.monotonic()) * 1000)))
+                    if any(event.name == file_name for event in events):
+                        deadline = time.monotonic() + self.__debounce
+                if not self.__stop_event.is_set():
+                    self.reload()
+        finally:
+            inotify.close()
+
+    def __watch_polling(self):
+        while not self.__stop_event.wait(self.__poll_interval):
+            signature = self.__file_signature()
+            if signature is None or signature == self.__signature:
+                continue
+            # wait until the file didn't change within the debounce period
+            while not self.__stop_event.wait(self.__debounce):
+                new_signature = self.__file_signature()
+                if new_signature == signature:
+                    break
+                signature = new_signature
+            if not self.__stop_event.is_set():
+                self.reload()
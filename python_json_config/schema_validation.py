@@ -0,0 +1,125 @@
+import hashlib
+import json
+from collections import OrderedDict
+from threading import Lock
+
+# maximum number of compiled validators that are cached
+CACHE_SIZE = 32
+
+_validator_cache: 'OrderedDict[str, SchemaValidator]' = OrderedDict()
+_validator_cache_lock = Lock()
+
+# the keywords that fastjsonschema validates like jsonschema for the drafts it supports (keyed by the name of the
+# jsonschema validator of the draft)
+_DRAFT4_KEYWORDS = frozenset([
+    "$ref", "additionalProperties", "allOf", "anyOf", "dependencies", "enum", "format", "items", "maxItems",
+    "maxLength", "maxProperties", "maximum", "minItems", "minLength", "minProperties", "minimum", "multipleOf", "not",
+    "oneOf", "pattern", "patternProperties", "properties", "required", "type", "uniqueItems"
+])
+_DRAFT6_KEYWORDS = _DRAFT4_KEYWORDS | {"const", "contains", "exclusiveMaximum", "exclusiveMinimum", "propertyNames"}
+_FASTJSONSCHEMA_KEYWORDS = {
+    "Draft4Validator": _DRAFT4_KEYWORDS,
+    "Draft6Validator": _DRAFT6_KEYWORDS,
+    "Draft7Validator": _DRAFT6_KEYWORDS | {"if", "contentEncoding", "contentMediaType"}
+}
+
+
+class SchemaValidator(object):
+    def __init__(self, schema: dict, use_fastjsonschema: bool = True):
+        """
+        Compiles a JSON schema into a reusable validator. The schema itself is checked only once.
+        :param schema: The JSON schema.
+        :param use_fastjsonschema: If True and the fastjsonschema package is installed, configs are validated with
+                                   validation code that is generated from the schema. The jsonschema package is then
+                                   only used to create the error of invalid configs. Schemas that don't declare draft
+                                   4, 6 or 7 with $schema or that use keywords that fastjsonschema doesn't support are
+                                   always validated with jsonschema, since fastjsonschema would validate them
+                                   differently (e.g., ignore the keywords).
+        """
+        # imported when the first schema is compiled, since importing jsonschema is slow
+        import jsonschema
+        validator_class = jsonschema.validators.validator_for(schema)
+        validator_class.check_schema(schema)
+        self.validator = validator_class(schema)
+        self.__fast_validate = None
+        if use_fastjsonschema and _supported_by_fastjsonschema(schema, validator_class):
+            self.__fast_validate = _compile_fastjsonschema(schema)
+
+    def validate(self, instance):
+        """
+        Validate the given config.
+        :raises jsonschema.ValidationError: Raised when the config doesn't match the schema.
+        :param instance: The config as dictionary.
+        """
+        if self.__fast_validate is not None:
+            from fastjsonschema import JsonSchemaValueException
+            try:
+                self.__fast_validate(instance)
+                return
+            except JsonSchemaValueException:
+                # create the same error as the jsonschema package
+                pass
+
+        from jsonschema.exceptions import best_match
+        error = best_match(self.validator.iter_errors(instance))
+        if error is not None:
+            raise error
+
+
+def _supported_by_fastjsonschema(schema: dict, validator_class: type) -> bool:
+    """
+    Tests if fastjsonschema validates configs like the jsonschema validator of the schema. fastjsonschema chooses the
+    draft by the $schema keyword like jsonschema, but defaults to another draft and ignores keywords it doesn't know.
+    """
+    supported_keywords = _FASTJSONSCHEMA_KEYWORDS.get(validator_class.__name__)
+    if supported_keywords is None:
+        return False
+    # all keys of the schema are collected (including property names), which at worst disables fastjsonschema
+    keywords = set()
+    _collect_keys(schema, keywords)
+    return keywords & set(validator_class.VALIDATORS) <= supported_keywords
+
+
+def _collect_keys(value, keys: set):
+    if isinstance(value, dict):
+        keys.update(value)
+        for item in value.values():
+            _collect_keys(item, keys)
+    elif isinstance(value, list):
+        for item in value:
+            _collect_keys(item, keys)
+
+
+def _compile_fastjsonschema(schema: dict):
+    try:
+        import fastjsonschema
+    except ImportError:
+        return None
+    try:
+        # default values of the schema must not be inserted into the config
+        return fastjsonschema.compile(schema, use_default=False)
+    except (fastjsonschema.JsonSchemaDefinitionException, TypeError):
+        # the schema uses features that are not supported by fastjsonschema or its version is too old
+        return None
+
+
+def get_schema_validator(schema: dict, use_fastjsonschema: bool = True) -> SchemaValidator:
+    """
+    Returns the compiled validator of the schema. Validators are cached by the content of their schema, so a schema is
+    only compiled again if it was not used recently.
+    :param schema: The JSON schema.
+    :param use_fastjsonschema: See SchemaValidator.
+    :return: The validator of the schema.
+    """
+    key = hashlib.sha256(json.dumps([schema, use_fastjsonschema], sort_keys=True).encode("utf-8")).hexdigest()
+    with _validator_cache_lock:
+        if key in _validator_cache:
+            _validator_cache.move_to_end(key)
+            return _validator_cache[key]
+
+    validator = SchemaValidator(schema, use_fastjsonschema=use_fastjsonschema)
+    with _validator_cache_lock:
+        _validator_cache[key] = validator
+        if len(_validator_cache) > CACHE_SIZE:
+            _validator_cache.popitem(last=False)
+    return validator
@@ -0,0 +1,249 @@
+import re
+from functools import partial
+from typing import List, Union, Tuple, Iterator
+
+from .config_node import ConfigNode
+from .utils import normalize_path, DeferredDict, FieldSettings
+
+# keywords of an object schema that can be validated without the values of the object's fields
+_SHALLOW_SCHEMA_KEYWORDS = {
+    "$schema", "$id", "id", "$comment", "title", "description", "default", "examples", "definitions", "$defs", "type",
+    "properties", "patternProperties", "additionalProperties", "required", "minProperties", "maxProperties",
+    "propertyNames"
+}
+
+FieldPath = Tuple[str, ...]
+
+
+def _import_ijson():
+    try:
+        import ijson
+    except ImportError as exception:
+        raise ImportError("Streaming configs requires the ijson package (pip install ijson).") from exception
+    return ijson
+
+
+class StreamingConfigParser(object):
+    def __init__(self,
+                 strict_access: bool = True,
+                 required_fields: List[Union[str, List[str]]] = None,
+                 optional_fields: List[Union[str, List[str]]] = None,
+                 validator=None,
+                 skip_fields: List[str] = None,
+                 lazy_fields: List[str] = None,
+                 lazy: bool = False):
+        """
+        Parses JSON config files incrementally from a stream of parsing events, without loading the whole file into
+        memory. The ConfigNodes of the fields of the root object are created as soon as the fields are parsed.
+        :param strict_access: The access mode of the created ConfigNodes (see ConfigNode).
+        :param required_fields: The required fields of the config (see ConfigNode).
+        :param optional_fields: The optional fields of the config (see ConfigNode).
+        :param validator: A jsonschema validator for the whole config. The fields of the root object are validated as
+                          soon as they are parsed. If the schema of the root object can't be validated field by field
+                          (e.g., because it uses "allOf"), the whole config is validated after it was parsed, which
+                          loads the lazy fields of the root object once for the validation.
+        :param skip_fields: Fields of the config that are not loaded. Fields of the root object that contain skipped
+                            fields are not validated. Skipped fields of the root object count as existing fields when
+                            the required fields of the root object are validated.
+        :param lazy_fields: Fields of the config that are only loaded when they are accessed for the first time. The
+                            file is parsed again to load them. Lazy fields of the root object are validated when they
+                            are loaded, other fields of the root object that contain lazy fields are not validated.
+        :param lazy: If True, the created ConfigNodes are lazy (see ConfigNode).
+        """
+        self.__strict_access = strict_access
+        self.__required_settings = FieldSettings.compile(required_fields)
+        self.__optional_settings = FieldSettings.compile(optional_fields)
+        self.__validator = validator
+        self.__skip_fields = {tuple(normalize_path(field)) for field in skip_fields or []}
+        self.__lazy_fields = {tuple(normalize_path(field)) for field in lazy_fields or []}
+        self.__lazy = lazy
+
+        # number of skipped and lazy fields that were encountered while parsing
+        self.__omitted_field_count = 0
+        # keys of the skipped fields of the root object that were encountered while parsing
+        self.__skipped_root_keys = []
+        self.__lazy_field_count = 0
+
+        schema = validator.schema if validator is not None else {}
+        self.__validate_fields = validator is not None and set(schema) <= _SHALLOW_SCHEMA_KEYWORDS
+
+    def parse(self, file_path: str) -> dict:
+        """
+        Parse the config file.
+        :raises jsonschema.ValidationError: Raised when the config doesn't match the JSON schema of the validator.
+        :param file_path: The path of the config file.
+        :return: The dictionary of the root object of the config. Its nested objects are already ConfigNodes and its
+                 lazy fields are DeferredDicts.
+        """
+        ijson = _import_ijson()
+        self.__skipped_root_keys = []
+        with open(file_path, "rb") as file:
+            events = iter(ijson.parse(file, use_float=True))
+            _, event, _ = next(events)
+            if event != "start_map":
+                raise ValueError(f"The root of the config file {file_path} is not a JSON object.")
+            config_dict = self.__parse_map(events, (), False, file_path)
+
+        if self.__validator is not None:
+            self.__validate_root(config_dict)
+        return config_dict
+
+    def __parse_map(self, events: Iterator, path: FieldPath, in_array: bool, file_path: str) -> dict:
+        """
+        Parses the events of an object until its end.
+        """
+        node_dict = {}
+        for _, event, key in events:
+            if event == "end_map":
+                return node_dict
+
+            field_path = path + (key,)
+            if not in_array and field_path in self.__skip_fields:
+                self.__skip_value(events)
+                self.__omitted_field_count += 1
+                if not path:
+                    self.__skipped_root_keys.append(key)
+            elif not in_array and field_path in self.__lazy_fields:
+                self.__skip_value(events)
+                self.__omitted_field_count += 1
+                self.__lazy_field_count += 1
+                node_dict[key] = DeferredDict(partial(self.__load_field, file_path, field_path))
+            elif path:
+                _, event, value = next(events)
+                node_dict[key] = self.__parse_value(events, event, value, field_path, in_array, file_path)
+            else:
+                node_dict[key] = self.__parse_root_field(events, key, file_path)
+
+    def __parse_root_field(self, events: Iterator, key: str, file_path: str):
+        """
+        Parses a field of the root object, validates it and creates its ConfigNode, so that only the source dictionary
+        of a single field of the root object is in memory at once.
+        """
+        omitted_field_count = self.__omitted_field_count
+        lazy_field_count = self.__lazy_field_count
+        _, event, value = next(events)
+        value = self.__parse_value(events, event, value, (key,), False, file_path)
+
+        # fields that contain skipped or lazy fields are not validated
+        if self.__omitted_field_count == omitted_field_count:
+            self.__validate_field(key, value)
+
+        if isinstance(value, dict):
+            value = ConfigNode(value,
+                               strict_access=self.__strict_access,
+                               required_fields=self.__required_settings.child(key),
+                               optional_fields=self.__optional_settings.child(key),
+                               lazy=self.__lazy or self.__lazy_field_count > lazy_field_count)
+        return value
+
+    def __parse_value(self, events: Iterator, event: str, value, path: FieldPath, in_array: bool, file_path: str):
+        if event == "start_map":
+            return self.__parse_map(events, path, in_array, file_path)
+        elif event == "start_array":
+            values = []
+            for _, event, value in events:
+                if event == "end_array":
+                    return values
+                values.append(self.__parse_value(events, event, value, path, True, file_path))
+        return value
+
+    @staticmethod
+    def __skip_value(events: Iterator):
+        depth = 0
+        for _, event, _ in events:
+            if event in ("start_map", "start_array"):
+                depth += 1
+            elif event in ("end_map", "end_array"):
+                depth -= 1
+            if depth == 0:
+                return
+
+    def __load_field(self, file_path: str, path: FieldPath):
+        ijson = _import_ijson()
+        with open(file_path, "rb") as file:
+            value = next(ijson.items(file, ".".join(path), use_float=True))
+        if len(path) == 1:
+            self.__validate_field(path[0], value)
+        return value
+
+    """
+    Schema validation
+    """
+    def __validate_field(self, key: str, value):
+        if not self.__validate_fields:
+            return
+        from jsonschema.exceptions import best_match
+        for field_schema in self.__field_schemas(key):
+            error = best_match(self.__validator.descend(value, field_schema, path=key))
+            if error is not None:
+                raise error
+
+    def __field_schemas(self, key: str) -> List[dict]:
+        schema = self.__validator.schema
+        field_schemas = []
+        if key in schema.get("properties", {}):
+            field_schemas.append(schema["properties"][key])
+        for pattern, pattern_schema in schema.get("patternProperties", {}).items():
+            if re.search(pattern, key):
+                field_schemas.append(pattern_schema)
+        if not field_schemas and isinstance(schema.get("additionalProperties"), dict):
+            field_schemas.append(schema["additionalProperties"])
+        return field_schemas
+
+    def __validate_root(self, config_dict: dict):
+        """
+        Validates the root object. If its fields were already validated, only the keywords that concern the root object
+        itself (e.g., required fields) are validated and skipped fields count as existing fields. Otherwise, the whole
+        config is validated without the skipped fields, which are removed from the required fields of the root object.
+        """
+        from jsonschema.exceptions import best_match
+        if not self.__validate_fields:
+            instance = {key: self.__to_dict(value) for key, value in config_dict.items()}
+            schema = _without_required_keys(self.__validator.schema, set(self.__skipped_root_keys))
+            validator = self.__validator if schema is self.__validator.schema else type(self.__validator)(schema)
+            error = best_match(validator.iter_errors(instance))
+        else:
+            schema = dict(self.__validator.schema)
+            for keyword in ("properties", "patternProperties"):
+                if keyword in schema:
+                    schema[keyword] = {key: {} for key in schema[keyword]}
+            if isinstance(schema.get("additionalProperties"), dict):
+                schema["additionalProperties"] = {}
+            instance = {key: None for key in [*config_dict, *self.__skipped_root_keys]}
+            error = best_match(type(self.__validator)(schema).iter_errors(instance))
+        if error is not None:
+            raise error
+
+    @staticmethod
+    def __to_dict(value):
+        if isinstance(value, ConfigNode):
+            return value.to_dict()
+        elif isinstance(value, DeferredDict):
+            return value.load()
+        return value
+
+
+def _without_required_keys(schema, keys: set):
+    """
+    Removes keys from the required fields of a schema and of the subschemas that apply to the same object (e.g., in
+    "allOf"). Returns the schema itself if it doesn't change.
+    """
+    if not keys or not isinstance(schema, dict):
+        return schema
+    new_schema = dict(schema)
+    if isinstance(schema.get("required"), list):
+        new_schema["required"] = [key for key in schema["required"] if key not in keys]
+    for keyword in ("allOf", "anyOf", "oneOf"):
+        if isinstance(schema.get(keyword), list):
+            new_schema[keyword] = [_without_required_keys(subschema, keys) for subschema in schema[keyword]]
+    for keyword in ("then", "else"):
+        if keyword in schema:
+            new_schema[keyword] = _without_required_keys(schema[keyword], keys)
+    return new_schema
+
+
+def contains_deferred_fields(config_dict: dict) -> bool:
+    """
+    Tests if the dictionary contains fields that are loaded lazily, i.e., if its ConfigNode has to be lazy.
+    """
+    return any(isinstance(value, DeferredDict) for value in config_dict.values())
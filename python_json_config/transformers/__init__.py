@@ -1,5 +1,8 @@
-from .generic_transformers import to_timedelta
+from .generic_transformers import to_timedelta, parse_timedelta
+from .memoized_transformer import MemoizedTransformer
 
 __all__ = [
-    "to_timedelta"
+    "to_timedelta",
+    "parse_timedelta",
+    "MemoizedTransformer"
 ]
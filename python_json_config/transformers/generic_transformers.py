@@ -1,7 +1,9 @@
 from datetime import timedelta
 
+from .memoized_transformer import MemoizedTransformer
 
-def to_timedelta(value: str):
+
+def parse_timedelta(value: str) -> timedelta:
     """
     Converts the given value into a timedelta object.
     The timedelta needs to be specified as a colon separated string, e.g.: "0:0:23:00:00"
@@ -12,22 +14,28 @@ def to_timedelta(value: str):
         M = number of minutes
         S = number of seconds
 
+    :raises ValueError: Raised when the value is not a valid timedelta specification.
     :param value: The timedelta as string.
     :return: A timedelta value representing the timespan that is specified.
     """
     split_values = value.split(":")
+    if len(split_values) > 5:
+        raise ValueError("Timedelta contains more than 5 elements.")
 
     try:
-        int_values = [int(element) for element in split_values]
+        int_values = list(map(int, split_values))
     except ValueError:
-        return None
-
-    if len(int_values) <= 5:
-        padded_values = [0] * (5 - len(int_values)) + int_values
-        return timedelta(
-            weeks=padded_values[0],
-            days=padded_values[1],
-            hours=padded_values[2],
-            minutes=padded_values[3],
-            seconds=padded_values[4],
-        )
+        raise ValueError("Timedelta contains non-integer elements.") from None
+
+    padded_values = [0] * (5 - len(int_values)) + int_values
+    return timedelta(
+        weeks=padded_values[0],
+        days=padded_values[1],
+        hours=padded_values[2],
+        minutes=padded_values[3],
+        seconds=padded_values[4],
+    )
+
+
+# returns None for invalid values, validated by validators.is_timedelta with the same cached parse results
+to_timedelta = MemoizedTransformer(parse_timedelta)
@@ -0,0 +1,69 @@
+from collections.abc import Hashable
+from functools import lru_cache, update_wrapper
+from typing import Callable, Iterable, List, Tuple, Union
+
+# the parsed value and the error message (None if the value is valid)
+_ParseResult = Tuple[object, str]
+
+
+class MemoizedTransformer(object):
+    def __init__(self, parse_function: Callable, maxsize: int = 4096):
+        """
+        A transformer that memoizes its results by the input value in a bounded LRU cache, so that duplicated values
+        (e.g., the same duration string in thousands of fields) are parsed only once. The validator of the transformer
+        (see validate) shares the cached results, so a value that is validated and then transformed is parsed once.
+        :param parse_function: Function that converts a value and raises a ValueError with the error message if the
+                               value is invalid. Its results are shared between fields, so they should be immutable.
+        :param maxsize: The maximum number of cached results.
+        """
+        update_wrapper(self, parse_function)
+        self.__parse_function = parse_function
+        self.__cached_parse = lru_cache(maxsize=maxsize)(self.__parse)
+
+    def __call__(self, value):
+        """
+        Transforms the value.
+        :return: The parsed value or None if the value is invalid.
+        """
+        return self.__result(value)[0]
+
+    def validate(self, value) -> Union[bool, Tuple[bool, str]]:
+        """
+        Tests if the value can be transformed.
+        :return: True if the value is valid and otherwise False and the error message.
+        """
+        error = self.__result(value)[1]
+        return True if error is None else (False, error)
+
+    def transform_many(self, values: Iterable) -> List:
+        """
+        Transforms many values in one call. Every distinct value is parsed (or looked up) once.
+        :return: The parsed values (None for invalid values) in the order of the given values.
+        """
+        results = {}
+        transformed = []
+        for value in values:
+            if not isinstance(value, Hashable):
+                transformed.append(self(value))
+                continue
+            if value not in results:
+                results[value] = self.__result(value)[0]
+            transformed.append(results[value])
+        return transformed
+
+    def cache_info(self):
+        return self.__cached_parse.cache_info()
+
+    def cache_clear(self):
+        self.__cached_parse.cache_clear()
+
+    def __result(self, value) -> _ParseResult:
+        if isinstance(value, Hashable):
+            return self.__cached_parse(value)
+        return self.__parse(value)
+
+    def __parse(self, value) -> _ParseResult:
+        try:
+            return self.__parse_function(value), None
+        except ValueError as error:
+            return None, str(error)
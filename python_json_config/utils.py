@@ -1,5 +1,7 @@
+import os
 import re
-from typing import Union, List
+from functools import lru_cache
+from typing import Union, List, Callable, Dict, FrozenSet, Mapping, Tuple
 
 
 def normalize_path(path: Union[str, List[str]]) -> List[str]:
@@ -8,6 +10,12 @@ def normalize_path(path: Union[str, List[str]]) -> List[str]:
     return path
 
 
+# patterns used to parse the names of environment variables
+_SINGLE_UNDERSCORE_PATTERN = re.compile(r"([^_])[_]([^_])")
+_ONLY_UNDERSCORES_PATTERN = re.compile("^_+$")
+_UNDERSCORES_PATTERN = re.compile("[_]+")
+
+
 def parse_env_variable_name(variable: str) -> List[str]:
     """
     Parse the name of an environment variable into a config path. Underscores in the names of variables are escaped with
@@ -15,13 +23,18 @@ def parse_env_variable_name(variable: str) -> List[str]:
     :param variable: the name of the environment variable
     :return: the path extracted from the name of the environment variable
     """
+    return list(_parse_env_variable_name(variable))
+
+
+@lru_cache(maxsize=4096)
+def _parse_env_variable_name(variable: str) -> Tuple[str, ...]:
     # Split only on single underscores
-    split_variable = re.sub(r"([^_])[_]([^_])", r"\1 \2", variable.lower()).split(" ")
+    split_variable = _SINGLE_UNDERSCORE_PATTERN.sub(r"\1 \2", variable.lower()).split(" ")
     path = [element for element in split_variable if element]
 
     # If the path contains single elements only consisting of underscores, join the previous and next element together.
     # (e.g., ["test", "__", "value"] becomes ["test__value"])
-    underscore_indices = [i for i, item in enumerate(path) if re.search("^_+$", item)]
+    underscore_indices = [i for i, item in enumerate(path) if _ONLY_UNDERSCORES_PATTERN.search(item)]
     for index in underscore_indices:
         path[index - 1:index + 2] = ["".join(path[index - 1:index + 2])]
 
@@ -29,9 +42,109 @@ def parse_env_variable_name(variable: str) -> List[str]:
     # (e.g., ["test__value"] becomes ["test_value"])
     for index, element in enumerate(path):
         if "_" in element:
-            underscore_match = re.search("[_]+", element)
+            underscore_match = _UNDERSCORES_PATTERN.search(element)
             underscores = underscore_match.group(0)
             if len(underscores) > 1:
                 path[index] = element.replace(underscores, underscores[:-1])
 
-    return path
+    return tuple(path)
+
+
+def env_variable_values(prefixes: List[str], environment: Mapping[str, str] = None) -> Dict[Tuple[str, ...], str]:
+    """
+    Collects the values of the environment variables that start with one of the prefixes in a single pass over the
+    environment. Variables without any of the prefixes are rejected with a single test and only the values of the
+    other variables are read.
+    :param prefixes: The prefixes of the environment variables (without the trailing underscore).
+    :param environment: The environment variables. Defaults to os.environ.
+    :return: The values of the variables keyed by their config path, in the order in which the values would be set by
+             updating the config with one variable after the other.
+    """
+    environment = os.environ if environment is None else environment
+    variable_prefixes = tuple(dict.fromkeys(f"{prefix}_" for prefix in prefixes))
+
+    values = {}
+    for variable in environment:
+        # a single test rejects the variables without any of the prefixes
+        if not variable.startswith(variable_prefixes):
+            continue
+        value = environment[variable]
+        # variables matching several prefixes are set once for every prefix, in the order of the prefixes
+        for variable_prefix in variable_prefixes:
+            if not variable.startswith(variable_prefix):
+                continue
+            path = _parse_env_variable_name(variable[len(variable_prefix):])
+            if not path:
+                continue
+            values.pop(path, None)
+            values[path] = value
+    return values
+
+
+class DeferredDict(object):
+    def __init__(self, loader: Callable[[], dict]):
+        """
+        Placeholder for a nested object of a lazy ConfigNode that is only loaded when it is accessed for the first time.
+        :param loader: Function that loads the dictionary of the nested object.
+        """
+        self.load = loader
+
+    def __str__(self):
+        return "DeferredDict(...)"
+
+    __repr__ = __str__
+
+
+class FieldSettings(object):
+    __slots__ = ("fields", "subfields")
+
+    def __init__(self, fields: FrozenSet[str] = frozenset(), subfields: Dict[str, 'FieldSettings'] = None):
+        """
+        Prefix trie of field settings (i.e., required or optional fields). Each level of the trie contains the names of
+        the fields of a node and the settings of its children. The trie is compiled once for a config and its levels
+        are shared by reference between the nodes of the config, so that nodes neither parse nor copy the settings.
+        :param fields: The names of the fields of this level.
+        :param subfields: The settings of the children, keyed by the names of the children.
+        """
+        self.fields = fields
+        self.subfields = subfields or {}
+
+    @classmethod
+    def compile(cls, field_names: Union['FieldSettings', List[Union[str, List[str]]], None]) -> 'FieldSettings':
+        """
+        Compiles field names into a trie.
+        :param field_names: A list of either field names containing dots or already normalized paths. Already compiled
+                            settings are returned as they are.
+        :return: The root of the trie.
+        """
+        if isinstance(field_names, FieldSettings):
+            return field_names
+        if not field_names:
+            return EMPTY_FIELD_SETTINGS
+
+        root = cls(set())
+        for field_name in field_names:
+            path = normalize_path(field_name)
+            level = root
+            for key in path[:-1]:
+                level = level.subfields.setdefault(key, cls(set()))
+            level.fields.add(path[-1])
+        root.__freeze()
+        return root
+
+    def __freeze(self):
+        self.fields = frozenset(self.fields)
+        for subfield_settings in self.subfields.values():
+            subfield_settings.__freeze()
+
+    def child(self, key: str) -> 'FieldSettings':
+        """
+        Returns the settings of the child with the given key.
+        """
+        return self.subfields.get(key, EMPTY_FIELD_SETTINGS)
+
+    def __bool__(self):
+        return bool(self.fields or self.subfields)
+
+
+EMPTY_FIELD_SETTINGS = FieldSettings()
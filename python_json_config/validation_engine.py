@@ -0,0 +1,271 @@
+import inspect
+from typing import Callable, Dict, List, Set, Union, Tuple, Optional, TYPE_CHECKING
+
+from .config_node import ConfigNode
+from .field_patterns import ANY_KEY, ANY_KEYS
+from .incremental import FieldPath, is_affected
+from .utils import normalize_path
+
+if TYPE_CHECKING:
+    from concurrent.futures import ThreadPoolExecutor
+
+
+class ConfigValidationError(AssertionError):
+    def __init__(self, errors: List[str]):
+        """
+        Raised when a built config is invalid. It contains the errors of all invalid fields instead of only the first
+        one. It is an AssertionError, since the validations of the ConfigBuilder used to be asserts.
+        :param errors: The error messages of all invalid fields.
+        """
+        self.errors = errors
+        if len(errors) == 1:
+            message = errors[0]
+        else:
+            message = f"{len(errors)} fields of the config are invalid:\n" + "\n".join(errors)
+        super(ConfigValidationError, self).__init__(message)
+
+
+class _FieldValidations(object):
+    __slots__ = ("field_name", "field_type", "functions", "subfields", "any_depth", "exact")
+
+    def __init__(self, any_depth: bool = False, exact: bool = True):
+        self.field_name: str = None
+        self.field_type: type = None
+        self.functions: List[Callable] = []
+        self.subfields: Dict[str, _FieldValidations] = {}
+        # True for the key "**", which stays active for any number of keys
+        self.any_depth = any_depth
+        # True if the path to this node contains no wildcards
+        self.exact = exact
+
+
+# a validation function call (field name, value and function) or the error message of a failed type validation
+_ValidationStep = Union[Tuple[str, object, Callable], str]
+
+
+class ValidationEngine(object):
+    def __init__(self,
+                 field_types: Dict[str, type],
+                 field_functions: Dict[str, List[Callable]],
+                 max_concurrency: int = None,
+                 timeout: float = None):
+        """
+        Validates the types and values of the fields of configs. The validated fields are grouped into a tree by their
+        paths, so that the config is traversed only once and fields with a common path prefix share the walk to it.
+        All invalid fields are reported together and the validation doesn't rely on asserts, so it also runs with
+        python -O.
+        Field names can contain the wildcards "*", which matches any key, and "**", which matches any number of keys
+        (e.g., "backends.*.port" or "**.timeout"). They are matched during the same traversal, so a single validation
+        of a pattern replaces the validations of all the fields it matches.
+        Validation functions can be coroutine functions (async def), which are awaited.
+        :param field_types: The types of the fields keyed by the field names (see ConfigBuilder.validate_field_type).
+        :param field_functions: The validation functions of the fields keyed by the field names (see
+                                ConfigBuilder.validate_field_value).
+        :param max_concurrency: If not None, the validation functions run concurrently after the traversal: coroutine
+                                functions in an asyncio event loop and other functions in a thread pool. At most this
+                                number of functions run at the same time. If None, the functions run one after the
+                                other.
+        :param timeout: Seconds after which a validation function fails. Applies to all functions if they run
+                        concurrently and otherwise only to coroutine functions. Timed out functions in the thread
+                        pool can't be stopped and keep running in the background.
+        """
+        self.__max_concurrency = max_concurrency
+        self.__timeout = timeout
+        self.__root = _FieldValidations()
+        for field_name, field_type in field_types.items():
+            self.__field_validations(field_name).field_type = field_type
+        for field_name, functions in field_functions.items():
+            self.__field_validations(field_name).functions += functions
+
+    def __field_validations(self, field_name: str) -> _FieldValidations:
+        validations = self.__root
+        for key in normalize_path(field_name):
+            if key not in validations.subfields:
+                is_wildcard = key in (ANY_KEY, ANY_KEYS)
+                validations.subfields[key] = _FieldValidations(any_depth=key == ANY_KEYS,
+                                                               exact=validations.exact and not is_wildcard)
+            validations = validations.subfields[key]
+        validations.field_name = field_name
+        return validations
+
+    def validate(self, config: ConfigNode, dirty: Set[FieldPath] = None):
+        """
+        Validate the config.
+        :raises ConfigValidationError: Raised when at least one field is invalid.
+        :raises AttributeError: Raised when a validated field doesn't exist and strict access is defined for it.
+        :param config: The config.
+        :param dirty: If not None, only the fields in the subtrees with these paths are validated (see incremental
+                      builds of the ConfigBuilder).
+        """
+        errors = self.errors(config, dirty)
+        if errors:
+            raise ConfigValidationError(errors)
+
+    def errors(self, config: ConfigNode, dirty: Set[FieldPath] = None) -> List[str]:
+        """
+        Validate the config and return the error messages of all invalid fields.
+        """
+        steps = []
+        ancestors = None if dirty is None else {path[:index] for path in dirty for index in range(1, len(path))}
+        self.__validate_level(config, [self.__root], (), dirty, ancestors, steps)
+        if self.__max_concurrency is None:
+            results = [self.__run_function(step) if isinstance(step, tuple) else step for step in steps]
+        else:
+            results = _run_coroutine(self.__run_concurrently(steps))
+        return [result for result in results if result is not None]
+
+    def __validate_level(self, node: ConfigNode, states: List[_FieldValidations], path: FieldPath,
+                         dirty: Set[FieldPath], ancestors: Set[FieldPath], steps: List[_ValidationStep]):
+        """
+        Validates the children of a node. The states are the nodes of the validation tree that the path of the node
+        matches (more than one if field names contain wildcards).
+        """
+        states = _with_any_depth(states)
+        keys = {key: None for state in states for key in state.subfields if key not in (ANY_KEY, ANY_KEYS)}
+        children = {}
+        if isinstance(node, ConfigNode) and any(ANY_KEY in state.subfields or state.any_depth for state in states):
+            children = dict(node.child_items())
+            keys.update(dict.fromkeys(children))
+        for key in keys:
+            field_path = path + (key,)
+            affected = dirty is None or is_affected(field_path, dirty)
+            if not affected and field_path not in ancestors:
+                continue
+            value = children[key] if key in children else node.get([key])
+            # skip optional fields that do not exist
+            if value is None:
+                continue
+            next_states = _next_states(states, key)
+            if affected:
+                for validations in next_states:
+                    if validations.field_name is not None:
+                        self.__validate_field(validations, ".".join(field_path), value, steps)
+            if _has_subfields(next_states, isinstance(value, ConfigNode)):
+                self.__validate_level(value, next_states, field_path, dirty, ancestors, steps)
+
+    @staticmethod
+    def __validate_field(validations: _FieldValidations, field_name: str, value, steps: List[_ValidationStep]):
+        """
+        Validates the type of the field and adds the calls of its validation functions to the steps.
+        """
+        if validations.field_type is not None and not isinstance(value, validations.field_type):
+            steps.append(f'Config field "{field_name}" with value "{value}" is not of type {validations.field_type}')
+            # the validation functions expect values of the correct type
+            return
+        for validation_function in validations.functions:
+            steps.append((field_name, value, validation_function))
+
+    def __run_function(self, step: Tuple[str, object, Callable]) -> Optional[str]:
+        field_name, value, validation_function = step
+        validation_result = validation_function(value)
+        if inspect.isawaitable(validation_result):
+            # asyncio is only imported if it is used, since importing it is slow
+            import asyncio
+            try:
+                validation_result = _run_coroutine(asyncio.wait_for(validation_result, self.__timeout))
+            except asyncio.TimeoutError:
+                return self.__timeout_error(field_name, value)
+        return _error_message(field_name, value, validation_result)
+
+    async def __run_concurrently(self, steps: List[_ValidationStep]) -> List[Optional[str]]:
+        import asyncio
+        from concurrent.futures import ThreadPoolExecutor
+        semaphore = asyncio.Semaphore(self.__max_concurrency)
+        executor = ThreadPoolExecutor(max_workers=self.__max_concurrency, thread_name_prefix="ConfigValidation")
+
+        async def run(step: _ValidationStep) -> Optional[str]:
+            if not isinstance(step, tuple):
+                return step
+            field_name, value, validation_function = step
+            async with semaphore:
+                try:
+                    validation_result = await asyncio.wait_for(_call(validation_function, value, executor),
+                                                               self.__timeout)
+                except asyncio.TimeoutError:
+                    return self.__timeout_error(field_name, value)
+            return _error_message(field_name, value, validation_result)
+
+        try:
+            return await asyncio.gather(*(run(step) for step in steps))
+        finally:
+            # don't wait for timed out functions
+            executor.shutdown(wait=False)
+
+    def __timeout_error(self, field_name: str, value) -> str:
+        return f'Error validating field "{field_name}" with value "{value}": validation timed out after ' \
+               f'{self.__timeout} seconds'
+
+
+def _with_any_depth(states: List[_FieldValidations]) -> List[_FieldValidations]:
+    """
+    Adds the states that are reached by matching no keys with "**".
+    """
+    states = list(states)
+    for state in states:
+        any_depth = state.subfields.get(ANY_KEYS)
+        if any_depth is not None and any_depth not in states:
+            states.append(any_depth)
+    return states
+
+
+def _next_states(states: List[_FieldValidations], key: str) -> List[_FieldValidations]:
+    next_states = []
+    for state in states:
+        next_states += [state.subfields[name] for name in (key, ANY_KEY) if name in state.subfields]
+        if state.any_depth:
+            next_states.append(state)
+    return next_states
+
+
+def _has_subfields(states: List[_FieldValidations], is_node: bool) -> bool:
+    """
+    Tests if the children of a field have to be validated. Wildcards only match existing children of nodes, while
+    field names without wildcards are looked up in any value (and fail for values that are not nodes).
+    """
+    if is_node:
+        return any(state.subfields or state.any_depth for state in states)
+    return any(state.exact and key not in (ANY_KEY, ANY_KEYS) for state in states for key in state.subfields)
+
+
+async def _call(validation_function: Callable, value, executor: 'ThreadPoolExecutor'):
+    import asyncio
+    if inspect.iscoroutinefunction(validation_function):
+        return await validation_function(value)
+    validation_result = await asyncio.get_event_loop().run_in_executor(executor, validation_function, value)
+    if inspect.isawaitable(validation_result):
+        validation_result = await validation_result
+    return validation_result
+
+
+def _error_message(field_name: str, value, validation_result) -> Optional[str]:
+    """
+    Returns the error message for the result of a validation function or None if the value is valid.
+    """
+    error_message = f'Error validating field "{field_name}" with value "{value}"'
+    if isinstance(validation_result, tuple):
+        result, validation_error = validation_result
+        return None if result else f"{error_message}: {validation_error}"
+    return None if validation_result else error_message
+
+
+def _run_coroutine(coroutine):
+    """
+    Runs a coroutine to completion. If an event loop is already running in this thread (e.g., a config is built in
+    an async application), the coroutine runs in the event loop of a separate thread.
+    """
+    import asyncio
+    from concurrent.futures import ThreadPoolExecutor
+    if asyncio._get_running_loop() is None:
+        return _run_in_new_event_loop(coroutine)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(_run_in_new_event_loop, coroutine).result()
+
+
+def _run_in_new_event_loop(coroutine):
+    # asyncio.run is only available since Python 3.7
+    import asyncio
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
@@ -1,5 +1,7 @@
 from typing import Union, Tuple
 
+from ..transformers import to_timedelta
+
 
 def is_timedelta(value: str) -> Union[bool, Tuple[bool, str]]:
     """
@@ -11,19 +13,11 @@ def is_timedelta(value: str) -> Union[bool, Tuple[bool, str]]:
         H = number of hours
         M = number of minutes
         S = number of seconds
+    The value is parsed once for this validation and transformers.to_timedelta, which share their cached results.
     :param value: The timedelta as string.
     :return: True if the value is a valid timedelta specification otherwise False.
     """
-    split_values = value.split(":")
-    if len(split_values) > 5:
-        return False, "Timedelta contains more than 5 elements."
-
-    try:
-        [int(element) for element in split_values]
-    except ValueError:
-        return False, "Timedelta contains non-integer elements."
-
-    return True
+    return to_timedelta.validate(value)
 
 
 def is_valid_choice(options):
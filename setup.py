@@ -29,7 +29,16 @@ REQUIRED = [
 
 # What packages are optional?
 EXTRAS = {
-
+    # faster JSON libraries that are used instead of the json module if they are installed
+    "orjson": ["orjson"],
+    "simdjson": ["pysimdjson"],
+    "ujson": ["ujson"],
+    # incremental parsing of large config files
+    "streaming": ["ijson"],
+    # validation with code generated from the JSON schema
+    "fastjsonschema": ["fastjsonschema"],
+    # watching config files with inotify instead of polling
+    "reloading": ["inotify_simple"]
 }
 
 # The rest you shouldn't have to touch too much :)
@@ -0,0 +1,129 @@
+import json
+import os
+
+import pytest
+
+from python_json_config import ConfigBuilder
+from python_json_config.build_cache import BuildCache
+
+
+builds = []
+
+
+def record_build(port):
+    builds.append(port)
+    return port
+
+
+def upper(value: str) -> str:
+    return value.upper()
+
+
+def lower(value: str) -> str:
+    return value.lower()
+
+
+@pytest.fixture
+def config_file(tmp_path) -> str:
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({"server": {"port": 5000, "host": "localhost"}}))
+    return str(path)
+
+
+def test_cached_builds(config_file, monkeypatch):
+    builds.clear()
+    builder = ConfigBuilder().enable_build_cache().transform_field_value("server.port", record_build)
+    config = builder.parse_config(config_file)
+    cached_config = builder.parse_config(config_file)
+    assert builds == [5000]
+    assert cached_config == config
+
+    # every build returns an independent config
+    cached_config.update("server.port", 6000)
+    assert builder.parse_config(config_file).server.port == 5000
+
+    # changed file
+    with open(config_file, "w") as file:
+        json.dump({"server": {"port": 5001, "host": "localhost"}}, file)
+    assert builder.parse_config(config_file).server.port == 5001
+
+    # changed environment variables and settings
+    monkeypatch.setenv("BUILDCACHETEST_SERVER_HOST", "0.0.0.0")
+    builder.merge_with_env_variables("BUILDCACHETEST")
+    assert builder.parse_config(config_file).server.host == "0.0.0.0"
+    builder.validate_field_type("server.port", int)
+    builder.parse_config(config_file)
+    assert builds == [5000, 5001, 5001, 5001]
+
+    # dictionaries and JSON strings are not cached
+    builder.parse_config({"server": {"port": 1}})
+    builder.parse_config(json.dumps({"server": {"port": 1}}))
+    assert builds[-2:] == [1, 1]
+
+
+def test_replaced_functions(config_file, tmp_path):
+    for cache_dir in (None, str(tmp_path / "cache")):
+        builder = ConfigBuilder().enable_build_cache(cache_dir=cache_dir, cache_version="1")
+        builder.transform_field_value("server.host", lambda host: upper(host))
+        assert builder.parse_config(config_file).server.host == "LOCALHOST"
+        # a function with the same code that calls another function
+        builder.transform_field_value("server.host", lambda host: lower(host))
+        assert builder.parse_config(config_file).server.host == "localhost"
+
+
+def test_content_hash(config_file):
+    builder = ConfigBuilder().enable_build_cache(hash_content=True)
+    assert builder.parse_config(config_file).server.port == 5000
+    stat = os.stat(config_file)
+    with open(config_file, "w") as file:
+        json.dump({"server": {"port": 6000, "host": "localhost"}}, file)
+    os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert builder.parse_config(config_file).server.port == 6000
+
+
+def test_disk_cache(config_file, tmp_path):
+    builds.clear()
+    cache_dir = str(tmp_path / "cache")
+    for _ in range(2):
+        config = ConfigBuilder()\
+            .enable_build_cache(cache_dir=cache_dir, cache_version="1")\
+            .transform_field_value("server.port", record_build)\
+            .parse_config(config_file)
+    assert config.server.port == 5000
+    assert builds == [5000]
+    assert len(os.listdir(cache_dir)) == 1
+
+    # a new version of the code doesn't use the configs of the previous version
+    ConfigBuilder()\
+        .enable_build_cache(cache_dir=cache_dir, cache_version="2")\
+        .transform_field_value("server.port", record_build)\
+        .parse_config(config_file)
+    assert builds == [5000, 5000]
+
+    with pytest.raises(ValueError):
+        ConfigBuilder().enable_build_cache(cache_dir=cache_dir)
+
+
+def test_eviction(tmp_path):
+    cache = BuildCache(max_size=1)
+    keys = []
+    for index in range(2):
+        path = tmp_path / f"config{index}.json"
+        path.write_text("{}")
+        keys.append(cache.key(str(path), (), {}))
+        cache.put(keys[-1], ConfigBuilder().parse_config(str(path)))
+    assert cache.get(keys[0]) is None
+    assert cache.get(keys[1]) is not None
+    assert cache.key('{"server": {}}', (), {}) is None
+
+
+def test_settings_fingerprint():
+    from python_json_config.build_cache import _fingerprint
+    from python_json_config.validators import is_valid_choice
+    assert _fingerprint((lambda x: x + 1,)) == _fingerprint((lambda x: x + 1,))
+    assert _fingerprint((lambda x: x + 1,)) != _fingerprint((lambda x: x + 2,))
+    assert _fingerprint((is_valid_choice([1]),)) != _fingerprint((is_valid_choice([2]),))
+    assert _fingerprint((lambda x: upper(x),)) != _fingerprint((lambda x: lower(x),))
+    assert _fingerprint((lambda x: [upper(y) for y in x],)) != _fingerprint((lambda x: [lower(y) for y in x],))
+    # recursive functions
+    assert _fingerprint((test_settings_fingerprint,)) == _fingerprint((test_settings_fingerprint,))
@@ -0,0 +1,103 @@
+from typing import List, Optional
+
+import pytest
+
+from python_json_config import ConfigBuilder
+from python_json_config.codegen import generate_accessor_classes
+
+SCHEMA = {
+    "type": "object",
+    "properties": {
+        "server": {
+            "type": "object",
+            "properties": {
+                "host": {"type": "string"},
+                "port": {"type": "integer"},
+                "debug-mode": {"type": "boolean"},
+                "class": {"type": ["string", "null"]}
+            },
+            "required": ["host", "port"]
+        },
+        "backends": {
+            "type": "object",
+            "additionalProperties": {
+                "type": "object",
+                "properties": {"weight": {"type": "number"}},
+                "required": ["weight"]
+            }
+        },
+        "users": {"type": "array", "items": {"properties": {"name": {"type": "string"}}}},
+        "extra": {}
+    },
+    "required": ["server"]
+}
+
+
+@pytest.fixture
+def classes() -> dict:
+    namespace = {}
+    exec(generate_accessor_classes(SCHEMA, "AppConfig"), namespace)
+    return namespace
+
+
+def test_generated_classes(classes):
+    values = {"server": {"host": "localhost", "port": 80, "debug-mode": True},
+              "backends": {"b1": {"weight": 1}, "b2": {"weight": 0.5}},
+              "users": [{"name": "admin"}],
+              "extra": [1]}
+    config = classes["AppConfig"].from_dict(values)
+    assert config.server.port == 80
+    assert config.server.debug_mode is True
+    assert config.server.class_ is None
+    assert config.backends["b2"].weight == 0.5
+    assert config.users[0].name == "admin"
+    assert config.extra == [1]
+    assert config.to_dict() == values
+    assert config == classes["AppConfig"].from_dict(values)
+    assert not hasattr(config.server, "__dict__")
+    optional = classes["Optional"]
+    assert classes["Server"].__init__.__annotations__ == {"host": str, "port": int, "debug_mode": optional[bool],
+                                                          "class_": optional[str]}
+
+
+def test_type_checks(classes):
+    with pytest.raises(TypeError, match='Config field "server.port" with value "80"'):
+        classes["AppConfig"].from_dict({"server": {"host": "localhost", "port": "80"}})
+    with pytest.raises(TypeError):
+        classes["AppConfig"].from_dict({"server": {"host": "localhost", "port": True}})
+    with pytest.raises(AttributeError, match="server.host"):
+        classes["AppConfig"].from_dict({"server": {"port": 80}})
+    config = classes["AppConfig"].from_dict({"server": {"host": "localhost", "port": "80"}}, check_types=False)
+    assert config.server.port == "80"
+
+
+def test_reserved_names():
+    schema = {"properties": {
+        "optional": {"properties": {"_fields": {"type": "integer"}, "self": {"type": "integer"}}},
+        "list": {"properties": {"dict": {"properties": {"any": {"type": "string"}}}}},
+        "union": {"type": "array", "items": {"properties": {"to_dict": {"type": "string"}}}}
+    }}
+    namespace = {}
+    exec(generate_accessor_classes(schema, "_Accessor"), namespace)
+    assert namespace["Optional"] is Optional
+    assert namespace["List"] is List
+    values = {"optional": {"_fields": 1, "self": 2}, "list": {"dict": {"any": "a"}}, "union": [{"to_dict": "b"}]}
+    config = namespace["_Accessor2"].from_dict(values)
+    assert config.optional._fields_ == 1
+    assert config.optional.self_ == 2
+    assert config.list.dict.any == "a"
+    assert config.union[0].to_dict_ == "b"
+    assert config.to_dict() == values
+
+
+def test_parse_config_as():
+    builder = ConfigBuilder()
+    builder.validate_with_schema("tests/resources/test_config.schema.json")
+    namespace = {}
+    exec(builder.generate_accessor_classes(), namespace)
+    config = builder.parse_config_as("tests/resources/test_config.json", namespace["ConfigModel"])
+    assert config.server.port == 5000
+    assert config.cache.ttl == 180
+
+    with pytest.raises(ValueError):
+        ConfigBuilder().generate_accessor_classes()
@@ -0,0 +1,64 @@
+import pytest
+
+from python_json_config.coercion import coerce_value, schema_field_types
+from python_json_config.config_node import Config
+
+
+def test_coerce_value():
+    assert coerce_value("8080", int) == 8080
+    assert coerce_value("1.5", float) == 1.5
+    assert coerce_value("1.5", (int, float)) == 1.5
+    assert coerce_value("Yes", bool) is True
+    assert coerce_value("off", bool) is False
+    assert coerce_value("null", (type(None), int)) is None
+    assert coerce_value('["a", "b"]', list) == ["a", "b"]
+    assert coerce_value('{"a": 1}', dict) == {"a": 1}
+    assert coerce_value("8080", (str, int)) == "8080"
+    assert coerce_value("8080", Config) == "8080"
+    with pytest.raises(ValueError, match='"port" can\'t be converted to int'):
+        coerce_value("http", int, "port")
+    with pytest.raises(ValueError):
+        coerce_value('{"a": 1}', list)
+
+
+def test_schema_field_types():
+    schema = {
+        "type": "object",
+        "properties": {
+            "server": {"type": "object", "properties": {"port": {"type": "integer"}}},
+            "ratio": {"type": ["number", "null"]}
+        },
+        "patternProperties": {"^flag_": {"type": "boolean"}},
+        "additionalProperties": {"type": "string"}
+    }
+    assert schema_field_types(schema, ("server", "port")) == (int,)
+    assert schema_field_types(schema, ("ratio",)) == (int, float, type(None))
+    assert schema_field_types(schema, ("flag_debug",)) == (bool,)
+    assert schema_field_types(schema, ("other",)) == (str,)
+    assert schema_field_types(schema, ("server",)) == (dict,)
+    assert schema_field_types(schema, ("server", "host")) is None
+    assert schema_field_types(schema, ("other", "key")) is None
+
+
+def test_merge_with_coercion(monkeypatch):
+    monkeypatch.setenv("COERCIONTEST_SERVER_PORT", "6000")
+    monkeypatch.setenv("COERCIONTEST_SERVER_DEBUG", "true")
+    monkeypatch.setenv("COERCIONTEST_SERVER_HOST", "localhost")
+    monkeypatch.setenv("COERCIONTEST_SERVER_TIMEOUT", "5")
+    monkeypatch.setenv("COERCIONTEST_NEW", "1")
+
+    config = Config({"server": {"port": 5000, "debug": False, "host": "127.0.0.1", "timeout": 1.5}})
+    config.merge_with_env_variables("COERCIONTEST", coerce_types=True, field_types={"server.host": str})
+    assert config.server.port == 6000
+    assert config.server.debug is True
+    assert config.server.host == "localhost"
+    assert config.server.timeout == 5.0
+    assert config.new == "1"
+
+    config = Config({"server": {"port": 5000}})
+    config.merge_with_env_variables("COERCIONTEST")
+    assert config.server.port == "6000"
+
+    monkeypatch.setenv("COERCIONTEST_SERVER_PORT", "http")
+    with pytest.raises(ValueError):
+        Config({"server": {"port": 5000}}).merge_with_env_variables("COERCIONTEST", coerce_types=True)
@@ -0,0 +1,52 @@
+import pickle
+import subprocess
+import sys
+from datetime import timedelta
+
+import pytest
+
+from python_json_config import ConfigBuilder
+from python_json_config.compiled import compile_config, load_compiled_config
+from python_json_config.transformers import to_timedelta
+
+
+@pytest.fixture
+def builder() -> ConfigBuilder:
+    builder = ConfigBuilder()\
+        .validate_field_type("server.port", int)\
+        .transform_field_value("cache.ttl", lambda ttl: to_timedelta(f"0:0:0:0:{ttl}"))
+    builder.validate_with_schema("tests/resources/test_config.schema.json")
+    return builder
+
+
+@pytest.mark.parametrize("file_name", ["config.pickle", "compiled_config.py"])
+def test_compile_config(builder, tmp_path, file_name):
+    compiled_file = str(tmp_path / file_name)
+    config = compile_config(builder, "tests/resources/test_config.json", compiled_file)
+    compiled_config = load_compiled_config(compiled_file)
+    assert compiled_config == config
+    assert compiled_config.cache.ttl == timedelta(seconds=180)
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7), reason="the package is only imported lazily since Python 3.7")
+def test_load_compiled_config_lazily(builder, tmp_path):
+    compiled_file = str(tmp_path / "config.pickle")
+    compile_config(builder, "tests/resources/test_config.json", compiled_file)
+    # loading the compiled config doesn't import the builder, the validations or jsonschema and msgpack
+    code = "import sys\n" \
+           "from python_json_config.compiled import load_compiled_config\n" \
+           f"config = load_compiled_config({compiled_file!r})\n" \
+           "print(config.server.port)\n" \
+           "modules = ['jsonschema', 'msgpack', 'python_json_config.config_builder', " \
+           "'python_json_config.validation_engine']\n" \
+           "print([module for module in modules if module in sys.modules])\n"
+    result = subprocess.run([sys.executable, "-c", code], stdout=subprocess.PIPE, universal_newlines=True,
+                            check=True)
+    assert result.stdout.split("\n")[:2] == ["5000", "[]"]
+
+
+def test_incompatible_version(builder, tmp_path):
+    compiled_file = tmp_path / "config.pickle"
+    compiled_file.write_bytes(pickle.dumps((0, builder.parse_config("tests/resources/test_config.json"))))
+    with pytest.raises(ValueError):
+        load_compiled_config(str(compiled_file))
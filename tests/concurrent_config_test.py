@@ -0,0 +1,137 @@
+import sys
+import threading
+
+import pytest
+
+from python_json_config import Config, ConcurrentConfig, ConfigDiff
+
+WRITERS = 4
+READERS = 4
+WRITES = 200
+
+
+def config_dict() -> dict:
+    return {
+        "server": {"host": "127.0.0.1", "port": 5000},
+        "backends": {f"backend{index}": {"port": 8000 + index} for index in range(100)},
+        "pair": {"first": 0, "second": 0},
+        "counter": 0
+    }
+
+
+@pytest.fixture
+def concurrent_config() -> ConcurrentConfig:
+    return ConcurrentConfig(Config(config_dict(), cache_lookups=True))
+
+
+def test_write(concurrent_config):
+    old_config = concurrent_config.config
+    assert concurrent_config.server.port == 5000
+
+    concurrent_config.update("server.port", 6000)
+    assert concurrent_config.get("server.port") == 6000
+    assert concurrent_config.version == 1
+    # old versions don't change and unchanged subtrees are shared
+    assert old_config.server.port == 5000
+    assert concurrent_config.config.backends is old_config.backends
+
+    concurrent_config.add("server.timeout", 30)
+    concurrent_config.remove("server.host")
+    concurrent_config.update_many({("pair", "first"): 1, ("pair", "second"): 1})
+    concurrent_config.apply_diff(ConfigDiff(changed={("counter",): 1}))
+    assert concurrent_config.version == 5
+    assert concurrent_config.config.to_dict() == {**config_dict(),
+                                                  "server": {"port": 6000, "timeout": 30},
+                                                  "pair": {"first": 1, "second": 1},
+                                                  "counter": 1}
+    assert old_config.to_dict() == config_dict()
+    assert "server.timeout" in concurrent_config
+
+
+def test_failed_write_keeps_config(concurrent_config):
+    old_config = concurrent_config.config
+    with pytest.raises(RuntimeError):
+        concurrent_config.update("server.missing", 1, upsert=False)
+    with pytest.raises(RuntimeError):
+        concurrent_config.apply_diff(ConfigDiff(removed=[("counter",), ("missing",)]))
+    assert concurrent_config.config is old_config
+    assert concurrent_config.version == 0
+    assert old_config.to_dict() == config_dict()
+
+
+def test_transaction(concurrent_config):
+    with concurrent_config.transaction() as config:
+        config.update("pair.first", 1)
+        # readers don't see the changes until the transaction is finished
+        assert concurrent_config.pair.first == 0
+        config.update("pair.second", 1)
+    assert concurrent_config.pair.to_dict() == {"first": 1, "second": 1}
+
+    with pytest.raises(ValueError):
+        with concurrent_config.transaction() as config:
+            config.update("pair.first", 2)
+            raise ValueError()
+    assert concurrent_config.pair.first == 1
+    assert concurrent_config.version == 1
+
+
+def test_merge_with_env_variables(concurrent_config, monkeypatch):
+    old_config = concurrent_config.config
+    monkeypatch.setenv("APP_SERVER_PORT", "7000")
+    concurrent_config.merge_with_env_variables("APP", coerce_types=True)
+    assert concurrent_config.server.port == 7000
+    assert old_config.server.port == 5000
+
+
+@pytest.fixture
+def frequent_thread_switches():
+    # switch threads as often as possible with the GIL (free-threaded builds run the threads in parallel anyway)
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(switch_interval)
+
+
+def test_concurrent_reads_and_writes(concurrent_config, frequent_thread_switches):
+    barrier = threading.Barrier(WRITERS + READERS)
+    writers_finished = threading.Event()
+    errors = []
+
+    def write(writer: int):
+        barrier.wait()
+        for index in range(WRITES):
+            value = writer * WRITES + index
+            concurrent_config.update_many({("pair", "first"): value, ("pair", "second"): value})
+            concurrent_config.update(["backends", f"backend{index % 100}", "port"], value)
+            with concurrent_config.transaction() as config:
+                config.update("counter", config.counter + 1)
+
+    def read():
+        barrier.wait()
+        last_version = -1
+        while not writers_finished.is_set():
+            version = concurrent_config.version
+            config = concurrent_config.config
+            # every version is consistent and doesn't change while it is read
+            pair = (config.pair.first, config.get("pair.second"))
+            content_hash = config.content_hash()
+            if pair[0] != pair[1] or version < last_version or config.get("pair.first") != pair[0] \
+                    or config.content_hash() != content_hash:
+                errors.append((version, pair))
+            last_version = version
+
+    writers = [threading.Thread(target=write, args=(writer,)) for writer in range(WRITERS)]
+    readers = [threading.Thread(target=read) for _ in range(READERS)]
+    for thread in writers + readers:
+        thread.start()
+    for thread in writers:
+        thread.join()
+    writers_finished.set()
+    for thread in readers:
+        thread.join()
+
+    assert errors == []
+    # no write was lost
+    assert concurrent_config.counter == WRITERS * WRITES
+    assert concurrent_config.version == 3 * WRITERS * WRITES
+    assert concurrent_config.config == Config(concurrent_config.config.to_dict())
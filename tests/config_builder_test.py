@@ -3,7 +3,7 @@ import json
 import pytest
 from jsonschema import ValidationError
 
-from python_json_config import ConfigBuilder
+from python_json_config import Config, ConfigBuilder
 
 
 @pytest.fixture
@@ -184,3 +184,182 @@ def test_build_from_serialized_config(path):
 
     assert config == builder.parse_config(config.to_dict())
     assert config == builder.parse_config(config.to_json())
+
+
+def test_lookup_cache(path):
+    config = ConfigBuilder().enable_lookup_cache().parse_config(path)
+    assert config.server.port == 5000
+    assert config.get("server.port") == 5000
+    # fields accessed as attributes are cached as attributes of their nodes
+    assert config.__dict__["server"] is config.server
+    assert config.server.__dict__["port"] == 5000
+    assert config._Config__lookup_cache["server.port"] == 5000
+
+
+def test_lazy_loading(path):
+    config = ConfigBuilder()\
+        .enable_lazy_loading()\
+        .validate_field_type("server.port", int)\
+        .transform_field_value("server.port", lambda x: x + 1)\
+        .parse_config(path)
+    assert isinstance(config._ConfigNode__node_dict["cache"], dict)
+    assert config.server.port == 5001
+    assert config.cache.ttl == 180
+
+
+def test_incremental_build(path, monkeypatch):
+    validated = []
+
+    def validate(value):
+        validated.append(value)
+        return True
+
+    builder = ConfigBuilder()\
+        .enable_incremental_builds()\
+        .validate_field_value("server.host", validate)\
+        .validate_field_value("cache.name", validate)\
+        .transform_field_value("server.port", lambda x: x + 1)\
+        .transform_field_value("cache", lambda x: x)
+    with open(path, "r") as config_file:
+        config_dict = json.load(config_file)
+    config_dict["cache"]["name"] = "cache"
+    config = builder.parse_config(config_dict)
+    assert validated == ["127.0.0.1", "cache"]
+    assert config.server.port == 5001
+
+    # nothing changed
+    assert builder.parse_config(config_dict) is config
+
+    config_dict["server"]["port"] = 6000
+    validated.clear()
+    new_config = builder.parse_config(config_dict)
+    assert validated == []
+    assert new_config.server.port == 6001
+    assert new_config.cache is config.cache
+    assert new_config.to_dict() == ConfigBuilder()\
+        .transform_field_value("server.port", lambda x: x + 1)\
+        .parse_config(config_dict).to_dict()
+
+    # the transformed field "cache" contains the changed field and is rebuilt completely
+    config_dict["cache"]["ttl"] = 10
+    validated.clear()
+    newest_config = builder.parse_config(config_dict)
+    assert validated == ["cache"]
+    assert newest_config.cache.ttl == 10
+    assert newest_config.server is new_config.server
+
+    # environment variables
+    monkeypatch.setenv("INCREMENTALTEST_SERVER_HOST", "localhost")
+    builder.merge_with_env_variables("INCREMENTALTEST")
+    config = builder.parse_config(config_dict)
+    assert config.server.host == "localhost"
+    monkeypatch.setenv("INCREMENTALTEST_SERVER_HOST", "0.0.0.0")
+    validated.clear()
+    config = builder.parse_config(config_dict)
+    assert config.server.host == "0.0.0.0"
+    assert config.server.port == 6001
+    assert validated == ["0.0.0.0"]
+
+
+def test_incremental_build_keeps_env_only_fields(monkeypatch):
+    monkeypatch.setenv("ENVONLYTEST_NEWKEY", "x")
+    monkeypatch.setenv("ENVONLYTEST_SERVER_HOST", "localhost")
+    builder = ConfigBuilder()\
+        .enable_incremental_builds()\
+        .merge_with_env_variables("ENVONLYTEST")
+    config = builder.parse_config({"a": 1, "server": {"port": 5000}})
+    assert config.newkey == "x"
+    assert config.server.host == "localhost"
+
+    config = builder.parse_config({"a": 2, "server": {"port": 5000}})
+    assert config.newkey == "x"
+    assert config.server.host == "localhost"
+
+    config = builder.parse_config({"a": 2, "server": {"port": 6000}})
+    assert config.to_dict() == {"a": 2, "server": {"port": 6000, "host": "localhost"}, "newkey": "x"}
+
+
+def test_incremental_build_errors(path):
+    builder = ConfigBuilder()\
+        .enable_incremental_builds()\
+        .validate_field_value("server.port", lambda x: x > 1024)
+    config = builder.parse_config({"server": {"port": 5000}, "other": {"key": 1}})
+    with pytest.raises(AssertionError):
+        builder.parse_config({"server": {"port": 80}, "other": {"key": 1}})
+    new_config = builder.parse_config({"server": {"port": 5000}, "other": {"key": 2}})
+    assert new_config.server.port == 5000
+    assert new_config.other.key == 2
+    assert config.other.key == 1
+
+
+def test_failed_incremental_build_keeps_config():
+    builder = ConfigBuilder()\
+        .enable_incremental_builds()\
+        .enable_lookup_cache()\
+        .validate_field_value("server.port", lambda x: x > 1024)
+    config = builder.parse_config({"server": {"port": 5000}, "other": {"key": 1}})
+    assert config.get("other.key") == 1
+    with pytest.raises(AssertionError):
+        builder.parse_config({"server": {"port": 80}, "other": {"key": 1}})
+    # the nodes that were moved to the discarded config belong to the previous config again
+    config.other.update("key", 5)
+    assert config.get("other.key") == 5
+    config.update("other.key", 6)
+    assert config.other.key == 6
+    assert config.content_hash() == Config({"server": {"port": 5000}, "other": {"key": 6}}).content_hash()
+
+
+def test_failed_incremental_build_with_new_env_variable(monkeypatch):
+    builder = ConfigBuilder()\
+        .enable_incremental_builds()\
+        .set_field_access_required()\
+        .merge_with_env_variables("NEWENVTEST")\
+        .validate_field_value("server.port", lambda x: x > 1024)
+    config = builder.parse_config({"server": {"port": 5000}})
+    monkeypatch.setenv("NEWENVTEST_NEW_KEY", "1")
+    with pytest.raises(AssertionError):
+        builder.parse_config({"server": {"port": 80}})
+    assert config.to_dict() == {"server": {"port": 5000}}
+
+
+def test_env_type_coercion(path, schema_path, monkeypatch):
+    monkeypatch.setenv("BUILDERCOERCION_SERVER_PORT", "6000")
+    monkeypatch.setenv("BUILDERCOERCION_SERVER_DEBUG__MODE", "true")
+    monkeypatch.setenv("BUILDERCOERCION_CACHE_TTL", "60")
+    builder = ConfigBuilder()\
+        .validate_field_type("cache.ttl", str)\
+        .merge_with_env_variables("BUILDERCOERCION", coerce_types=True)
+    builder.validate_with_schema(schema_path)
+    config = builder.parse_config(path)
+    assert config.server.port == 6000
+    assert config.server.debug_mode is True
+    assert config.cache.ttl == "60"
+
+    monkeypatch.setenv("BUILDERCOERCION_SERVER_PORT", "http")
+    with pytest.raises(ValueError):
+        builder.parse_config(path)
+
+
+def test_wildcard_fields(monkeypatch):
+    monkeypatch.setenv("WILDCARDTEST_BACKENDS_B2_PORT", "8002")
+    builder = ConfigBuilder()\
+        .enable_incremental_builds()\
+        .merge_with_env_variables("WILDCARDTEST", coerce_types=True)\
+        .validate_field_type("backends.*.port", int)\
+        .validate_field_value("**.timeout", lambda timeout: timeout > 0)\
+        .transform_field_value("backends.*",
+                               lambda backend: {**backend.to_dict(), "url": f"http://localhost:{backend.port}"})
+    config_dict = {"backends": {"b1": {"port": 8001, "timeout": 1}, "b2": {"port": 80}}, "timeout": 5}
+    config = builder.parse_config(config_dict)
+    assert config.backends.b1.url == "http://localhost:8001"
+    assert config.backends.b2.url == "http://localhost:8002"
+
+    # only the changed backend is transformed again
+    config_dict["backends"]["b1"]["port"] = 9001
+    new_config = builder.parse_config(config_dict)
+    assert new_config.backends.b1.url == "http://localhost:9001"
+    assert new_config.backends.b2 is config.backends.b2
+
+    config_dict["backends"]["b2"]["timeout"] = 0
+    with pytest.raises(AssertionError, match="backends.b2.timeout"):
+        builder.parse_config(config_dict)
@@ -0,0 +1,74 @@
+import pytest
+
+from python_json_config.config_node import Config
+
+
+def config_dict() -> dict:
+    return {
+        "server": {"host": "127.0.0.1", "port": 5000, "tls": {"enabled": False}},
+        "cache": {"ttl": 180, "hosts": ["a", "b"]},
+        "debug": False
+    }
+
+
+def test_clone():
+    config = Config(config_dict(), cache_lookups=True)
+    assert config.get("server.port") == 5000
+    copy = config.clone()
+    assert copy == config
+    assert type(copy) is type(config)
+    assert copy.server is not config.server
+    assert copy.server.tls is not config.server.tls
+    # values are shared
+    assert copy.cache.hosts is config.cache.hosts
+
+    copy.update("server.port", 6000)
+    copy.update("cache.ttl", 60)
+    assert copy.get("server.port") == 6000
+    assert config.get("server.port") == 5000
+    assert config.cache.ttl == 180
+
+
+def test_clone_paths():
+    config = Config(config_dict(), cache_lookups=True)
+    old_hash = config.content_hash()
+    copy = config.clone(["server"])
+    assert copy.server is not config.server
+    assert copy.server.tls is config.server.tls
+    assert copy.cache is config.cache
+    assert copy.content_hash() == old_hash
+
+    copy.update("server.port", 6000)
+    copy.add("server.timeout", 30)
+    copy.remove("server.host")
+    copy.update("debug", True)
+    copy.update_many({("server", "workers"): 4, ("metrics", "enabled"): True})
+    assert copy.to_dict() == {
+        "server": {"port": 6000, "tls": {"enabled": False}, "timeout": 30, "workers": 4},
+        "cache": {"ttl": 180, "hosts": ["a", "b"]},
+        "debug": True,
+        "metrics": {"enabled": True}
+    }
+    assert config.to_dict() == config_dict()
+    assert config.content_hash() == old_hash
+    assert copy.content_hash() != old_hash
+    assert copy.content_hash() == Config(copy.to_dict()).content_hash()
+
+
+def test_clone_lazy():
+    config = Config(config_dict(), lazy=True)
+    copy = config.clone(["server.tls"])
+    copy.update("server.tls.enabled", True)
+    assert copy.server.tls.enabled
+    assert not config.server.tls.enabled
+    assert copy.cache == config.cache
+
+
+def test_clone_errors():
+    config = Config(config_dict())
+    copy = config.clone([])
+    copy.update("debug", True)
+    assert not config.debug
+    with pytest.raises(RuntimeError):
+        copy.remove("server.missing")
+    assert config.server.to_dict() == copy.server.to_dict()
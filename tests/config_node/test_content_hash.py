@@ -0,0 +1,60 @@
+import pickle
+from datetime import timedelta
+from decimal import Decimal
+
+from python_json_config.config_node import Config
+
+
+def config_dict() -> dict:
+    return {
+        "server": {"host": "127.0.0.1", "port": 5000},
+        "cache": {"ttl": timedelta(seconds=180), "hosts": ["a", "b"]},
+        "debug": False
+    }
+
+
+def test_content_hash():
+    config = Config(config_dict())
+    reordered_config = Config(dict(reversed(list(config_dict().items()))))
+    assert config.content_hash() == reordered_config.content_hash()
+    assert config.content_hash() == pickle.loads(pickle.dumps(config)).content_hash()
+    assert Config({"a": [1]}).content_hash() != Config({"a": (1,)}).content_hash()
+    assert Config({"a": 1}).content_hash() != Config({"a": True}).content_hash()
+    assert Config({"a": {}}).content_hash() != Config({"a": None}).content_hash()
+    # values that msgpack doesn't support differ from their string representation
+    assert Config({"a": (1, 2)}).content_hash() != Config({"a": "(1, 2)"}).content_hash()
+    assert Config({"a": Decimal("1.5")}).content_hash() != Config({"a": "1.5"}).content_hash()
+    assert Config({"a": Decimal("1.5")}).content_hash() == Config({"a": Decimal("1.5")}).content_hash()
+
+
+def test_content_hash_invalidation():
+    config = Config(config_dict())
+    old_hash = config.content_hash()
+    cache_hash = config.cache.content_hash()
+
+    config.update("server.port", 6000)
+    assert config._ConfigNode__content_hash is None
+    assert config.server._ConfigNode__content_hash is None
+    # siblings of modified nodes keep their hashes
+    assert config.cache._ConfigNode__content_hash is not None
+    assert config.content_hash() != old_hash
+    assert config.cache.content_hash() == cache_hash
+
+    config.update("server.port", 5000)
+    assert config.content_hash() == old_hash
+
+    config.add("server.tls.cert", "a.pem")
+    assert config.content_hash() != old_hash
+    config.remove("server.tls")
+    assert config.content_hash() == old_hash
+
+
+def test_equality_ignores_content_hash():
+    config1 = Config(config_dict())
+    config2 = Config(config_dict())
+    config1.content_hash()
+    config2.content_hash()
+    # cached hashes can be outdated (e.g., after in place modifications), so the values are compared
+    config2.cache._ConfigNode__node_dict["ttl"] = 1
+    assert config1 != config2
+    assert config1.diff(config2).changed == {("cache", "ttl"): 1}
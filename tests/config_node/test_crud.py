@@ -1,24 +1,26 @@
 import os
+import pickle
 import warnings
 import pytest
 
-from python_json_config.config_node import ConfigNode
+from python_json_config.config_node import ConfigNode, Config
 
 
 def test_creation(config_dict):
     node = ConfigNode(config_dict)
     assert node.key1 == 1
-    assert node.__dict__["_ConfigNode__path"] == []
+    assert node._ConfigNode__path == []
     assert isinstance(node.key2, ConfigNode)
 
     nested_node = node.key2
     assert nested_node.key3 == 3
-    assert nested_node.__dict__["_ConfigNode__path"] == ["key2"]
+    assert nested_node._ConfigNode__path == ["key2"]
     assert isinstance(nested_node.key4, ConfigNode)
 
     nested_node = nested_node.key4
     assert nested_node.key5 == 5
-    assert nested_node.__dict__["_ConfigNode__path"] == ["key2", "key4"]
+    assert nested_node._ConfigNode__path == ["key2", "key4"]
+    assert not hasattr(nested_node, "__dict__")
 
 
 def test_get(config_dict):
@@ -190,3 +192,82 @@ def test_merge_env_variable_underscore_name():
 
     for key, value in variables.items():
         del os.environ[key]
+
+
+def test_lookup_cache(config_dict):
+    config = Config(config_dict, cache_lookups=True)
+    assert config.get("key2.key4.key5") == 5
+    assert config._Config__lookup_cache == {"key2.key4.key5": 5}
+
+    config.update("key2.key4.key5", 6)
+    assert config._Config__lookup_cache == {}
+    assert config.get("key2.key4.key5") == 6
+
+    config.key2.add("key4.key5", 7)
+    assert config.get("key2.key4.key5") == 7
+
+    os.environ["PYTHONJSONCONFIG_KEY2_KEY4_KEY5"] = "8"
+    config.merge_with_env_variables("PYTHONJSONCONFIG")
+    del os.environ["PYTHONJSONCONFIG_KEY2_KEY4_KEY5"]
+    assert config.get("key2.key4.key5") == "8"
+
+
+def test_lookup_cache_disabled(config_dict):
+    config = Config(config_dict)
+    assert config.get("key2.key4.key5") == 5
+    assert config._Config__lookup_cache is None
+
+
+def test_field_settings_are_shared():
+    fields = [f"key{index}.nokey" for index in range(1000)]
+    config_dict = {f"key{index}": {"value": index} for index in range(1000)}
+    config = Config(config_dict, strict_access=False, required_fields=fields, optional_fields=["key0.key"])
+    assert config.key0.required_fields == {"nokey"}
+    assert config.key1.optional_fields is config.key2.optional_fields
+    with pytest.raises(AttributeError):
+        config.get("key999.nokey")
+    assert config.key0.key is None
+
+
+def test_update_many():
+    config = Config({"key1": 1, "key2": {"key3": 3, "key4": {"key5": 5}}}, cache_lookups=True)
+    assert config.get("key2.key3") == 3
+    content_hash = config.content_hash()
+
+    config.update_many({("key1",): "a", ("key2", "key3"): "b", ("key2", "key6", "key7"): "c", ("key8",): {"key9": 9}})
+    assert config.key1 == "a"
+    assert config.get("key2.key3") == "b"
+    assert config.key2.key4.key5 == 5
+    assert config.key2.key6.key7 == "c"
+    assert config.key2.key6._ConfigNode__path == ["key2", "key6"]
+    assert config.key8.key9 == 9
+    assert config.content_hash() != content_hash
+
+    # later paths replace the values of earlier paths
+    config.update_many({("key1", "key10"): 10, ("key1",): 1})
+    assert config.key1 == 1
+    config.update_many({("key1",): 1, ("key1", "key10"): 10})
+    assert config.key1.key10 == 10
+
+
+def test_cached_attributes():
+    config = Config({"server": {"port": 5000, "tls": {"enabled": True}}}, cache_lookups=True)
+    assert config.server.tls.enabled
+    assert config.__dict__["server"] is config.server
+    assert config.server.tls.__dict__ == {"enabled": True}
+
+    # modifications remove the cached attributes of the modified node
+    config.update("server.tls.enabled", False)
+    assert not config.server.tls.enabled
+    config.update("server", {"port": 6000})
+    assert config.server.port == 6000
+    assert "tls" not in config.server
+    config.server.remove("port")
+    with pytest.raises(AttributeError):
+        config.server.port
+
+    # attributes are not pickled
+    restored = pickle.loads(pickle.dumps(config))
+    assert type(restored) is type(config)
+    assert restored.__dict__ == {}
+    assert not hasattr(Config({"key": {}}).key, "__dict__")
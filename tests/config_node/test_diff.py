@@ -0,0 +1,93 @@
+from datetime import timedelta
+
+import pytest
+
+from python_json_config import ConfigDiff
+from python_json_config.config_node import ConfigNode, Config
+
+
+@pytest.fixture
+def old_dict() -> dict:
+    return {
+        "server": {"host": "127.0.0.1", "port": 5000, "tls": {"cert": "a.pem"}},
+        "cache": {"ttl": 180},
+        "hosts": ["a", "b"],
+        "removed": {"key": 1}
+    }
+
+
+@pytest.fixture
+def new_dict() -> dict:
+    return {
+        "server": {"host": "127.0.0.1", "port": 6000, "tls": "off"},
+        "cache": {"ttl": 180, "name": "cache"},
+        "hosts": ["a", "c"],
+        "added": {"key": timedelta(seconds=2)}
+    }
+
+
+def test_diff(old_dict, new_dict):
+    diff = Config(old_dict).diff(Config(new_dict))
+    assert diff.added == {("cache", "name"): "cache", ("added",): {"key": timedelta(seconds=2)}}
+    assert diff.removed == [("removed",)]
+    assert diff.changed == {("server", "port"): 6000, ("server", "tls"): "off", ("hosts",): ["a", "c"]}
+    assert len(diff) == 6
+    assert not Config(old_dict).diff(Config(old_dict))
+
+
+class Unequal(object):
+    def __eq__(self, other):
+        raise AssertionError("values were compared")
+
+
+def test_diff_skips_identical_subtrees(old_dict):
+    shared_node = ConfigNode({"key": Unequal()})
+    config1 = Config({**old_dict, "shared": shared_node})
+    config2 = Config({**old_dict, "shared": shared_node})
+    assert config1 == config2
+    assert not config1.diff(config2)
+
+
+def test_apply_diff(old_dict, new_dict):
+    config = Config(old_dict)
+    new_config = Config(new_dict)
+    config.apply_diff(config.diff(new_config))
+    assert config == new_config
+    assert config.server.tls == "off"
+
+    with pytest.raises(RuntimeError):
+        Config({}).apply_diff(ConfigDiff(removed=[("nokey",)]))
+    with pytest.raises(RuntimeError):
+        Config({}).apply_diff(ConfigDiff(changed={("nokey",): 1}))
+
+
+def test_serialization(old_dict, new_dict):
+    diff = Config(old_dict).diff(Config(new_dict))
+    assert ConfigDiff.from_msgpack(diff.to_msgpack()) == diff
+    diff.changed[("changed",)] = {1: "x"}
+    assert ConfigDiff.from_msgpack(diff.to_msgpack()) == diff
+    # JSON only supports string keys
+    del diff.changed[("changed",)]
+
+    diff.added[("added",)] = {"key": "2"}
+    assert ConfigDiff.from_json(diff.to_json()) == diff
+
+    config = Config(old_dict)
+    config.apply_diff(ConfigDiff.from_json(diff.to_json()))
+    assert config.added.key == "2"
+
+
+def test_equality_short_circuits():
+    assert Config({"a": 1, "b": Unequal()}) != Config({"a": 2, "b": Unequal()})
+    assert Config({"a": {"b": 1}}) != Config({"a": 1})
+    assert Config({"a": 1}) != Config({"a": 1, "b": 2})
+
+
+def test_in_place_modifications():
+    # cached content hashes don't reflect in place modifications of mutable values, so they are not compared
+    config = Config({"x": {"l": [1]}})
+    other_config = Config({"x": {"l": [1]}})
+    assert config.content_hash() == other_config.content_hash()
+    config.x.l.append(2)
+    assert config != other_config
+    assert config.diff(other_config).changed == {("x", "l"): [1]}
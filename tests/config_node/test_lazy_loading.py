@@ -0,0 +1,52 @@
+import pickle
+
+import pytest
+
+from python_json_config.config_node import ConfigNode, Config
+
+
+def test_lazy_creation(config_dict):
+    config = Config(config_dict, lazy=True)
+    node_dict = config._ConfigNode__node_dict
+    assert node_dict["key2"] is config_dict["key2"]
+
+    nested_node = config.key2
+    assert isinstance(nested_node, ConfigNode)
+    assert node_dict["key2"] is nested_node
+    assert nested_node._ConfigNode__path == ["key2"]
+    assert nested_node._ConfigNode__node_dict["key4"] is config_dict["key2"]["key4"]
+    assert config.get("key2.key4.key5") == 5
+    assert config.key2.key4._ConfigNode__path == ["key2", "key4"]
+
+
+def test_lazy_access_settings(config_dict):
+    config = Config(config_dict, lazy=True, strict_access=False, required_fields=["key2.key4.nokey"])
+    assert config.nokey is None
+    assert config.key2.key4.nokey2 is None
+    with pytest.raises(AttributeError):
+        config.key2.key4.nokey
+
+
+def test_lazy_iteration(config_dict):
+    expected_config = ConfigNode(config_dict)
+    assert list(Config(config_dict, lazy=True).keys()) == list(expected_config.keys())
+    assert list(Config(config_dict, lazy=True).values()) == list(expected_config.values())
+    assert list(Config(config_dict, lazy=True).items()) == list(expected_config.items())
+    assert Config(config_dict, lazy=True).to_dict() == config_dict
+    assert Config(config_dict, lazy=True) == expected_config
+
+
+def test_lazy_modification(config_dict):
+    config = Config(config_dict, lazy=True)
+    config.update("key2.key4.key5", 6)
+    config.add("key2.key8", 8)
+    assert config.key2.key4.key5 == 6
+    assert config.key2.key8 == 8
+    assert config_dict["key2"]["key4"]["key5"] == 5
+    assert "key8" not in config_dict["key2"]
+
+
+def test_lazy_pickle(config_dict):
+    config = pickle.loads(pickle.dumps(Config(config_dict, lazy=True)))
+    assert config.key2.key4.key5 == 5
+    assert config.to_dict() == config_dict
@@ -1,8 +1,9 @@
 import datetime
 import pickle
 import msgpack
+import pytest
 
-from python_json_config.config_node import ConfigNode
+from python_json_config.config_node import ConfigNode, Config
 
 
 def test_pickle(config_dict):
@@ -11,6 +12,37 @@ def test_pickle(config_dict):
     assert pickle_conf.key1 == 1
     assert pickle_conf.key2.key3 == 3
     assert pickle_conf.key2.key4.key5 == 5
+    assert pickle_conf.key2.key4._ConfigNode__path == ["key2", "key4"]
+
+
+def test_pickle_config(config_dict):
+    config = Config(config_dict, strict_access=False, required_fields=["key2.nokey"], cache_lookups=True)
+    assert config.get("key2.key3") == 3
+    pickle_conf = pickle.loads(pickle.dumps(config))
+    assert pickle_conf._Config__lookup_cache == {"key2.key3": 3}
+    assert pickle_conf.key2._ConfigNode__lookup_cache is pickle_conf._Config__lookup_cache
+    assert pickle_conf == config
+    assert pickle_conf.nokey is None
+    with pytest.raises(AttributeError):
+        pickle_conf.key2.nokey
+
+
+def test_unpickle_baseline_config():
+    # pickled by the version without __slots__, whose nodes stored their path and field settings as lists
+    with open("tests/resources/baseline_config.pickle", "rb") as pickle_file:
+        config = pickle.load(pickle_file)
+    assert isinstance(config, Config)
+    assert config.to_dict() == {"server": {"host": "127.0.0.1", "port": 5000, "tls": {"enabled": False}},
+                                "name": "test"}
+    assert config.server.tls._ConfigNode__path == ["server", "tls"]
+    assert config.server.timeout is None
+    assert config.nokey is None
+    with pytest.raises(AttributeError, match='No value exists for key "server.tls.cert"'):
+        config.server.tls.cert
+    config.update("server.port", 6000)
+    assert config.get("server.port") == 6000
+    assert config.content_hash() == Config(config.to_dict()).content_hash()
+    assert pickle.loads(pickle.dumps(config)) == config
 
 
 def test_to_dict(config_dict):
@@ -49,6 +81,13 @@ def test_from_msgpack(config_dict):
     assert config == deserialized_config
 
 
+def test_msgpack_non_string_keys():
+    config = ConfigNode({"a": {1: "x", 2: {"b": [{3: "y"}]}}})
+    deserialized_config = ConfigNode.from_msgpack(config.to_msgpack())
+    assert deserialized_config.to_dict() == {"a": {1: "x", 2: {"b": [{3: "y"}]}}}
+    assert deserialized_config == config
+
+
 def test_to_msgpack_complex_type():
     config = ConfigNode({
         "key1": datetime.timedelta(seconds=1, minutes=2),
@@ -65,3 +104,35 @@ def test_from_msgpack_complex_type():
     })
     deserialized_config = ConfigNode.from_msgpack(config.to_msgpack())
     assert deserialized_config == ConfigNode({"key1": "0:02:01", "key2": "2000-04-01 00:00:00"})
+
+
+def test_msgpack_preserve_types():
+    values = {
+        "key1": datetime.timedelta(days=3, seconds=1, minutes=2, microseconds=5),
+        "key2": {
+            "key3": datetime.datetime(day=1, year=2000, month=4, second=3),
+            "key4": datetime.datetime(2000, 4, 1, 12, tzinfo=datetime.timezone(datetime.timedelta(hours=2))),
+            "key5": datetime.date(2000, 4, 1),
+            "key6": datetime.time(12, 30, 1, 3)
+        }
+    }
+    config = ConfigNode(values)
+    deserialized_config = ConfigNode.from_msgpack(config.to_msgpack(preserve_types=True))
+    assert deserialized_config.to_dict() == values
+    assert deserialized_config.key2.key4.utcoffset() == datetime.timedelta(hours=2)
+
+
+def test_from_msgpack_structure():
+    config = Config({"key1": [{"key2": 1}, [{"key3": {"key4": 2}}]], "key5": {"key6": {"key7": 3}}, "key8": {}})
+    deserialized_config = Config.from_msgpack(config.to_msgpack())
+    assert isinstance(deserialized_config, Config)
+    assert deserialized_config == config
+    assert deserialized_config.key1 == [{"key2": 1}, [{"key3": {"key4": 2}}]]
+    assert deserialized_config.key5.key6._ConfigNode__path == ["key5", "key6"]
+    assert deserialized_config.key5._ConfigNode__parent is deserialized_config
+    assert isinstance(deserialized_config.key8, ConfigNode)
+
+
+def test_to_msgpack_lazy(config_dict):
+    config = Config(config_dict, lazy=True)
+    assert msgpack.loads(config.to_msgpack(), raw=False) == config_dict
@@ -0,0 +1,35 @@
+from python_json_config.config_node import Config
+from python_json_config.field_patterns import is_field_pattern, path_matches, iter_matching_paths, iter_matching_fields
+
+
+def test_is_field_pattern():
+    assert is_field_pattern("backends.*.port")
+    assert is_field_pattern("**.timeout")
+    assert not is_field_pattern("server.port")
+
+
+def test_path_matches():
+    assert path_matches(("backends", "*", "port"), ("backends", "b1", "port"))
+    assert not path_matches(("backends", "*", "port"), ("backends", "port"))
+    assert path_matches(("**", "timeout"), ("timeout",))
+    assert path_matches(("**", "timeout"), ("a", "b", "timeout"))
+    assert not path_matches(("**", "timeout"), ("a", "timeout", "b"))
+    assert path_matches(("a", "**"), ("a", "b", "c"))
+
+
+def test_iter_matching_paths():
+    config = Config({"timeout": 1, "backends": {"b1": {"port": 1, "timeout": 2}, "b2": {"port": 2}, "b3": 3}})
+    assert list(iter_matching_paths(config, ("backends", "*", "port"))) == [("backends", "b1", "port"),
+                                                                            ("backends", "b2", "port")]
+    assert list(iter_matching_paths(config, ("**", "timeout"))) == [("timeout",), ("backends", "b1", "timeout")]
+    assert list(iter_matching_paths(config, ("nokey", "*"))) == []
+    assert len(list(iter_matching_paths(config, ("**", "**")))) == 8
+
+
+def test_iter_matching_fields():
+    config = Config({"timeout": 1, "backends": {"b1": {"port": 1, "timeout": 2}, "b2": {"port": 2}}})
+    fields = list(iter_matching_fields(config, ("**", "timeout")))
+    assert [(key, path) for _, key, path in fields] == [("timeout", ("timeout",)),
+                                                        ("timeout", ("backends", "b1", "timeout"))]
+    assert fields[0][0] is config
+    assert fields[1][0] is config.backends.b1
@@ -0,0 +1,100 @@
+import copy
+import pickle
+
+import pytest
+
+from python_json_config import Config, FrozenConfig
+
+
+@pytest.fixture
+def config_dict() -> dict:
+    return {
+        "key1": 1,
+        "key2": {
+            "key3": [1, 2],
+            "key4": {"key5": 5},
+            "key6": 6
+        },
+        "key7": 7
+    }
+
+
+def test_get(config_dict):
+    config = Config(config_dict).freeze()
+    assert config.key1 == 1
+    assert config.key2.key3 == (1, 2)
+    assert config.key2.key4.key5 == 5
+    assert config.get("key2.key4.key5") == 5
+    assert config.get(["key2", "key6"]) == 6
+    assert config.key2.get("key4.key5") == 5
+    assert isinstance(config.key2, FrozenConfig)
+    assert config.key2 is config.get("key2")
+
+    with pytest.raises(AttributeError, match='No value exists for key "key2.nokey"'):
+        config.key2.nokey
+    with pytest.raises(AttributeError):
+        config.key1.key2
+    assert "key2.key4.key5" in config
+    assert "key2.key4.key6" not in config
+
+
+def test_access_settings(config_dict):
+    config = Config(config_dict, strict_access=False, required_fields=["key2.nokey"]).freeze()
+    assert config.nokey is None
+    assert config.key2.nokey2 is None
+    with pytest.raises(AttributeError):
+        config.key2.nokey
+
+    config = Config(config_dict, strict_access=True, optional_fields=["key2.nokey", "nokey"]).freeze()
+    assert config.nokey is None
+    assert config.get("nokey.key") is None
+    assert config.key2.nokey is None
+    with pytest.raises(AttributeError):
+        config.key2.nokey2
+
+
+def test_iteration(config_dict):
+    node = Config(config_dict)
+    config = node.freeze()
+    assert list(config.keys()) == list(node.keys())
+    assert list(config) == list(node)
+    assert list(config.values()) == [1, (1, 2), 5, 6, 7]
+    assert list(config.key2.items()) == [("key2.key3", (1, 2)), ("key2.key4.key5", 5), ("key2.key6", 6)]
+
+
+def test_serialization(config_dict):
+    node = Config(config_dict)
+    config = node.freeze()
+    assert config.to_dict() == config_dict
+    assert config.key2.to_dict() == config_dict["key2"]
+    assert config.to_json() == node.to_json()
+    assert pickle.loads(pickle.dumps(config)) == config
+    assert pickle.loads(pickle.dumps(config.key2)) == config.key2
+    assert copy.deepcopy(config) is config
+
+
+def test_immutability(config_dict):
+    config = Config(config_dict).freeze()
+    with pytest.raises(TypeError):
+        config.add("key8", 8)
+    with pytest.raises(TypeError):
+        config.key2.update("key6", 7)
+    with pytest.raises(TypeError):
+        config.merge_with_env_variables("PYTHONJSONCONFIG")
+    with pytest.raises(TypeError):
+        config.key1 = 2
+    with pytest.raises(TypeError):
+        del config.key1
+    assert config.key1 == 1
+
+
+def test_equality_and_hash(config_dict):
+    config1 = Config(config_dict).freeze()
+    config2 = Config(config_dict).freeze()
+    assert config1 == config2
+    assert hash(config1) == hash(config2)
+    assert len({config1, config2}) == 1
+    assert config1 == Config(config_dict)
+    assert Config(config_dict) == config1
+    assert config1.key2 != config1
+    assert config1 != Config({"key1": 1}).freeze()
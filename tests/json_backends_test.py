@@ -0,0 +1,62 @@
+import datetime
+import json
+import math
+
+import pytest
+
+from python_json_config import Config, ConfigBuilder
+from python_json_config.json_backends import set_json_backend, get_json_backend
+
+BACKENDS = ["orjson", "simdjson", "ujson", "json"]
+
+
+@pytest.fixture(params=BACKENDS)
+def backend(request):
+    try:
+        yield set_json_backend(request.param)
+    except ImportError:
+        pytest.skip(f"{request.param} is not installed")
+    finally:
+        set_json_backend(None)
+
+
+def test_default_backend():
+    set_json_backend(None)
+    assert get_json_backend().name == "json"
+    config = Config({"key1": 1, "key2": {"key3": [1, "a/b"], "key4": datetime.timedelta(seconds=1)}})
+    assert config.to_json() == json.dumps(config.to_dict(), default=str)
+    assert config.freeze().to_json() == config.to_json()
+
+
+def test_default_backend_parses_like_json_module():
+    set_json_backend(None)
+    config = ConfigBuilder().parse_config('{"big": 123456789012345678901234567890, "nan": NaN, "inf": 1e400}')
+    assert config.big == 123456789012345678901234567890
+    assert math.isnan(config.nan)
+    assert config.inf == math.inf
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        set_json_backend("nojson")
+
+
+def test_parse(backend):
+    config = ConfigBuilder().parse_config("tests/resources/test_config.json")
+    assert config.server.port == 5000
+    assert config == ConfigBuilder().parse_config('{"server": {"debug_mode": false, "host": "127.0.0.1", '
+                                                  '"port": 5000}, "cache": {"ttl": 180}}')
+
+
+def test_serialize(backend):
+    config = Config({
+        "key1": datetime.timedelta(seconds=1, minutes=2),
+        "key2": datetime.datetime(day=1, year=2000, month=4),
+        "key3": {"key4": [1, "a/b", None, 1.5]}
+    })
+    assert json.loads(config.to_json()) == {
+        "key1": "0:02:01",
+        "key2": "2000-04-01 00:00:00",
+        "key3": {"key4": [1, "a/b", None, 1.5]}
+    }
+    assert json.loads(config.freeze().to_json()) == json.loads(config.to_json())
@@ -0,0 +1,86 @@
+import datetime
+import multiprocessing
+
+import pytest
+
+from python_json_config import Config
+from python_json_config.mapped_config import MappedConfig, write_mapped_config
+
+
+@pytest.fixture
+def config() -> Config:
+    return Config({
+        "server": {"host": "127.0.0.1", "port": 5000, "debug": None},
+        "server2": {"port": 5001},
+        "cache": {"ttl": datetime.timedelta(minutes=3), "backends": [{"name": "redis"}], "options": {}},
+        "name": "test"
+    })
+
+
+@pytest.fixture
+def mapped_path(config, tmp_path) -> str:
+    path = str(tmp_path / "config.bin")
+    write_mapped_config(config, path)
+    return path
+
+
+def test_get(mapped_path):
+    with MappedConfig(mapped_path) as config:
+        assert config.name == "test"
+        assert config.server.port == 5000
+        assert config.server.debug is None
+        assert config.get("server2.port") == 5001
+        assert config.get(["cache", "ttl"]) == datetime.timedelta(minutes=3)
+        assert config.cache.backends == [{"name": "redis"}]
+        assert config.cache.options.to_dict() == {}
+        assert "server.port" in config
+        assert "server.nokey" not in config
+        with pytest.raises(AttributeError):
+            config.server.nokey
+        with pytest.raises(AttributeError):
+            config.serv
+
+
+def test_sibling_keys_with_common_prefix(tmp_path):
+    # "-" and " " sort before ".", so these keys are between "server" and "server.port"
+    config = Config({"server": {"port": 1}, "server-backup": {"port": 2}, "server backup": 3})
+    path = str(tmp_path / "config.bin")
+    write_mapped_config(config, path)
+    with MappedConfig(path) as mapped_config:
+        assert mapped_config.server.port == 1
+        assert mapped_config.server.to_dict() == {"port": 1}
+        assert mapped_config.get("server-backup").port == 2
+        assert mapped_config.get("server backup") == 3
+        assert mapped_config.to_dict() == config.to_dict()
+
+
+def test_non_strict_access(mapped_path):
+    with MappedConfig(mapped_path, strict_access=False) as config:
+        assert config.nokey is None
+        assert config.server.nokey is None
+
+
+def test_iteration(config, mapped_path):
+    with MappedConfig(mapped_path) as mapped_config:
+        assert mapped_config.to_dict() == config.to_dict()
+        assert mapped_config.server.to_dict() == config.server.to_dict()
+        assert dict(mapped_config.items()) == dict(config.items())
+        assert sorted(mapped_config) == sorted(config)
+        assert list(mapped_config.server.keys()) == ["server.debug", "server.host", "server.port"]
+
+
+def test_invalid_file(tmp_path):
+    path = tmp_path / "config.json"
+    path.write_text('{"key": "value"}')
+    with pytest.raises(ValueError):
+        MappedConfig(str(path))
+
+
+def read_port(path: str) -> int:
+    with MappedConfig(path) as config:
+        return config.server.port
+
+
+def test_multiple_processes(mapped_path):
+    with multiprocessing.Pool(2) as pool:
+        assert pool.map(read_port, [mapped_path] * 2) == [5000, 5000]
@@ -0,0 +1,146 @@
+import json
+import os
+import threading
+import time
+
+import pytest
+
+from python_json_config import ConfigBuilder, ReloadingConfig
+
+
+def write_config(path, config_dict: dict):
+    # replace the file atomically like most deployment tools do
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "w") as file:
+        json.dump(config_dict, file)
+    os.replace(temporary_path, path)
+
+
+def wait_for(condition, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+@pytest.fixture
+def config_file(tmp_path):
+    path = str(tmp_path / "config.json")
+    write_config(path, {"server": {"port": 5000}})
+    return path
+
+
+@pytest.fixture
+def builder() -> ConfigBuilder:
+    return ConfigBuilder()\
+        .validate_field_type("server.port", int)\
+        .validate_field_value("server.port", lambda port: port > 1024)\
+        .transform_field_value("server.port", lambda port: port + 1)
+
+
+@pytest.fixture(params=[True, False], ids=["inotify", "polling"])
+def use_inotify(request) -> bool:
+    if request.param:
+        pytest.importorskip("inotify_simple")
+    return request.param
+
+
+def test_reload(builder, config_file):
+    config = ReloadingConfig(builder, config_file)
+    old_config = config.config
+    assert config.server.port == 5001
+
+    write_config(config_file, {"server": {"port": 6000}})
+    assert config.reload()
+    assert config.get("server.port") == 6001
+    assert config.version == 1
+    # references to the old config are not changed
+    assert old_config.server.port == 5001
+
+
+def test_failed_reload_keeps_config(builder, config_file):
+    errors = []
+    config = ReloadingConfig(builder, config_file, on_error=errors.append)
+
+    write_config(config_file, {"server": {"port": 80}})
+    assert not config.reload()
+    assert config.server.port == 5001
+    assert config.version == 0
+    assert isinstance(config.last_error, AssertionError)
+    assert errors == [config.last_error]
+
+    with open(config_file, "w") as file:
+        file.write('{"server": ')
+    assert not config.reload()
+    assert config.server.port == 5001
+
+
+def test_initial_build_raises(builder, config_file):
+    write_config(config_file, {"server": {"port": 80}})
+    with pytest.raises(AssertionError):
+        ReloadingConfig(builder, config_file)
+
+
+def test_watch(builder, config_file, use_inotify):
+    reloaded = []
+    with ReloadingConfig(builder, config_file, debounce=0.05, poll_interval=0.05, use_inotify=use_inotify,
+                         on_reload=reloaded.append) as config:
+        assert config.watching
+        write_config(config_file, {"server": {"port": 6000}})
+        assert wait_for(lambda: config.server.port == 6001)
+        assert reloaded == [config.config]
+
+        # invalid configs are not swapped in
+        write_config(config_file, {"server": {"port": 80}})
+        assert wait_for(lambda: config.last_error is not None)
+        assert config.server.port == 6001
+    assert not config.watching
+
+
+def test_watch_debounces_bursts(builder, config_file, use_inotify):
+    with ReloadingConfig(builder, config_file, debounce=0.3, poll_interval=0.05, use_inotify=use_inotify) as config:
+        for port in range(6000, 6010):
+            write_config(config_file, {"server": {"port": port}})
+            time.sleep(0.02)
+        assert wait_for(lambda: config.server.port == 6010)
+        time.sleep(0.4)
+        assert config.version == 1
+
+
+def test_readers_see_complete_configs(builder, config_file):
+    config = ReloadingConfig(builder, config_file)
+    errors = []
+    stop = threading.Event()
+
+    def read():
+        while not stop.is_set():
+            current = config.config
+            try:
+                assert current.server.port == current.server.copy + 1
+            except Exception as exception:
+                errors.append(exception)
+
+    write_config(config_file, {"server": {"port": 5000, "copy": 5000}})
+    config.reload()
+    readers = [threading.Thread(target=read) for _ in range(4)]
+    for reader in readers:
+        reader.start()
+    for port in range(6000, 6050):
+        write_config(config_file, {"server": {"port": port, "copy": port}})
+        config.reload()
+    stop.set()
+    for reader in readers:
+        reader.join()
+    assert not errors
+    assert config.version == 51
+
+
+def test_builder_watch_config(builder, config_file):
+    config = builder.watch_config(config_file, poll_interval=0.05, debounce=0.05)
+    try:
+        assert config.watching
+        assert config.server.port == 5001
+    finally:
+        config.stop()
@@ -0,0 +1,83 @@
+import json
+
+import pytest
+from jsonschema import ValidationError, SchemaError
+
+from python_json_config import ConfigBuilder
+from python_json_config.schema_validation import SchemaValidator, get_schema_validator
+
+
+@pytest.fixture
+def schema() -> dict:
+    with open("tests/resources/test_config.schema.json", "r") as schema_file:
+        return json.load(schema_file)
+
+
+@pytest.fixture
+def config() -> dict:
+    with open("tests/resources/test_config.json", "r") as config_file:
+        return json.load(config_file)
+
+
+@pytest.fixture(params=[True, False])
+def use_fastjsonschema(request) -> bool:
+    return request.param
+
+
+def test_validate(schema, config, use_fastjsonschema):
+    validator = SchemaValidator(schema, use_fastjsonschema=use_fastjsonschema)
+    validator.validate(config)
+
+    config["server"]["port"] = 1023
+    with pytest.raises(ValidationError, match="1023 is less than the minimum of 1024"):
+        validator.validate(config)
+
+
+def test_defaults_are_not_inserted(config, use_fastjsonschema):
+    schema = {"type": "object", "properties": {"name": {"type": "string", "default": "test"}}}
+    SchemaValidator(schema, use_fastjsonschema=use_fastjsonschema).validate(config)
+    assert "name" not in config
+
+
+def test_fastjsonschema_only_for_supported_schemas(schema):
+    pytest.importorskip("fastjsonschema")
+    assert SchemaValidator(schema)._SchemaValidator__fast_validate is not None
+
+    # without $schema, jsonschema uses the latest draft, which fastjsonschema doesn't support
+    latest_schema = {"dependentRequired": {"a": ["b"]}}
+    validator = SchemaValidator(latest_schema)
+    assert validator._SchemaValidator__fast_validate is None
+    with pytest.raises(ValidationError):
+        validator.validate({"a": {}})
+
+    # additionalItems is not supported by fastjsonschema
+    items_schema = {"$schema": schema["$schema"], "items": [{"type": "integer"}], "additionalItems": False}
+    validator = SchemaValidator(items_schema)
+    assert validator._SchemaValidator__fast_validate is None
+    with pytest.raises(ValidationError):
+        validator.validate([1, 2])
+
+
+def test_invalid_schema():
+    with pytest.raises(SchemaError):
+        SchemaValidator({"type": "nonexistingtype"})
+
+
+def test_validator_cache(schema):
+    validator = get_schema_validator(schema)
+    assert get_schema_validator(json.loads(json.dumps(schema))) is validator
+    assert get_schema_validator(schema, use_fastjsonschema=False) is not validator
+    assert get_schema_validator({**schema, "required": []}) is not validator
+
+
+def test_builder_reuses_validator(schema, config):
+    builder = ConfigBuilder()
+    builder.validate_with_schema(schema)
+    builder.parse_config(config)
+    validator = builder._ConfigBuilder__schema_validator
+    builder.parse_config(config)
+    assert builder._ConfigBuilder__schema_validator is validator
+
+    builder.validate_with_schema({**schema, "required": ["cache"]})
+    builder.parse_config(config)
+    assert builder._ConfigBuilder__schema_validator is not validator
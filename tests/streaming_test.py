@@ -0,0 +1,141 @@
+import json
+
+import pytest
+from jsonschema import ValidationError
+
+from python_json_config import ConfigBuilder
+from python_json_config.config_node import ConfigNode
+from python_json_config.utils import DeferredDict
+
+pytest.importorskip("ijson")
+
+
+@pytest.fixture
+def path() -> str:
+    return "tests/resources/test_config.json"
+
+
+@pytest.fixture
+def schema_path() -> str:
+    return "tests/resources/test_config.schema.json"
+
+
+@pytest.fixture
+def large_config_path(tmp_path) -> str:
+    config = {
+        "server": {"host": "127.0.0.1", "port": 5000, "tls": {"enabled": True, "ciphers": ["a", "b"]}},
+        "tenants": {f"tenant{index}": {"routes": [{"host": "10.0.0.1", "weight": 0.5}]} for index in range(100)},
+        "features": {"flags": {"new_ui": True}, "rollout": {"percent": 10}},
+        "name": "test"
+    }
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps(config))
+    return str(path)
+
+
+def test_parse(path):
+    config = ConfigBuilder().enable_streaming().parse_config(path)
+    assert config == ConfigBuilder().parse_config(path)
+    assert config.server.port == 5000
+    assert config.server._ConfigNode__path == ["server"]
+
+
+def test_parse_nested(large_config_path):
+    config = ConfigBuilder().enable_streaming().parse_config(large_config_path)
+    assert config == ConfigBuilder().parse_config(large_config_path)
+    assert config.tenants.tenant5.routes == [{"host": "10.0.0.1", "weight": 0.5}]
+    assert isinstance(config.tenants.tenant5.routes[0], dict)
+    assert config.server.tls._ConfigNode__path == ["server", "tls"]
+
+
+def test_skip_fields(large_config_path):
+    config = ConfigBuilder()\
+        .enable_streaming(skip_fields=["tenants", "features.flags"])\
+        .set_field_access_optional()\
+        .parse_config(large_config_path)
+    assert config.tenants is None
+    assert config.features.flags is None
+    assert config.features.rollout.percent == 10
+
+
+def test_lazy_fields(large_config_path):
+    config = ConfigBuilder()\
+        .enable_streaming(lazy_fields=["tenants", "features.flags", "name"])\
+        .parse_config(large_config_path)
+    assert isinstance(config._ConfigNode__node_dict["tenants"], DeferredDict)
+    assert isinstance(config.features._ConfigNode__node_dict["flags"], DeferredDict)
+    assert config.tenants.tenant99.routes[0]["host"] == "10.0.0.1"
+    assert isinstance(config.features.flags, ConfigNode)
+    assert config.features.flags.new_ui
+    assert config.name == "test"
+    assert config == ConfigBuilder().parse_config(large_config_path)
+
+
+def test_access_settings(large_config_path):
+    config = ConfigBuilder()\
+        .enable_streaming(lazy_fields=["features.flags"])\
+        .set_field_access_optional()\
+        .add_required_fields(["server.tls.nokey", "features.flags.nokey"])\
+        .parse_config(large_config_path)
+    assert config.server.nokey is None
+    with pytest.raises(AttributeError):
+        config.server.tls.nokey
+    assert config.features.flags.nokey2 is None
+    with pytest.raises(AttributeError):
+        config.features.flags.nokey
+
+
+def test_schema_validation(tmp_path, schema_path):
+    builder = ConfigBuilder().enable_streaming()
+    builder.validate_with_schema(schema_path)
+    config_path = tmp_path / "config.json"
+
+    config = {"server": {"debug_mode": False, "host": "127.0.0.1", "port": 5000}}
+    config_path.write_text(json.dumps(config))
+    builder.parse_config(str(config_path))
+
+    config["server"]["port"] = 1023
+    config_path.write_text(json.dumps(config))
+    with pytest.raises(ValidationError):
+        builder.parse_config(str(config_path))
+
+    config_path.write_text(json.dumps({"cache": {"ttl": 1}}))
+    with pytest.raises(ValidationError):
+        builder.parse_config(str(config_path))
+
+
+def test_skipped_field_schema_validation(tmp_path, schema_path):
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps({"server": {"debug_mode": False, "host": "127.0.0.1", "port": 5000}}))
+    with open(schema_path) as schema_file:
+        schema = json.load(schema_file)
+    assert "server" in schema["required"]
+    for validated_schema in (schema, {"allOf": [schema]}):
+        builder = ConfigBuilder().enable_streaming(skip_fields=["server"])
+        builder.validate_with_schema(validated_schema)
+        assert "server" not in builder.parse_config(str(config_path))
+
+    # skipped fields that don't exist are still missing
+    config_path.write_text(json.dumps({"cache": {"ttl": 1}}))
+    with pytest.raises(ValidationError):
+        builder.parse_config(str(config_path))
+
+
+def test_lazy_field_schema_validation(tmp_path, schema_path):
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps({"server": {"debug_mode": False, "host": "127.0.0.1", "port": 80}}))
+    builder = ConfigBuilder().enable_streaming(lazy_fields=["server"])
+    builder.validate_with_schema(schema_path)
+    config = builder.parse_config(str(config_path))
+    with pytest.raises(ValidationError):
+        config.server
+
+
+def test_combined_schema_validation(tmp_path, schema_path):
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps({"server": {"debug_mode": False, "host": "127.0.0.1", "port": 80}}))
+    builder = ConfigBuilder().enable_streaming()
+    with open(schema_path) as schema_file:
+        builder.validate_with_schema({"allOf": [json.load(schema_file)]})
+    with pytest.raises(ValidationError):
+        builder.parse_config(str(config_path))
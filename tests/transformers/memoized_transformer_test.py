@@ -0,0 +1,47 @@
+from datetime import timedelta
+
+from python_json_config.transformers import MemoizedTransformer, to_timedelta
+from python_json_config.validators import is_timedelta
+
+
+def test_results_are_memoized():
+    parsed = []
+
+    def parse(value: str) -> int:
+        parsed.append(value)
+        return int(value)
+
+    transformer = MemoizedTransformer(parse, maxsize=2)
+    assert transformer("1") == 1
+    assert transformer.validate("1")
+    assert transformer("a") is None
+    assert transformer.validate("a") == (False, "invalid literal for int() with base 10: 'a'")
+    assert parsed == ["1", "a"]
+
+    # the least recently used value is evicted
+    transformer("2")
+    transformer("1")
+    assert parsed == ["1", "a", "2", "1"]
+    assert transformer.cache_info().currsize == 2
+
+
+def test_transform_many():
+    transformer = MemoizedTransformer(int)
+    assert transformer.transform_many(["1", "2", "1", "x", 3]) == [1, 2, 1, None, 3]
+    assert transformer.cache_info().misses == 4
+
+
+def test_unhashable_values():
+    transformer = MemoizedTransformer(len)
+    assert transformer([1, 2]) == 2
+    assert transformer.transform_many([[1], [1, 2]]) == [1, 2]
+    assert transformer.cache_info().currsize == 0
+
+
+def test_shared_timedelta_results():
+    to_timedelta.cache_clear()
+    assert is_timedelta("0:0:0:30")
+    assert to_timedelta("0:0:0:30") == timedelta(seconds=30)
+    assert to_timedelta.cache_info().hits == 1
+    assert to_timedelta("1:3:24:30:23:45") is None
+    assert to_timedelta.transform_many(["0:0:0:30"] * 3) == [timedelta(seconds=30)] * 3
@@ -1,7 +1,39 @@
-from python_json_config.utils import parse_env_variable_name
+from python_json_config.utils import parse_env_variable_name, env_variable_values, FieldSettings
 
 
 def test_underscore_splitting():
     variable = "test__key_subkey"
     split = parse_env_variable_name(variable)
     assert split == ["test_key", "subkey"]
+
+
+def test_field_settings():
+    settings = FieldSettings.compile(["key1", "key2.key3", ["key2", "key4", "key5"], "key2.key4"])
+    assert settings.fields == {"key1"}
+    assert settings.child("key2").fields == {"key3", "key4"}
+    assert settings.child("key2").child("key4").fields == {"key5"}
+    assert not settings.child("key1")
+    assert not settings.child("nokey").child("nokey")
+    assert FieldSettings.compile(settings) is settings
+    assert not FieldSettings.compile(None)
+
+
+def test_env_variable_values():
+    environment = {
+        "FOO_SERVER_PORT": "1",
+        "FOO_BAR_TEST__VALUE": "2",
+        "FOO_BAR_KEY": "3",
+        "BAR_KEY": "4",
+        "FOOBAR_KEY": "5",
+        "FOO_": "6",
+        "OTHER": "7"
+    }
+    values = env_variable_values(["FOO_BAR", "FOO"], environment)
+    assert values == {
+        ("server", "port"): "1",
+        ("bar", "test_value"): "2",
+        ("test_value",): "2",
+        ("bar", "key"): "3",
+        ("key",): "3"
+    }
+    assert env_variable_values([], environment) == {}
@@ -0,0 +1,187 @@
+import asyncio
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from python_json_config import ConfigBuilder, ConfigValidationError
+from python_json_config.config_node import Config
+from python_json_config.validation_engine import ValidationEngine
+
+
+@pytest.fixture
+def config() -> Config:
+    return Config({
+        "server": {"host": "127.0.0.1", "port": 80, "debug_mode": "no"},
+        "backends": {f"backend{index}": {"port": 8000 + index} for index in range(3)}
+    }, strict_access=False)
+
+
+def test_all_errors_are_reported(config):
+    engine = ValidationEngine({"server.debug_mode": bool, "server.port": int},
+                              {"server.port": [lambda port: port > 1023, lambda port: (port < 10000, "too large")],
+                               "server.debug_mode": [lambda debug_mode: not debug_mode],
+                               "backends.backend1.port": [lambda port: (port > 9000, "too small")],
+                               "server.nokey": [lambda value: False]})
+    with pytest.raises(ConfigValidationError) as exception_info:
+        engine.validate(config)
+    assert exception_info.value.errors == [
+        "Config field \"server.debug_mode\" with value \"no\" is not of type <class 'bool'>",
+        'Error validating field "server.port" with value "80"',
+        'Error validating field "backends.backend1.port" with value "8001": too small'
+    ]
+    assert str(exception_info.value).startswith("3 fields of the config are invalid:")
+    assert isinstance(exception_info.value, AssertionError)
+
+
+def test_fields_are_grouped_by_path(config):
+    engine = ValidationEngine({"server.port": int, "server.host": str}, {"server": [lambda server: True]})
+    root = engine._ValidationEngine__root.subfields
+    assert list(root) == ["server"]
+    assert root["server"].field_name == "server"
+    assert set(root["server"].subfields) == {"port", "host"}
+    assert engine.errors(config) == []
+
+
+def test_incremental_validation(config):
+    engine = ValidationEngine({}, {"server.port": [lambda port: False], "backends.backend0.port": [lambda port: False]})
+    assert engine.errors(config, dirty={("backends",)}) == [
+        'Error validating field "backends.backend0.port" with value "8000"'
+    ]
+    assert engine.errors(config, dirty={("other",)}) == []
+
+
+def test_wildcards(config):
+    config.add("server.timeout", 10)
+    config.add("backends.backend1.health.timeout", 0)
+    engine = ValidationEngine({"backends.*.port": int},
+                              {"backends.*.port": [lambda port: port < 8002],
+                               "**.timeout": [lambda timeout: timeout > 0],
+                               "backends.backend0.port": [lambda port: (False, "exact")]})
+    assert engine.errors(config) == [
+        'Error validating field "backends.backend0.port" with value "8000": exact',
+        'Error validating field "backends.backend1.health.timeout" with value "0"',
+        'Error validating field "backends.backend2.port" with value "8002"'
+    ]
+
+
+def test_wildcard_type_validation(config):
+    config.update("backends.backend2.port", "8002")
+    engine = ValidationEngine({"*.*.port": int}, {"*.*.port": [lambda port: port > 8000], "*.nokey.*": [bool]})
+    assert engine.errors(config) == [
+        'Error validating field "backends.backend0.port" with value "8000"',
+        "Config field \"backends.backend2.port\" with value \"8002\" is not of type <class 'int'>"
+    ]
+    assert engine.errors(config, dirty={("server",)}) == []
+
+
+def test_strict_access():
+    engine = ValidationEngine({"server.nokey": int}, {})
+    with pytest.raises(AttributeError):
+        engine.validate(Config({"server": {}}, strict_access=True))
+
+
+def test_validation_without_asserts():
+    code = "from python_json_config import ConfigBuilder, ConfigValidationError\n" \
+           "builder = ConfigBuilder().validate_field_value('port', lambda port: port > 1023)\n" \
+           "try:\n" \
+           "    builder.parse_config({'port': 80})\n" \
+           "except ConfigValidationError:\n" \
+           "    print('invalid')\n"
+    result = subprocess.run([sys.executable, "-O", "-c", code], stdout=subprocess.PIPE, universal_newlines=True,
+                            check=True)
+    assert result.stdout.strip() == "invalid"
+
+
+def test_builder_reports_all_errors():
+    builder = ConfigBuilder()\
+        .validate_field_type("server.port", int)\
+        .validate_field_value("server.host", lambda host: host != "0.0.0.0")
+    with pytest.raises(ConfigValidationError) as exception_info:
+        builder.parse_config({"server": {"port": "80", "host": "0.0.0.0"}})
+    assert len(exception_info.value.errors) == 2
+
+
+def slow_validator(seconds: float, result=True):
+    def validate(value):
+        time.sleep(seconds)
+        return result
+    return validate
+
+
+def async_validator(seconds: float, result=True):
+    async def validate(value):
+        await asyncio.sleep(seconds)
+        return result
+    return validate
+
+
+def test_async_validators(config):
+    engine = ValidationEngine({}, {"server.port": [async_validator(0, (False, "async"))],
+                                   "server.host": [async_validator(1)]}, timeout=0.05)
+    assert engine.errors(config) == [
+        'Error validating field "server.port" with value "80": async',
+        'Error validating field "server.host" with value "127.0.0.1": validation timed out after 0.05 seconds'
+    ]
+
+
+def test_parallel_validation(config):
+    functions = {f"backends.backend{index}.port": [slow_validator(0.2), async_validator(0.2, False)]
+                 for index in range(3)}
+    engine = ValidationEngine({}, functions, max_concurrency=6)
+    start = time.monotonic()
+    errors = engine.errors(config)
+    assert time.monotonic() - start < 0.5
+    # the errors keep the order of the fields
+    assert errors == [f'Error validating field "backends.backend{index}.port" with value "{8000 + index}"'
+                      for index in range(3)]
+
+
+def test_concurrency_limit(config):
+    running = []
+    maximum = []
+    lock = threading.Lock()
+
+    def validate(value):
+        with lock:
+            running.append(value)
+            maximum.append(len(running))
+        time.sleep(0.02)
+        with lock:
+            running.remove(value)
+        return True
+
+    functions = {f"backends.backend{index}.port": [validate] for index in range(3)}
+    functions["server.port"] = [validate]
+    assert ValidationEngine({}, functions, max_concurrency=2).errors(config) == []
+    assert max(maximum) == 2
+
+
+def test_parallel_validation_timeout(config):
+    engine = ValidationEngine({}, {"server.port": [slow_validator(1)], "server.host": [slow_validator(0)]},
+                              max_concurrency=2, timeout=0.05)
+    start = time.monotonic()
+    assert engine.errors(config) == [
+        'Error validating field "server.port" with value "80": validation timed out after 0.05 seconds'
+    ]
+    assert time.monotonic() - start < 0.5
+
+
+def test_validation_in_running_event_loop(config):
+    async def build():
+        return ValidationEngine({}, {"server.port": [async_validator(0, False)]}, max_concurrency=2).errors(config)
+    loop = asyncio.new_event_loop()
+    try:
+        assert loop.run_until_complete(build()) == ['Error validating field "server.port" with value "80"']
+    finally:
+        loop.close()
+
+
+def test_builder_parallel_validation():
+    builder = ConfigBuilder()\
+        .enable_parallel_validation(max_concurrency=4, timeout=1)\
+        .validate_field_value("server.port", async_validator(0, (False, "invalid")))
+    with pytest.raises(ConfigValidationError, match="invalid"):
+        builder.parse_config({"server": {"port": 80}})